@@ -0,0 +1,108 @@
+"""Per-paragraph classification cost: legacy uncompiled checks vs parsing.classifier.
+
+    python -m benchmarks.classifier_bench [file.htm ...]
+"""
+import glob
+import re
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from parsing.classifier import classify_block, list_marker
+from parsing.parsers.Claude_parser_htm_to_json import iter_blocks
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+
+
+# --- Попередня реалізація (Claude_parser_htm_to_json до parsing.classifier) ---
+
+def legacy_is_heading(text):
+    patterns = [r"^Розділ\s+[IVX]+[\.\s]", r"^Глава\s+\d+[\.\s]", r"^I{1,3}V?X?\.\s+"]
+    return any(re.match(pattern, text.strip()) for pattern in patterns)
+
+def legacy_get_heading_level(text):
+    text = text.strip()
+    if re.match(r"^Розділ\s+[IVX]+[\.\s]", text):
+        return 1
+    elif re.match(r"^Глава\s+\d+[\.\s]", text):
+        return 2
+    elif re.match(r"^I{1,3}V?X?\.\s+", text):
+        return 2
+    return 3
+
+def legacy_is_article(text):
+    return bool(re.match(r"^Стаття\s+\d+[\.\s]", text.strip()))
+
+def legacy_is_amendment(text):
+    patterns = [r"згідно із Законом", r"змінено Законом", r"доповнено Законом",
+                r"виключено Законом", r"у редакції Закону"]
+    return any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)
+
+def legacy_is_reference(text):
+    return bool(re.search(r"№\s*\d+-[A-ZІХ]+\s+від\s+\d{2}\.\d{2}\.\d{4}", text))
+
+def legacy_parse_reference(text):
+    match = re.search(r"№\s*(\d+-[A-ZІХ]+)\s+від\s+(\d{2}\.\d{2}\.\d{4})", text)
+    return match.groups() if match else (None, None)
+
+def legacy_classify(text):
+    if legacy_is_heading(text):
+        return "heading", legacy_get_heading_level(text), None, None
+    if legacy_is_article(text):
+        return "article", None, None, None
+    if legacy_is_amendment(text):
+        return "amendment", None, None, None
+    if legacy_is_reference(text):
+        return ("reference", None) + legacy_parse_reference(text)
+    return None, None, None, None
+
+def legacy_list_marker(text):
+    if any(re.match(p, text) for p in [r"^\d+\)", r"^\d+\.\d+", r"^[а-я]\)"]):
+        return "ordered"
+    if any(re.match(p, text) for p in [r"^- ", r"• ", r"● "]):
+        return "unordered"
+    return None
+
+
+def load_paragraphs(paths):
+    paragraphs = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            article_div = BeautifulSoup(f, "lxml").find("div", {"id": "article"})
+        if article_div:
+            paragraphs.extend(text for _, text in iter_blocks(article_div) if text)
+    return paragraphs
+
+
+def bench(function, paragraphs, repeat=5):
+    def run():
+        for text in paragraphs:
+            function(text)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(paragraphs) * 1e6
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or DEFAULT_INPUTS
+    paragraphs = load_paragraphs(paths)
+    if not paragraphs:
+        print("Немає абзаців для вимірювання")
+        return 1
+
+    mismatches = sum(legacy_classify(t) != classify_block(t) for t in paragraphs)
+    mismatches += sum(legacy_list_marker(t) != list_marker(t) for t in paragraphs)
+
+    print(f"Абзаців: {len(paragraphs):,}, розбіжностей з попередньою реалізацією: {mismatches}")
+    print(f"{'перевірка':<16}{'до, мкс':>10}{'після, мкс':>12}{'прискорення':>13}")
+    for name, before, after in [
+        ("блок", legacy_classify, classify_block),
+        ("маркер списку", legacy_list_marker, list_marker),
+    ]:
+        old, new = bench(before, paragraphs), bench(after, paragraphs)
+        print(f"{name:<16}{old:>10.2f}{new:>12.2f}{old / new:>12.1f}x")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
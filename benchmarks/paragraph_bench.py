@@ -0,0 +1,83 @@
+"""Per-paragraph extraction cost in parse_npa_html: separate tree searches vs one pass.
+
+    python -m benchmarks.paragraph_bench [file.htm ...]
+"""
+import glob
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from parsing.parsers.Google_AI_Studio_parser_htm_to_json import paragraph_info, parse_npa_html
+from parsing.source import read_text
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+
+
+# --- Попередня реалізація: п'ять обходів піддерева на кожен <p> ---
+
+def legacy_paragraph(element):
+    text = element.get_text(separator=" ", strip=True)
+    has_em = element.find('em') is not None
+    has_link = element.find('a', href=True) is not None
+    link = element.find('a')
+    prev_p = element.find_previous_sibling('p')
+    prev_text = prev_p.get_text(strip=True) if prev_p else None
+    return {
+        "text": text,
+        "plain_text": element.get_text(strip=True),
+        "classes": element.get('class', []),
+        "has_em": has_em,
+        "has_link": has_link,
+        "link_href": link.get('href') if link is not None else None,
+        "prev_text": prev_text,
+    }
+
+
+def single_pass(paragraphs):
+    last_p_text = {}
+    results = []
+    for element in paragraphs:
+        info = paragraph_info(element)
+        info["prev_text"] = last_p_text.get(id(element.parent))
+        last_p_text[id(element.parent)] = info["plain_text"]
+        results.append(info)
+    return results
+
+
+def load_paragraphs(paths):
+    paragraphs = []
+    for path in paths:
+        article_div = BeautifulSoup(read_text(path), "html.parser").find("div", id="article")
+        if article_div:
+            paragraphs.extend(article_div.find_all("p"))
+    return paragraphs
+
+
+def best_of(function, repeat=5):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or DEFAULT_INPUTS
+    paragraphs = load_paragraphs(paths)
+    if not paragraphs:
+        print("Немає абзаців для вимірювання")
+        return 1
+
+    legacy = [legacy_paragraph(element) for element in paragraphs]
+    mismatches = sum(old != new for old, new in zip(legacy, single_pass(paragraphs)))
+    print(f"Абзаців: {len(paragraphs):,}, розбіжностей з попередньою реалізацією: {mismatches}")
+
+    old = best_of(lambda: [legacy_paragraph(element) for element in paragraphs]) / len(paragraphs) * 1e6
+    new = best_of(lambda: single_pass(paragraphs)) / len(paragraphs) * 1e6
+    print(f"{'абзац':<16}{'до, мкс':>10}{'після, мкс':>12}{'прискорення':>13}")
+    print(f"{'витяг полів':<16}{old:>10.2f}{new:>12.2f}{old / new:>12.1f}x")
+
+    parse_seconds = sum(best_of(lambda: parse_npa_html(path)) for path in paths)
+    print(f"parse_npa_html повністю: {parse_seconds:.3f} с на {len(paths)} файл(ів)")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
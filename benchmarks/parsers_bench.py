@@ -0,0 +1,195 @@
+"""Run every registered parser over a corpus and compare speed, memory and structure.
+
+    python -m benchmarks.parsers_bench law-examples --reference law-examples/Claude \
+        --output bench.json
+
+Each parser runs in its own fresh process so peak RSS is not shared between
+backends. Results are written as JSON for tracking across commits.
+"""
+import argparse
+import collections
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from parsing.batch import find_html_files
+from parsing.manifest import parse_document_id
+from parsing.output import dumps_compact
+from parsing.parsers import PARSERS, parse
+
+# Типи блоків, за якими порівнюється структура з еталоном
+STRUCTURE_TYPES = ("article", "heading", "reference")
+
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux повертає кілобайти, macOS — байти
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def structure_counts(data):
+    """Count blocks by type in a parser output, flat or nested (DeepSeek) layout."""
+    counts = collections.Counter()
+
+    def walk(value):
+        if isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif isinstance(value, dict):
+            if isinstance(value.get("type"), str):
+                counts[value["type"]] += 1
+            for key, child in value.items():
+                if key in ("sections", "chapters") and isinstance(child, list):
+                    counts["heading"] += len(child)
+                elif key == "articles" and isinstance(child, list):
+                    counts["article"] += len(child)
+                if isinstance(child, (list, dict)):
+                    walk(child)
+
+    walk(data.get("content", data) if isinstance(data, dict) else data)
+    return counts
+
+
+def run_parser(parser_name, paths):
+    """Worker: parse every path with one backend and return per-file measurements."""
+    baseline_rss = peak_rss_bytes()
+    files = []
+    for path in paths:
+        size = os.path.getsize(path)
+        started = time.perf_counter()
+        try:
+            law_data = parse(path, parser_name).to_dict()
+        except Exception as e:
+            files.append({"path": path, "input_bytes": size, "error": repr(e)})
+            continue
+        parse_seconds = time.perf_counter() - started
+        output = dumps_compact(law_data)
+        files.append({
+            "path": path,
+            "input_bytes": size,
+            "seconds": parse_seconds,
+            "blocks": len(law_data["content"]),
+            "output_bytes": len(output.encode("utf-8")),
+            "counts": dict(structure_counts(law_data)),
+        })
+    return {"baseline_rss": baseline_rss, "peak_rss": peak_rss_bytes(), "files": files}
+
+
+def find_reference(path, reference_dir):
+    document_id, revision = parse_document_id(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for filename in sorted(os.listdir(reference_dir)):
+        if not filename.endswith(".json"):
+            continue
+        if document_id is not None and parse_document_id(filename[:-5] + ".htm") == (document_id, revision):
+            return os.path.join(reference_dir, filename)
+        if filename[:-5] == stem:
+            return os.path.join(reference_dir, filename)
+    return None
+
+
+def agreement(counts, reference_counts):
+    result = {}
+    for block_type in STRUCTURE_TYPES:
+        got, expected = counts.get(block_type, 0), reference_counts.get(block_type, 0)
+        result[block_type] = {
+            "count": got,
+            "reference": expected,
+            "ratio": round(got / expected, 3) if expected else None,
+        }
+    return result
+
+
+def summarize(parser_name, measured, reference_dir=None):
+    ok = [f for f in measured["files"] if "error" not in f]
+    seconds = sum(f["seconds"] for f in ok)
+    input_bytes = sum(f["input_bytes"] for f in ok)
+    blocks = sum(f["blocks"] for f in ok)
+    summary = {
+        "parser": parser_name,
+        "files": len(measured["files"]),
+        "errors": len(measured["files"]) - len(ok),
+        "seconds": round(seconds, 4),
+        "input_bytes": input_bytes,
+        "output_bytes": sum(f["output_bytes"] for f in ok),
+        "blocks": blocks,
+        "mb_per_s": round(input_bytes / 1e6 / seconds, 3) if seconds else None,
+        "blocks_per_s": round(blocks / seconds, 1) if seconds else None,
+        "peak_rss_bytes": measured["peak_rss"],
+        "rss_growth_bytes": measured["peak_rss"] - measured["baseline_rss"],
+    }
+    if reference_dir:
+        for f in ok:
+            reference_path = find_reference(f["path"], reference_dir)
+            if reference_path:
+                with open(reference_path, "r", encoding="utf-8") as ref:
+                    f["agreement"] = agreement(f["counts"], structure_counts(json.load(ref)))
+    summary["per_file"] = measured["files"]
+    return summary
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(corpus, parsers=None, reference_dir=None):
+    paths = find_html_files(corpus)
+    results = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "corpus": corpus,
+        "parsers": [],
+    }
+    for parser_name in parsers or sorted(PARSERS):
+        # Окремий процес на кожен парсер: чистий пік RSS і без прогрітих кешів
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            measured = pool.submit(run_parser, parser_name, paths).result()
+        results["parsers"].append(summarize(parser_name, measured, reference_dir))
+    return results
+
+
+def print_table(results):
+    print(f"{'парсер':<12}{'файлів':>7}{'час, с':>9}{'МБ/с':>8}{'блоків/с':>10}"
+          f"{'вивід, КБ':>11}{'RSS, МБ':>9}  статті/заголовки/посилання (еталон)")
+    for summary in results["parsers"]:
+        totals = collections.defaultdict(lambda: [0, 0])
+        for f in summary["per_file"]:
+            for block_type, values in f.get("agreement", {}).items():
+                totals[block_type][0] += values["count"]
+                totals[block_type][1] += values["reference"]
+        structure = " ".join(f"{totals[t][0]}/{totals[t][1]}" for t in STRUCTURE_TYPES) if totals else "-"
+        print(f"{summary['parser']:<12}{summary['files']:>7}{summary['seconds']:>9.3f}"
+              f"{summary['mb_per_s'] or 0:>8.2f}{summary['blocks_per_s'] or 0:>10.0f}"
+              f"{summary['output_bytes'] / 1024:>11.0f}{summary['peak_rss_bytes'] / 2**20:>9.1f}  {structure}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.parsers_bench")
+    arg_parser.add_argument("corpus", help="каталог з .htm або один файл")
+    arg_parser.add_argument("--parser", action="append", choices=sorted(PARSERS),
+                            help="парсер для вимірювання (можна кілька разів); за замовчуванням усі")
+    arg_parser.add_argument("--reference", help="каталог з еталонними JSON для порівняння структури")
+    arg_parser.add_argument("--output", help="куди записати результати у JSON")
+    args = arg_parser.parse_args(argv)
+
+    results = run(args.corpus, args.parser, args.reference)
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
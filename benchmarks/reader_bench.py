@@ -0,0 +1,77 @@
+"""Single-article latency: json.load of the whole output vs parsing.reader.LawReader.
+
+    python -m benchmarks.reader_bench [file.htm ...]
+"""
+import glob
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+from parsing.output import write_law, write_law_stream
+from parsing.parsers import iter_parse, parse
+from parsing.reader import LawReader, ReaderCache
+from parsing.structure import StructureIndexer, build_index, write_index
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+
+
+def convert(path, directory, parser="claude"):
+    """Write the .json and the indexed .ndjson outputs of one law; returns their paths."""
+    stem = os.path.join(directory, os.path.splitext(os.path.basename(path))[0])
+    law_data = parse(path, parser).to_dict()
+    write_law(law_data, stem + ".json")
+    indexer = StructureIndexer()
+    write_law_stream(iter_parse(path, parser), stem + ".ndjson", indexer)
+    write_index(indexer.finish(), stem + ".ndjson")
+    return stem + ".json", stem + ".ndjson", build_index(law_data["content"])
+
+
+def full_decode(json_path, entry):
+    with open(json_path, "r", encoding="utf-8") as f:
+        content = json.load(f)["content"]
+    return content[entry["blocks"][0]:entry["blocks"][1]]
+
+
+def cold_reader(ndjson_path, number):
+    with LawReader(ndjson_path) as reader:
+        return reader.article(number)
+
+
+def metadata_only(ndjson_path):
+    with LawReader(ndjson_path) as reader:
+        return reader.metadata
+
+
+def best_of(function, number=200, repeat=5):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or DEFAULT_INPUTS
+    cache = ReaderCache()
+    mismatches = 0
+    print(f"{'файл, KB':>10}{'json.load, мкс':>16}{'LawReader, мкс':>16}{'з кешем, мкс':>14}{'метадані, мкс':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        for path in paths:
+            json_path, ndjson_path, index = convert(path, directory)
+            if not index["articles"]:
+                continue
+            # Стаття з середини закону
+            numbers = list(index["articles"])
+            number = numbers[len(numbers) // 2]
+            entry = index["articles"][number]
+            mismatches += full_decode(json_path, entry) != cold_reader(ndjson_path, number)
+            full = best_of(lambda: full_decode(json_path, entry), number=20) * 1e6
+            cold = best_of(lambda: cold_reader(ndjson_path, number)) * 1e6
+            cached = best_of(lambda: cache.get(ndjson_path).article(number)) * 1e6
+            metadata = best_of(lambda: metadata_only(ndjson_path)) * 1e6
+            print(f"{os.path.getsize(json_path) / 1024:>10.0f}{full:>16.0f}{cold:>16.0f}{cached:>14.0f}{metadata:>15.0f}")
+        cache.close()
+    print(f"Розбіжностей з повним розбором: {mismatches}")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
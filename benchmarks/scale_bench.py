@@ -0,0 +1,134 @@
+"""Parse time and peak memory against input size for every parser, on synthetic laws.
+
+    python -m benchmarks.scale_bench [--sizes 10K 100K 1M 10M] [--seed 1] [--parser claude ...] \
+        [--corpus DIR] [--timeout 600] [--output scale.json] [--plot scale.png]
+
+Laws come from benchmarks.synthetic (kept in --corpus and reused between
+runs). Each parser and size runs in a fresh process, so peak RSS belongs to
+that run alone. The exponent column is the slope of log(time) over
+log(size) against the previous size: about 1 is linear, clearly above 1
+is superlinear. Counts are found/expected from the generator.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from benchmarks.parsers_bench import git_revision, run_parser
+from benchmarks.synthetic import DEFAULT_SIZES, generate, load_expected, parse_size, size_label
+from parsing.parsers import PARSERS
+
+COUNT_TYPES = ("article", "heading", "reference", "amendment", "table")
+
+
+def measure(parser_name, path, timeout):
+    """run_parser in a fresh process; None when it does not finish in timeout seconds."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        try:
+            return pool.apply_async(run_parser, (parser_name, [path])).get(timeout)
+        except multiprocessing.TimeoutError:
+            return None
+
+
+def run(sizes, parsers, corpus, seed=1, timeout=600):
+    rows = []
+    previous = {}
+    for size in sizes:
+        path = generate(corpus, size, seed)
+        expected = load_expected(path)
+        for parser_name in parsers:
+            row = {"parser": parser_name, "size": size_label(size), "input_bytes": expected["bytes"]}
+            measured = measure(parser_name, path, timeout)
+            if measured is None:
+                row["error"] = f"довше за {timeout} с"
+            elif "error" in measured["files"][0]:
+                row["error"] = measured["files"][0]["error"]
+            else:
+                result = measured["files"][0]
+                row.update({
+                    "seconds": result["seconds"],
+                    "mb_per_s": expected["bytes"] / 1e6 / result["seconds"],
+                    "peak_rss_bytes": measured["peak_rss"],
+                    "rss_growth_bytes": measured["peak_rss"] - measured["baseline_rss"],
+                    "blocks": result["blocks"],
+                    "counts": {t: [result["counts"].get(t, 0), expected["counts"][t]] for t in COUNT_TYPES},
+                })
+                last = previous.get(parser_name)
+                if last and last["input_bytes"] != row["input_bytes"]:
+                    row["exponent"] = (math.log(row["seconds"] / last["seconds"])
+                                       / math.log(row["input_bytes"] / last["input_bytes"]))
+                previous[parser_name] = row
+            rows.append(row)
+            print_row(row)
+    return rows
+
+
+def print_header():
+    print(f"{'парсер':<16}{'розмір':>7}{'час, с':>10}{'МБ/с':>8}{'показник':>10}{'RSS, МБ':>9}  "
+          + "/".join(COUNT_TYPES) + " (знайдено/очікувано)")
+
+
+def print_row(row):
+    if "error" in row:
+        print(f"{row['parser']:<16}{row['size']:>7}  {row['error']}")
+        return
+    exponent = f"{row['exponent']:.2f}" if "exponent" in row else "-"
+    counts = " ".join(f"{found}/{expected}" for found, expected in row["counts"].values())
+    print(f"{row['parser']:<16}{row['size']:>7}{row['seconds']:>10.3f}{row['mb_per_s']:>8.2f}{exponent:>10}"
+          f"{row['peak_rss_bytes'] / 2**20:>9.1f}  {counts}", flush=True)
+
+
+def plot(rows, path):
+    """Log-log time and peak RSS against input size, one line per parser."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise RuntimeError("Для графіка потрібен matplotlib: pip install matplotlib") from None
+    figure, (time_axis, memory_axis) = plt.subplots(1, 2, figsize=(12, 5))
+    for parser_name in dict.fromkeys(row["parser"] for row in rows):
+        done = [row for row in rows if row["parser"] == parser_name and "error" not in row]
+        sizes = [row["input_bytes"] / 1e6 for row in done]
+        time_axis.plot(sizes, [row["seconds"] for row in done], marker="o", label=parser_name)
+        memory_axis.plot(sizes, [row["peak_rss_bytes"] / 2**20 for row in done], marker="o", label=parser_name)
+    for axis, label in ((time_axis, "час, с"), (memory_axis, "пік RSS, МБ")):
+        axis.set_xscale("log")
+        axis.set_yscale("log")
+        axis.set_xlabel("розмір, МБ")
+        axis.set_ylabel(label)
+        axis.grid(True, which="both", alpha=0.3)
+    time_axis.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.scale_bench")
+    arg_parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="розміри: 10K, 1M, 100M")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--parser", action="append", choices=sorted(PARSERS),
+                            help="парсер для вимірювання (можна кілька разів); за замовчуванням усі")
+    arg_parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "lawparse-synthetic"),
+                            help="каталог згенерованих законів (наявні файли використовуються повторно)")
+    arg_parser.add_argument("--timeout", type=float, default=600, help="ліміт на один парсер і розмір, с")
+    arg_parser.add_argument("--output", help="куди записати результати у JSON")
+    arg_parser.add_argument("--plot", help="куди зберегти графік (потребує matplotlib)")
+    args = arg_parser.parse_args(argv)
+
+    sizes = sorted(map(parse_size, args.sizes))
+    print_header()
+    rows = run(sizes, args.parser or sorted(PARSERS), args.corpus, args.seed, args.timeout)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"revision": git_revision(), "seed": args.seed, "rows": rows}, f, ensure_ascii=False, indent=2)
+    if args.plot:
+        plot(rows, args.plot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Encode time, decode time and size of every serializer backend on parsed laws.
+
+    python -m benchmarks.serializer_bench [--synthetic 1M 10M] [--parser claude] [file.htm ...]
+
+Backends that are not installed are reported and skipped. The "без таблиці"
+rows pack the same dict with plain msgpack/CBOR, to show what the interned
+string table of the lawpack envelope saves.
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import timeit
+
+from benchmarks.synthetic import generate, parse_size
+from parsing.parsers import parse
+from parsing.serializers import dumps_binary, json_dumps, json_loads, loads_binary
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+
+
+def backends():
+    """[(name, encode, decode) or (name, None, reason)]."""
+    found = []
+    for serializer in ("json", "orjson"):
+        try:
+            dumps, loads = json_dumps(serializer), json_loads(serializer)
+        except RuntimeError as e:
+            found.append((serializer, None, str(e)))
+            continue
+        found.append((serializer, lambda data, dumps=dumps: dumps(data, indent=2).encode("utf-8"), loads))
+        found.append((f"{serializer} compact", lambda data, dumps=dumps: dumps(data).encode("utf-8"), loads))
+    for fmt, module, pack, unpack in (("msgpack", "msgpack", "packb", "unpackb"), ("cbor", "cbor2", "dumps", "loads")):
+        try:
+            codec = __import__(module)
+        except ImportError:
+            found.append((fmt, None, f"не встановлено {module}"))
+            continue
+        found.append((fmt, lambda data, fmt=fmt: dumps_binary(data, fmt), lambda data, fmt=fmt: loads_binary(data, fmt)))
+        options = {"strict_map_key": False} if fmt == "msgpack" else {}
+        found.append((f"{fmt} без таблиці", getattr(codec, pack),
+                      lambda data, unpack=getattr(codec, unpack): unpack(data, **options)))
+    return found
+
+
+def best_of(function, repeat=5):
+    number = 1
+    # Скільки викликів на одне вимірювання, щоб воно тривало хоча б 0.1 с
+    while min(timeit.repeat(function, number=number, repeat=1)) < 0.1 and number < 1000:
+        number *= 4
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serializer_bench")
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--synthetic", nargs="+", default=[], help="ще й синтетичні закони цих розмірів")
+    parser.add_argument("--parser", default="claude")
+    args = parser.parse_args(argv)
+
+    available = backends()
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as directory:
+        paths = (args.paths or DEFAULT_INPUTS) + [generate(directory, parse_size(size)) for size in args.synthetic]
+        for path in paths:
+            law_data = parse(path, args.parser).to_dict()
+            print(f"\n{os.path.basename(path)} ({os.path.getsize(path) / 1024:.0f} KB, {len(law_data['content'])} блоків)")
+            print(f"{'бекенд':<22}{'кодування, мс':>15}{'декодування, мс':>17}{'розмір, KB':>12}")
+            for name, encode, decode in available:
+                if encode is None:
+                    print(f"{name:<22}  {decode}")
+                    continue
+                data = encode(law_data)
+                mismatches += decode(data) != law_data
+                encode_seconds = best_of(lambda: encode(law_data))
+                decode_seconds = best_of(lambda: decode(data))
+                print(f"{name:<22}{encode_seconds * 1e3:>15.2f}{decode_seconds * 1e3:>17.2f}{len(data) / 1024:>12.0f}")
+    print(f"\nРозбіжностей після зворотного читання: {mismatches}")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Per-document latency: a `python -m parsing convert` process per file vs the warm conversion service.
+
+    python -m benchmarks.service_bench [--requests 20] [--paragraphs 40] [file.htm ...]
+
+Besides every input file, a small act is cut from the first one (its first
+--paragraphs paragraphs), the typical size of an amendment in an ingestion
+stream.
+"""
+import argparse
+import glob
+import http.client
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from parsing.parsers import parse
+from parsing.service import ConversionService, make_server
+from parsing.source import MappedSource
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+PARAGRAPH_END = re.compile(rb"</p\s*>", re.IGNORECASE)
+
+
+def small_act(path, directory, paragraphs):
+    """The document head and the first paragraphs of its article, as a new file."""
+    with MappedSource(path) as source:
+        data = source.data[:]
+        start, end = source.article_range
+    cut = start
+    for i, match in enumerate(PARAGRAPH_END.finditer(data, start, end)):
+        cut = match.end()
+        if i + 1 == paragraphs:
+            break
+    small_path = os.path.join(directory, "small.htm")
+    with open(small_path, "wb") as f:
+        f.write(data[:cut] + b"</div></body></html>")
+    return small_path
+
+
+def subprocess_latency(path, directory, requests):
+    seconds = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "parsing", "convert", path, "--out", directory, "--force",
+                        "--jobs", "1", "--format", "compact"], check=True, stdout=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+def service_latency(connection, data, requests):
+    seconds = []
+    body = None
+    for _ in range(requests):
+        started = time.perf_counter()
+        connection.request("POST", "/convert?parser=claude", body=data)
+        response = connection.getresponse()
+        body = response.read()
+        seconds.append(time.perf_counter() - started)
+        if response.status != 200:
+            raise RuntimeError(body.decode("utf-8"))
+    return seconds, json.loads(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.service_bench")
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=40, help="абзаців у малому акті")
+    args = parser.parse_args(argv)
+
+    service = ConversionService(jobs=1, parsers=["claude"])
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    mismatches = 0
+    print(f"{'файл, KB':>10}{'процес на файл, мс':>20}{'сервіс, мс':>12}{'прискорення':>13}")
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = args.paths or DEFAULT_INPUTS
+            for path in [small_act(paths[0], directory, args.paragraphs)] + paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                cold = statistics.median(subprocess_latency(path, directory, max(args.requests // 4, 3)))
+                warm, law_data = service_latency(connection, data, args.requests)
+                warm = statistics.median(warm)
+                mismatches += law_data != parse(path, "claude").to_dict()
+                print(f"{len(data) / 1024:>10.0f}{cold * 1e3:>20.1f}{warm * 1e3:>12.1f}{cold / warm:>12.1f}x")
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+        service.close()
+    print(f"Розбіжностей з parse(): {mismatches}")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
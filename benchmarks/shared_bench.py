@@ -0,0 +1,45 @@
+"""N separate parses vs one shared tree for N parsers (parsing.shared), with an identity check.
+
+    python -m benchmarks.shared_bench [file.htm ...]
+"""
+import glob
+import sys
+import time
+
+from parsing.parsers import TREE_PARSERS, get_parser
+from parsing.shared import run_shared
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+
+
+def best_of(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or DEFAULT_INPUTS
+    names = list(TREE_PARSERS)
+    mismatches = 0
+    separate_total = shared_total = 0.0
+    for path in paths:
+        separate, separate_seconds = best_of(lambda: {name: get_parser(name)(path) for name in names})
+        (shared, timings), shared_seconds = best_of(lambda: run_shared(path, names))
+        mismatches += sum(shared[name] != separate[name] for name in names)
+        separate_total += separate_seconds
+        shared_total += shared_seconds
+        print(f"{path}: окремо {separate_seconds:.3f} с, спільне дерево {shared_seconds:.3f} с "
+              f"(розбір {timings['dom']:.3f} с)")
+    print(f"{len(names)} парсерів, {len(paths)} файл(ів): окремо {separate_total:.3f} с, "
+          f"спільне дерево {shared_total:.3f} с ({separate_total / shared_total:.1f}x)")
+    print(f"Розбіжностей з окремими запусками: {mismatches}")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
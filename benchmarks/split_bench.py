@@ -0,0 +1,48 @@
+"""Serial parse_npa_html vs parse_npa_parallel on one large law, with an identity check.
+
+    python -m benchmarks.split_bench [--jobs 2 4 8] [file.htm ...]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from parsing.parsers.Google_AI_Studio_parser_htm_to_json import parse_npa_html, parse_npa_parallel
+from parsing.source import MappedSource
+from parsing.split import article_slices
+
+DEFAULT_INPUTS = glob.glob("law-examples/*.htm")
+
+
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.split_bench")
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    parser.add_argument("--min-slice", type=int, default=64 * 1024, help="мінімальний шматок, байт")
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    print(f"CPU: {os.cpu_count()}")
+    print(f"{'файл, MB':>9}{'jobs':>6}{'шматків':>9}{'послідовно, с':>15}{'паралельно, с':>15}{'прискорення':>13}")
+    for path in args.paths or DEFAULT_INPUTS:
+        serial, serial_seconds = timed(parse_npa_html, path)
+        for jobs in sorted(set(args.jobs)):
+            with MappedSource(path) as source:
+                slices, _ = article_slices(source.data, source.article_range, source.encoding, jobs, args.min_slice)
+            parallel, parallel_seconds = timed(parse_npa_parallel, path, jobs, args.min_slice)
+            mismatches += parallel != serial
+            print(f"{os.path.getsize(path) / 1e6:>9.1f}{jobs:>6}{len(slices):>9}{serial_seconds:>15.2f}"
+                  f"{parallel_seconds:>15.2f}{serial_seconds / parallel_seconds:>12.1f}x")
+    print(f"Розбіжностей з послідовним розбором: {mismatches}")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Seeded generator of zakon.rada.gov.ua-shaped laws for scale and stress benchmarks.
+
+    python -m benchmarks.synthetic OUT_DIR [--sizes 10K 1M 100M] [--seed 1]
+
+Every <name>.htm is written with a <name>.expected.json that records what was
+generated: section and chapter headings, articles, amendment notes,
+references, tables, paragraphs and list items. The same seed and size always
+give the same bytes.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+DEFAULT_SIZES = ("10K", "100K", "1M", "10M")
+# Скликання: римський номер у номері закону і числовий код в адресі rada
+CONVOCATIONS = (("VIII", "19"), ("IX", "20"))
+WORDS = (
+    "автомобільний", "транспорт", "перевізник", "пасажир", "вантаж", "договір", "орган", "виконавчої", "влади",
+    "центральний", "державний", "контроль", "нагляд", "порядок", "умови", "вимоги", "безпеки", "руху",
+    "послуги", "надання", "перевезення", "маршрут", "територія", "населеного", "пункту", "особа", "фізична",
+    "юридична", "суб'єкт", "господарювання", "ліцензія", "дозвіл", "документ", "реєстр", "відомості",
+    "відповідно", "до", "на", "у", "з", "та", "або", "щодо", "який", "що", "встановлюється", "визначається",
+    "здійснюється", "забезпечує", "зобов'язаний", "має", "право", "строк", "днів", "рішення", "заява",
+    "власник", "засобу", "технічного", "стану", "обладнання", "місцевого", "самоврядування", "громади",
+    "інформація", "електронного", "квитка", "оплати", "проїзду", "тарифи", "кошти", "бюджету", "звітність",
+    "порушення", "відповідальність", "штраф", "розмірі", "неоподатковуваних", "мінімумів", "доходів",
+    "громадян", "Кабінет", "Міністрів", "України", "уповноважений", "посадова", "перевірка", "акт",
+)
+TITLE_WORDS = ("організацію", "діяльність", "регулювання", "безпеку", "ринок", "послуги", "публічний",
+               "транспортний", "електронний", "державний", "нагляд", "інфраструктуру", "перевезень")
+AMENDMENT_NOTES = (
+    "{{Статтю {article} доповнено частиною {part} згідно із Законом ",
+    "{{Частину {part} статті {article} викладено в новій редакції згідно із Законом ",
+    "{{Пункт {part} частини першої статті {article} виключено згідно із Законом ",
+    "{{Абзац {part} статті {article} із змінами, внесеними згідно із Законом ",
+)
+ROMAN = ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+         (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"))
+STYLE = """<style>
+span.rvts9{font-size:12pt;font-family:'Times New Roman';font-style:normal;font-weight:bold;text-decoration:none}
+span.rvts15{font-size:14pt;font-family:'Times New Roman';font-style:normal;font-weight:bold;text-decoration:none}
+span.rvts23{font-size:16pt;font-family:'Times New Roman';font-style:normal;font-weight:bold;text-decoration:none}
+span.rvts44{font-size:12pt;font-family:'Times New Roman';font-style:normal;font-weight:bold;text-decoration:none}
+span.rvts46{font-size:12pt;font-family:'Times New Roman';font-style:italic;font-weight:normal;color:#000;text-decoration:none}
+a.rvts96{font-size:12pt;font-family:'Times New Roman';color:#000099;font-style:italic;text-decoration:underline}
+.rvps2{text-align:justify;text-indent:1.5em;margin:0 0 .5em}
+.rvps7{text-align:center;margin:0 0 .5em}
+</style>
+"""
+FLUSH_BYTES = 1024 * 1024
+# Розділів не більше за XXXIX, як у найбільших кодексах: великі закони ростуть главами і статтями
+MAX_SECTIONS = 39
+SECTION_BYTES = 32 * 1024  # середній розділ при множнику 1
+
+
+def parse_size(text):
+    """"10K", "1.5M", "100M" or plain bytes as an int."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1] if text and text[-1] in SIZE_UNITS else ""
+    return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+
+def size_label(size):
+    for unit in ("G", "M", "K"):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+    return str(size)
+
+
+def roman(number):
+    digits = []
+    for value, symbol in ROMAN:
+        count, number = divmod(number, value)
+        digits.append(symbol * count)
+    return "".join(digits)
+
+
+class SyntheticLaw:
+    """One generated law of about size bytes; write() returns the expected counts."""
+
+    def __init__(self, size, seed=1):
+        self.size = size
+        self.seed = seed
+        # Окремий потік випадкових чисел для кожного розміру: 10M не залежить від того, чи генерувався 1M
+        self.rng = random.Random(f"{seed}:{size}")
+        self.anchor = 0
+        self.law_number, self.law_date = self.law()
+        self.title = "Про " + " ".join(self.rng.sample(TITLE_WORDS, 3))
+        # Множник кількості глав у розділі і статей у главі
+        self.spread = math.ceil(math.sqrt(max(1, size / (MAX_SECTIONS * 0.8 * SECTION_BYTES))))
+        self.counts = dict.fromkeys(("section", "chapter", "article", "amendment", "reference", "table",
+                                     "paragraph", "list_item"), 0)
+
+    def law(self):
+        roman_number, _ = self.rng.choice(CONVOCATIONS)
+        date = f"{self.rng.randint(1, 28):02d}.{self.rng.randint(1, 12):02d}.{self.rng.randint(2015, 2024)}"
+        return f"{self.rng.randint(100, 4999)}-{roman_number}", date
+
+    def link(self, css_class):
+        number, date = self.law()
+        code = dict(CONVOCATIONS)[number.split("-")[1]]
+        href = f"https://zakon.rada.gov.ua/laws/show/{number.split('-')[0]}-{code}#n{self.rng.randint(2, 900)}"
+        return f"<a class={css_class} href={href} target=_blank>№ {number} від {date}</a>"
+
+    def sentence(self, low=8, high=30):
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        return " ".join(words)[:1].upper() + " ".join(words)[1:]
+
+    def p(self, css_class, html):
+        self.anchor += 1
+        return f"<p class={css_class}><a name=n{self.anchor}></a>\n{html}</p>\n"
+
+    def table(self, rows):
+        """A rada layout table: <div class=rvps8> around a borderless table of <p> cells."""
+        self.anchor += 1
+        self.counts["table"] += 1
+        cells = []
+        for row in rows:
+            cells.append("<tr valign=top>\n" + "".join(
+                f"<td>\n<p class=rvps4><span class=rvts44>{cell}</span></p>\n</td>\n" for cell in row) + "</tr>\n")
+        return (f"<div class=rvps8><a name=n{self.anchor}></a>\n"
+                f"<table width=100% border=0 cellpadding=0 cellspacing=0>\n{''.join(cells)}</table>\n</div>\n")
+
+    def header(self):
+        year = self.law_date[-4:]
+        amending = "".join(f"\n<br>{self.link('rvts96')}, ВВР, {year}, № {self.rng.randint(1, 50)}, "
+                           f"ст.{self.rng.randint(1, 900)}" for _ in range(self.rng.randint(1, 12)))
+        # "згідно із Законами" — не фраза поправки, класифікатор бачить тут посилання
+        self.counts["reference"] += 1
+        return (
+            "<!DOCTYPE html>\n<html lang=\"uk\"><head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{self.title} | від {self.law_date} № {self.law_number}</title>\n</head><body>\n"
+            "<div id=\"article\"><div style=\"width:660px;max-width:100%;margin:0 auto\">" + STYLE
+            + "<span class=rvts0>" + self.table([["<span class=rvts78>ЗАКОН УКРАЇНИ</span>"]])
+            + self.p("rvps6", f"<span class=rvts23>{self.title}</span>")
+            + "<em>" + self.p("rvps7", f"<span class=rvts44>(Відомості Верховної Ради України (ВВР), {year}, "
+                                       f"№ {self.rng.randint(1, 50)}, ст.{self.rng.randint(1, 900)})</span>")
+            + "</em><em>" + self.p("rvps18", "{Із змінами, внесеними згідно із Законами" + amending + "}")
+            + "</em>"
+        )
+
+    def footer(self):
+        day, month, year = self.law_date.split(".")
+        signature = self.table([["Президент України", "В.ЗЕЛЕНСЬКИЙ"],
+                                [f"м. Київ \n<br>{int(day)}.{month}.{year} \n<br>№ {self.law_number}", "<br>"]])
+        return (
+            signature + "</span>\n</div></div>\n"
+            "<div class=\"stamp\">\n<br><table width=100% border=0><tr>\n"
+            f"<td valign=top width=60%>{self.title}<br><small>Закон України від {self.law_date} "
+            f"№ {self.law_number}</small></td>\n</tr></table>\n"
+            "<br><br><hr><h2 class=hdr1>Публікації документа</h2>\n<ul class=num>\n"
+            f"<li><b>Голос України</b> від {self.law_date} &mdash; № {self.rng.randint(1, 250)}</li>\n"
+            "</ul></div>\n</body>\n</html>\n"
+        )
+
+    def section(self):
+        self.counts["section"] += 1
+        number = roman(self.counts["section"])
+        return self.p("rvps7", f"<span class=rvts15>Розділ {number} </span>\n"
+                               f"<br><span class=rvts15>{self.sentence(3, 8).upper()}</span>")
+
+    def chapter(self):
+        self.counts["chapter"] += 1
+        return self.p("rvps7", f"<span class=rvts15>Глава {self.counts['chapter']} </span>\n"
+                               f"<br><span class=rvts15>{self.sentence(3, 8).upper()}</span>")
+
+    def article(self):
+        self.counts["article"] += 1
+        number = self.counts["article"]
+        parts = [self.p("rvps2", f"<span class=rvts9>Стаття {number}. </span>{self.sentence(3, 10)}")]
+        for part in range(1, self.rng.randint(1, 6) + 1):
+            roll = self.rng.random()
+            if roll < 0.1:
+                self.counts["reference"] += 1
+                parts.append(self.p("rvps2", f"{part}. {self.sentence()} відповідно до Закону України "
+                                             f"{self.link('rvts96')} {self.sentence(4, 12).lower()}."))
+            elif roll < 0.3:
+                self.counts["paragraph"] += 1
+                parts.append(self.p("rvps2", f"{part}. {self.sentence()}:"))
+                items = self.rng.randint(2, 8)
+                for item in range(1, items + 1):
+                    self.counts["list_item"] += 1
+                    end = "." if item == items else ";"
+                    parts.append(self.p("rvps2", f"{item}) {self.sentence(4, 16).lower()}{end}"))
+            else:
+                self.counts["paragraph"] += 1
+                parts.append(self.p("rvps2", f"{part}. {self.sentence()}."))
+            if self.rng.random() < 0.15:
+                self.counts["amendment"] += 1
+                note = self.rng.choice(AMENDMENT_NOTES).format(article=number, part=part)
+                parts.append("<em>" + self.p("rvps2", f"<span class=rvts46>{note}</span>{self.link('rvts100')}"
+                                                      "<span class=rvts46>}</span>") + "</em>")
+        if self.rng.random() < 0.03:
+            columns = self.rng.randint(2, 5)
+            rows = [[self.sentence(1, 3) for _ in range(columns)] for _ in range(self.rng.randint(2, 12))]
+            parts.append(self.table(rows))
+        return "".join(parts)
+
+    def write(self, file):
+        """Write the law as UTF-8 to a binary file; returns the expected.json payload."""
+        written = 0
+        buffer = []
+        buffered = 0
+
+        def emit(text):
+            nonlocal written, buffered
+            data = text.encode("utf-8")
+            buffer.append(data)
+            buffered += len(data)
+            written += len(data)
+            if buffered >= FLUSH_BYTES:
+                file.write(b"".join(buffer))
+                buffer.clear()
+                buffered = 0
+
+        emit(self.header())
+        footer = self.footer()
+        target = self.size - len(footer.encode("utf-8"))
+        while written < target:
+            if self.counts["section"] < MAX_SECTIONS:
+                emit(self.section())
+            chapters = self.rng.randint(1, 4) * self.spread if self.rng.random() < 0.6 else 0
+            for _ in range(chapters or 1):
+                if chapters:
+                    emit(self.chapter())
+                for _ in range(self.rng.randint(2, 8) * self.spread):
+                    emit(self.article())
+                    if written >= target:
+                        break
+                if written >= target:
+                    break
+        emit(footer)
+        file.write(b"".join(buffer))
+        counts = dict(self.counts)
+        counts["heading"] = counts["section"] + counts["chapter"]
+        return {
+            "seed": self.seed,
+            "target_bytes": self.size,
+            "bytes": written,
+            "title": f"{self.title} | від {self.law_date} № {self.law_number}",
+            "law_number": self.law_number,
+            "law_date": self.law_date,
+            "counts": counts,
+        }
+
+
+def synthetic_filename(size, seed=1):
+    # Ідентифікатор у стилі rada (d<номер>-<редакція>), щоб маніфест і граф бачили окремі документи
+    return f"Синтетичний закон {size_label(size)} - s{seed} - d9{seed:02d}{size}-20240101.htm"
+
+
+def expected_path_for(html_path):
+    return os.path.splitext(html_path)[0] + ".expected.json"
+
+
+def load_expected(html_path):
+    """The expected.json next to a generated law, or None."""
+    try:
+        with open(expected_path_for(html_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def generate(directory, size, seed=1, force=False):
+    """Write one synthetic law into directory (reused if already there); returns its path."""
+    path = os.path.join(directory, synthetic_filename(size, seed))
+    if not force and os.path.exists(path) and load_expected(path) is not None:
+        return path
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        expected = SyntheticLaw(size, seed).write(f)
+    with open(expected_path_for(path), "w", encoding="utf-8") as f:
+        json.dump(expected, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic")
+    parser.add_argument("out", help="каталог для згенерованих .htm і .expected.json")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="розміри: 10K, 1M, 100M або байти")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="перегенерувати наявні файли")
+    args = parser.parse_args(argv)
+
+    for size in map(parse_size, args.sizes):
+        path = generate(args.out, size, args.seed, args.force)
+        counts = load_expected(path)["counts"]
+        print(f"{os.path.getsize(path):>12} {os.path.basename(path)}: розділів {counts['section']}, "
+              f"глав {counts['chapter']}, статей {counts['article']}, поправок {counts['amendment']}, "
+              f"посилань {counts['reference']}, таблиць {counts['table']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
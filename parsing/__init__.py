@@ -0,0 +1,3 @@
+from .model import (Amendment, Article, Heading, LawDocument, ListBlock, Paragraph,
+                    Reference, Table)
+from .parsers import PARSERS, iter_parse, parse, register_parser
@@ -0,0 +1,397 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from .batch import convert_directory, find_html_files, output_path_for
+from .chunking import DEFAULT_BUDGET, chunk_file, chunks_path_for, token_counter
+from .blockstore import STORE_FILENAME, BlockStore
+from .diff import diff_documents, format_changes, load_document
+from .fetch import BASE_URL, fetch_laws
+from .graph import GRAPH_FILENAME, LawGraph
+from .manifest import MANIFEST_FILENAME, Manifest
+from .output import FORMATS, write_law
+from .parsers import PARSERS, TREE_PARSERS
+from .profiling import summarize_stages, write_metrics
+from .reader import LawReader
+from .search import SEARCH_FILENAME, SearchIndex, index_directory
+from .serializers import SERIALIZERS
+from .service import DEFAULT_PORT, DEFAULT_QUEUE, DEFAULT_TIMEOUT, MAX_BODY_BYTES
+from .shared import BUILDERS, consensus, run_shared
+from .tables import EXPORT_FORMATS, TABLE_MODES
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m parsing")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="перетворити .htm закони в JSON")
+    convert.add_argument("path", help="каталог з .htm файлами або один файл")
+    convert.add_argument("--parser", choices=sorted(PARSERS), default="claude")
+    convert.add_argument("--jobs", "-j", type=int, default=None,
+                         help="кількість процесів (за замовчуванням — кількість CPU)")
+    convert.add_argument("--out", default=None,
+                         help="каталог для JSON (дзеркальне дерево); за замовчуванням — поруч із .htm")
+    convert.add_argument("--format", choices=FORMATS, default="json",
+                         help="json — з відступами, compact — без відступів, ndjson — блок на рядок, "
+                              "tree — вкладене дерево розділів і статей, msgpack / cbor — бінарний об'єкт "
+                              "з таблицею рядків (pip install msgpack / cbor2)")
+    convert.add_argument("--serializer", choices=SERIALIZERS, default="json",
+                         help="бекенд JSON для текстових форматів: json — стандартний, orjson — швидший "
+                              "(pip install orjson); вивід однаковий")
+    convert.add_argument("--index", action="store_true",
+                         help="записати поруч *.index.json: номер статті / шлях розділу → діапазон блоків (і байтів для ndjson)")
+    convert.add_argument("--tables", choices=TABLE_MODES, default="rows",
+                         help="rows — таблиця як список рядків (data), columnar — як список стовпців (columns)")
+    convert.add_argument("--export-tables", choices=EXPORT_FORMATS, default=None,
+                         help="додатково записати кожну таблицю в <вивід>.tables/ (parquet потребує pyarrow)")
+    convert.add_argument("--manifest", default=None,
+                         help=f"файл кешу конвертацій (за замовчуванням {MANIFEST_FILENAME} у каталозі виводу)")
+    convert.add_argument("--force", action="store_true",
+                         help="перетворити всі файли, ігноруючи кеш")
+    convert.add_argument("--graph", nargs="?", const="", default=None, metavar="DB",
+                         help=f"оновити граф змін/посилань (за замовчуванням {GRAPH_FILENAME} у каталозі виводу)")
+    convert.add_argument("--store", nargs="?", const="", default=None, metavar="DB",
+                         help=f"архівувати редакції у сховищі блоків без дублікатів "
+                              f"(за замовчуванням {STORE_FILENAME} у каталозі виводу)")
+    convert.add_argument("--metrics", default=None, metavar="FILE",
+                         help="записати час (і пам'ять) кожного етапу розбору по файлах: "
+                              "*.prom — у форматі Prometheus, інакше JSON")
+    convert.add_argument("--trace-allocations", action="store_true",
+                         help="рахувати виділення пам'яті по етапах (tracemalloc, помітно повільніше)")
+    convert.add_argument("--profile-dump", default=None, metavar="DIR",
+                         help="записати cProfile (.prof) і, з --trace-allocations, топ виділень для кожного файла")
+
+    graph = commands.add_parser("graph", help="запит до графа змін і посилань між законами")
+    graph.add_argument("relation", choices=["amends", "amended-by", "cites", "cited-by"])
+    graph.add_argument("law_number", help="номер акта, напр. 586-VI")
+    graph.add_argument("--db", default=GRAPH_FILENAME, help="файл графа")
+
+    store = commands.add_parser("store", help="архів редакцій у сховищі блоків")
+    store.add_argument("action", choices=["list", "get", "stats", "gc"])
+    store.add_argument("document", nargs="?", help="ID документа (d81073) для list/get")
+    store.add_argument("revision", nargs="?", help="дата редакції (20241115) для get")
+    store.add_argument("--parser", choices=sorted(PARSERS), default="claude")
+    store.add_argument("--db", default=STORE_FILENAME, help="файл сховища")
+    store.add_argument("--out", default=None, help="куди записати відновлений JSON (get); за замовчуванням stdout")
+
+    chunk = commands.add_parser("chunk", help="нарізати закони на фрагменти під бюджет токенів (NDJSON)")
+    chunk.add_argument("path", help="каталог з .htm, один .htm або перетворений .ndjson")
+    chunk.add_argument("--parser", choices=sorted(PARSERS), default="claude")
+    chunk.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="максимум токенів у фрагменті")
+    chunk.add_argument("--tokenizer", default="approx",
+                       help="approx — оцінка за довжиною, tiktoken:<кодування> — точний підрахунок")
+    chunk.add_argument("--out", default=None, help="каталог для *.chunks.ndjson; за замовчуванням — поруч із вхідними")
+
+    index = commands.add_parser("index", help="оновити повнотекстовий індекс з перетворених .json/.ndjson")
+    index.add_argument("path", help="каталог виводу convert або один файл")
+    index.add_argument("--db", default=None, help=f"файл індексу (за замовчуванням {SEARCH_FILENAME} у каталозі)")
+    index.add_argument("--force", action="store_true", help="переіндексувати всі закони")
+
+    search = commands.add_parser("search", help="пошук по статтях і абзацах законів")
+    search.add_argument("query", help='слова (усі мають зустрітися) або "фраза в лапках"')
+    search.add_argument("--db", default=SEARCH_FILENAME, help="файл індексу")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--document", default=None, help="шукати лише в одному документі (d81073)")
+    search.add_argument("--by-article", action="store_true", help="групувати збіги за статтями")
+
+    read = commands.add_parser("read", help="прочитати частину перетвореного .ndjson без розбору всього файла")
+    read.add_argument("path", help="вивід convert --format ndjson (індекс --index пришвидшує доступ)")
+    target = read.add_mutually_exclusive_group()
+    target.add_argument("--article", default=None, help="номер статті, напр. 12-1")
+    target.add_argument("--section", default=None, help='шлях розділу, напр. "Розділ II/Глава 3"')
+    target.add_argument("--blocks", default=None, metavar="START:STOP", help="діапазон блоків, напр. 10:20")
+
+    compare = commands.add_parser("compare", help="усі парсери над одним розбором документа і їх згода між собою")
+    compare.add_argument("path", help="каталог з .htm файлами або один файл")
+    compare.add_argument("--parsers", nargs="+", choices=sorted(TREE_PARSERS), default=list(TREE_PARSERS),
+                         help="перший — опорний для консенсусу")
+    compare.add_argument("--builder", choices=BUILDERS, default="html.parser",
+                         help="html.parser дає ті самі результати, що й окремі парсери; lxml швидший")
+    compare.add_argument("--quorum", type=int, default=None,
+                         help="скільки парсерів мають знайти блок (за замовчуванням — більшість)")
+    compare.add_argument("--out", default=None, help="каталог для консенсусних JSON")
+
+    diff = commands.add_parser("diff", help="що змінилося між двома редакціями закону")
+    diff.add_argument("old", help="стара редакція: .htm або вже перетворений .json/.ndjson")
+    diff.add_argument("new", help="нова редакція")
+    diff.add_argument("--parser", choices=sorted(PARSERS), default="claude")
+    diff.add_argument("--json", action="store_true", help="вивести зміни у JSON замість тексту")
+
+    fetch = commands.add_parser("fetch", help="завантажити закони з zakon.rada.gov.ua у каталог корпусу")
+    fetch.add_argument("laws", nargs="*", help="номери законів, напр. 2344-14 або 2344-14@20241115 (редакція)")
+    fetch.add_argument("--list", default=None, help="файл зі списком номерів, по одному на рядок")
+    fetch.add_argument("--out", default=".", help="каталог корпусу")
+    fetch.add_argument("--base-url", default=BASE_URL, help="адреса сервера (для локальної заміни)")
+    fetch.add_argument("--concurrency", type=int, default=8, help="одночасних запитів і з'єднань у пулі")
+    fetch.add_argument("--retries", type=int, default=3, help="повторів при 429/5xx і мережевих помилках")
+
+    standin = commands.add_parser("serve-standin", help="локальна заміна zakon.rada.gov.ua для перевірки fetch")
+    standin.add_argument("path", help="каталог з .htm файлами")
+    standin.add_argument("--port", type=int, default=8000)
+    standin.add_argument("--fail-first", type=int, default=0,
+                         help="відповідати 503 на перші N запитів до кожної адреси")
+
+    serve = commands.add_parser("serve", help="постійний сервіс перетворення з прогрітими процесами-воркерами")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--unix", default=None, help="слухати Unix-сокет за цим шляхом замість TCP")
+    serve.add_argument("--jobs", type=int, default=None, help="процесів-воркерів (за замовчуванням — кількість ядер)")
+    serve.add_argument("--queue", type=int, default=DEFAULT_QUEUE, help="запитів у черзі понад воркери, решті — 503")
+    serve.add_argument("--parser", choices=sorted(PARSERS), default="claude", help="парсер за замовчуванням")
+    serve.add_argument("--preload", nargs="+", choices=sorted(PARSERS), default=None,
+                       help="парсери, доступні сервісу і прогріті у воркерах (за замовчуванням — усі)")
+    serve.add_argument("--root", default=None, help="каталог, файли з якого можна конвертувати параметром path")
+    serve.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="ліміт на один документ, с")
+    serve.add_argument("--max-body", type=int, default=MAX_BODY_BYTES, help="найбільше тіло запиту, байт")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.command == "convert":
+        manifest_dir = args.out or (args.path if os.path.isdir(args.path) else os.path.dirname(args.path))
+        manifest_path = args.manifest or os.path.join(manifest_dir or ".", MANIFEST_FILENAME)
+        os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+        manifest = Manifest(manifest_path)
+        graph = None
+        if args.graph is not None:
+            graph = LawGraph(args.graph or os.path.join(manifest_dir or ".", GRAPH_FILENAME))
+        store = None
+        if args.store is not None:
+            store = BlockStore(args.store or os.path.join(manifest_dir or ".", STORE_FILENAME))
+        profile = None
+        metrics = []
+        if args.metrics or args.trace_allocations or args.profile_dump:
+            profile = {"allocations": args.trace_allocations, "dump": args.profile_dump}
+        started = time.perf_counter()
+        try:
+            results = convert_directory(args.path, args.parser, output_dir=args.out, jobs=args.jobs,
+                                        manifest=manifest, force=args.force, fmt=args.format,
+                                        index=args.index, graph=graph, tables=args.tables,
+                                        export_tables=args.export_tables, store=store,
+                                        profile=profile, metrics=metrics, serializer=args.serializer)
+        finally:
+            manifest.close()
+            if graph is not None:
+                graph.close()
+            if store is not None:
+                store.close()
+        failed = sum(isinstance(outcome, Exception) for outcome in results.values())
+        skipped = sum(outcome is None for outcome in results.values())
+        print(f"\nОброблено файлів: {len(results) - failed - skipped}, пропущено: {skipped}, "
+              f"помилок: {failed}, загальний час: {time.perf_counter() - started:.2f} с")
+        if profile is not None:
+            for parser_name, totals in summarize_stages(metrics).items():
+                print(f"Етапи ({parser_name}): " + ", ".join(
+                    f"{stage} {values['seconds']:.2f} с" for stage, values in totals.items()))
+        if args.metrics:
+            os.makedirs(os.path.dirname(args.metrics) or ".", exist_ok=True)
+            write_metrics(metrics, args.metrics)
+            print(f"Метрики етапів: {args.metrics}")
+        return 1 if failed else 0
+
+    if args.command == "graph":
+        if not os.path.exists(args.db):
+            print(f"Граф '{args.db}' не знайдено")
+            return 1
+        graph = LawGraph(args.db)
+        try:
+            query = getattr(graph, args.relation.replace("-", "_"))
+            rows = query(args.law_number)
+        finally:
+            graph.close()
+        for row in rows:
+            print(f"{row['law_number']}\t{row['law_date'] or ''}\t{row['mentions']}")
+        return 0
+
+    if args.command == "store":
+        if not os.path.exists(args.db):
+            print(f"Сховище '{args.db}' не знайдено")
+            return 1
+        store = BlockStore(args.db)
+        try:
+            if args.action == "list":
+                for row in store.revisions(args.document):
+                    print(f"{row['document']}\t{row['revision']}\t{row['parser']}\t{row['blocks']}")
+            elif args.action == "get":
+                if not args.document or args.revision is None:
+                    print("Для get потрібні ID документа і дата редакції")
+                    return 1
+                law_data = store.get(args.document, args.revision, args.parser)
+                if args.out:
+                    write_law(law_data, args.out)
+                else:
+                    print(json.dumps(law_data, ensure_ascii=False, indent=2))
+            elif args.action == "stats":
+                for key, value in store.stats().items():
+                    print(f"{key}\t{value}")
+            else:
+                print(f"Вилучено блоків без посилань: {store.collect_garbage()}")
+        except KeyError as e:
+            print(e.args[0])
+            return 1
+        finally:
+            store.close()
+        return 0
+
+    if args.command == "chunk":
+        count_tokens = token_counter(args.tokenizer)
+        paths = [args.path] if args.path.endswith(".ndjson") else find_html_files(args.path)
+        started = time.perf_counter()
+        failed = 0
+        for path in paths:
+            output_path = chunks_path_for(output_path_for(path, args.path, args.out))
+            try:
+                count = chunk_file(path, output_path, args.parser, args.budget, count_tokens)
+            except Exception as e:
+                failed += 1
+                print(f"❌ {path}: {e}")
+                continue
+            print(f"✅ {path} → {output_path} ({count} фрагментів)")
+        print(f"\nОброблено файлів: {len(paths) - failed}, помилок: {failed}, "
+              f"загальний час: {time.perf_counter() - started:.2f} с")
+        return 1 if failed else 0
+
+    if args.command == "index":
+        index_dir = args.path if os.path.isdir(args.path) else os.path.dirname(args.path)
+        search_index = SearchIndex(args.db or os.path.join(index_dir or ".", SEARCH_FILENAME))
+        try:
+            results = index_directory(args.path, search_index, force=args.force)
+            stats = search_index.stats()
+        finally:
+            search_index.close()
+        failed = sum(isinstance(outcome, Exception) for outcome in results.values())
+        skipped = sum(outcome is None for outcome in results.values())
+        print(f"\nПроіндексовано законів: {len(results) - failed - skipped}, без змін: {skipped}, "
+              f"помилок: {failed}; в індексі: {stats['documents']} законів, {stats['blocks']} блоків")
+        return 1 if failed else 0
+
+    if args.command == "search":
+        if not os.path.exists(args.db):
+            print(f"Індекс '{args.db}' не знайдено")
+            return 1
+        search_index = SearchIndex(args.db)
+        try:
+            hits = search_index.search(args.query, limit=args.limit, document=args.document,
+                                       by_article=args.by_article)
+        finally:
+            search_index.close()
+        for hit in hits:
+            where = f"ст. {hit['article']}" if hit["article"] else (hit["path"] or "преамбула")
+            text = " ".join(hit["text"].split())
+            count = f" [{hit['hits']}]" if args.by_article else ""
+            print(f"{hit['document']}\t{where}{count}\t{text[:120]}")
+        return 0
+
+    if args.command == "read":
+        with LawReader(args.path) as reader:
+            try:
+                if args.article is not None:
+                    result = reader.article(args.article)
+                elif args.section is not None:
+                    result = reader.section(args.section)
+                elif args.blocks is not None:
+                    start, _, stop = args.blocks.partition(":")
+                    result = reader.blocks(int(start or 0), int(stop) if stop else None)
+                else:
+                    result = dict(reader.metadata, blocks=len(reader))
+            except KeyError as e:
+                print(e.args[0])
+                return 1
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    if args.command == "compare":
+        totals = {"dom": 0.0}
+        failed = 0
+        for path in find_html_files(args.path):
+            results, timings = run_shared(path, args.parsers, args.builder)
+            for name, seconds in timings.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+            try:
+                law_data, stats = consensus(results, args.quorum)
+            except ValueError as e:
+                failed += 1
+                print(f"❌ {path}: {e}")
+                continue
+            print(f"{path}: консенсус {len(law_data['content'])} блоків, розбір {timings['dom']:.2f} с")
+            for name in args.parsers:
+                if isinstance(results[name], Exception) or results[name] is None:
+                    print(f"  {name:<12} помилка: {results[name]}")
+                    continue
+                units, agreed = stats[name]["units"], stats[name]["agreed"]
+                print(f"  {name:<12} блоків {len(results[name]['content']):>5}, одиниць {units:>5}, "
+                      f"збіг з консенсусом {agreed / units if units else 0:>6.1%}, обхід {timings[name]:.3f} с")
+            if args.out:
+                output_path = output_path_for(path, args.path, args.out)
+                os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                write_law(law_data, output_path)
+        passes = sum(seconds for name, seconds in totals.items() if name != "dom")
+        print(f"\nРозбір дерева: {totals['dom']:.2f} с один раз, обходи {len(args.parsers)} парсерів: {passes:.2f} с")
+        return 1 if failed else 0
+
+    if args.command == "diff":
+        changes = diff_documents(load_document(args.old, args.parser), load_document(args.new, args.parser))
+        if args.json:
+            print(json.dumps(changes, ensure_ascii=False, indent=2))
+        else:
+            print("\n".join(format_changes(changes)))
+        return 0
+
+    if args.command == "fetch":
+        laws = list(args.laws)
+        if args.list:
+            with open(args.list, "r", encoding="utf-8") as f:
+                laws.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        if not laws:
+            print("Не вказано жодного закону")
+            return 1
+        started = time.perf_counter()
+        statuses = asyncio.run(fetch_laws(laws, args.out, base_url=args.base_url,
+                                          concurrency=args.concurrency, retries=args.retries))
+        failed = sum(status == "failed" for status in statuses.values())
+        skipped = sum(status == "not-modified" for status in statuses.values())
+        print(f"\nЗавантажено: {len(statuses) - failed - skipped}, без змін: {skipped}, "
+              f"помилок: {failed}, загальний час: {time.perf_counter() - started:.2f} с")
+        return 1 if failed else 0
+
+    if args.command == "serve-standin":
+        from .standin import make_server
+        server = make_server(args.path, port=args.port, fail_first=args.fail_first)
+        host, port = server.server_address[:2]
+        print(f"Роздаю {args.path} на http://{host}:{port}/laws/show/<номер>")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    if args.command == "serve":
+        from .service import ConversionService, make_server
+        parsers = args.preload or sorted(PARSERS)
+        if args.parser not in parsers:
+            parsers.append(args.parser)
+        service = ConversionService(jobs=args.jobs, queue=args.queue, parsers=parsers,
+                                    timeout=args.timeout, root=args.root)
+        server = make_server(service, host=args.host, port=args.port, unix_socket=args.unix,
+                             default_parser=args.parser, max_body=args.max_body)
+        address = args.unix if args.unix else "http://{}:{}".format(*server.server_address[:2])
+        print(f"Сервіс перетворення на {address}: {service.jobs} воркерів, черга {args.queue}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import os
+import time
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .blockstore import RevisionEncoder
+from .fetch import load_source_urls
+from .graph import EdgeCollector
+from .manifest import document_key, file_hash, revision_key
+from .output import EXTENSIONS, write_law, write_law_stream
+from .parsers import get_parser, get_parser_version, get_stream_parser, iter_parse, parse
+from .profiling import profile_call, stages
+from .serializers import json_dumps
+from .structure import StructureIndexer, build_index, index_path_for, write_index
+from .tables import TableExporter, columnar
+
+HTML_EXTENSIONS = (".htm", ".html")
+
+
+def find_html_files(root):
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(HTML_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return found
+
+
+def output_path_for(input_path, root, output_dir=None, fmt="json"):
+    # Без output_dir JSON пишеться поруч із .htm, інакше — у дзеркальне дерево
+    stem = os.path.splitext(input_path)[0] + EXTENSIONS[fmt]
+    if output_dir is None:
+        return stem
+    base = root if os.path.isdir(root) else os.path.dirname(root)
+    return os.path.join(output_dir, os.path.relpath(stem, base))
+
+
+def _collecting(blocks, collector):
+    for block in blocks:
+        collector.add(block)
+        yield block
+
+
+def _tables(blocks, mode, exporter):
+    for block in blocks:
+        if exporter is not None:
+            exporter.add(block)
+        yield columnar(block) if mode == "columnar" else block
+
+
+def convert_file(input_path, output_path, parser_name, fmt="json", index=False, graph=False,
+                 source_url=None, tables="rows", export_tables=None, store=None, profile=None,
+                 serializer="json"):
+    """Convert one file; returns (seconds, source_hash, graph_update, store_update, metrics).
+
+    graph_update is (metadata, edges) for LawGraph.replace_document; it is
+    sent back to the parent so only one process writes the graph database.
+    Likewise store_update (with store = path of a BlockStore) carries the
+    block digests and only the blocks the store does not have yet.
+    source_url (the canonical address a fetched file came from) fills the
+    "source" field when the parser found none. tables="columnar" stores
+    table blocks column-wise; export_tables ("csv"/"parquet") also writes
+    each table to <output>.tables/.
+
+    profile = {"allocations": bool, "dump": path prefix or None} times the
+    parsing stages (see parsing.profiling) and returns them as metrics;
+    otherwise metrics is None. serializer picks the JSON backend
+    (see parsing.serializers); it does not change the output.
+    """
+    args = (input_path, output_path, parser_name, fmt, index, graph, source_url, tables, export_tables, store,
+            serializer)
+    if profile is None:
+        return _convert_file(*args) + (None,)
+    outcome, metrics = profile_call(_convert_file, *args, allocations=profile.get("allocations", False),
+                                    dump_prefix=profile.get("dump"))
+    return outcome + (metrics,)
+
+
+def _convert_file(input_path, output_path, parser_name, fmt, index, graph, source_url, tables,
+                  export_tables, store, serializer):
+    started = time.perf_counter()
+    source_hash = file_hash(input_path)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    collector = EdgeCollector() if graph else None
+    encoder = RevisionEncoder() if store else None
+    exporter = TableExporter(output_path, export_tables) if export_tables else None
+    if fmt == "ndjson":
+        # Для NDJSON індекс містить і діапазони байтів кожної статті
+        indexer = StructureIndexer() if index else None
+        items = iter_parse(input_path, parser_name)
+        metadata = next(items)
+        if source_url and not metadata.get("source"):
+            metadata["source"] = source_url
+        # Потоковий парсер розбирає файл під час запису — етапи не розділити
+        timer = stages()
+        blocks = items if collector is None else _collecting(items, collector)
+        if tables != "rows" or exporter is not None:
+            blocks = _tables(blocks, tables, exporter)
+        if encoder is not None:
+            blocks = _collecting(blocks, encoder)
+        write_law_stream(chain([metadata], blocks), output_path, indexer, serializer)
+        if indexer is not None:
+            write_index(indexer.finish(), output_path)
+        timer.mark("serialize" if get_stream_parser(parser_name) is None else "parse+serialize")
+    else:
+        document = parse(input_path, parser_name)
+        timer = stages()
+        law_data = document.to_dict()
+        if source_url and not law_data.get("source"):
+            law_data["source"] = source_url
+        if tables != "rows" or exporter is not None:
+            law_data["content"] = list(_tables(law_data["content"], tables, exporter))
+        write_law(law_data, output_path, fmt, serializer)
+        if index:
+            write_index(build_index(law_data["content"]), output_path)
+        timer.mark("serialize")
+        metadata = law_data
+        for block in law_data["content"]:
+            if collector is not None:
+                collector.add(block)
+            if encoder is not None:
+                encoder.add(block)
+    metadata = {key: value for key, value in metadata.items() if key != "content"}
+    graph_update = (metadata, collector.edges) if collector is not None else None
+    store_update = encoder.update(metadata, store) if encoder is not None else None
+    if collector is not None or encoder is not None:
+        timer.mark("collect")
+    return time.perf_counter() - started, source_hash, graph_update, store_update
+
+
+def output_options(fmt="json", tables="rows", export_tables=None):
+    """Manifest fingerprint of settings that change the output but not its path; "" for the defaults."""
+    options = []
+    if fmt == "compact":  # той самий .json, що й json
+        options.append("format=compact")
+    if tables != "rows" or export_tables is not None:
+        options.append(f"tables={tables};export={export_tables or ''}")
+    return ";".join(options)
+
+
+def convert_directory(root, parser_name, output_dir=None, jobs=None, report=print,
+                      manifest=None, force=False, fmt="json", index=False, graph=None,
+                      tables="rows", export_tables=None, store=None, profile=None, metrics=None,
+                      serializer="json"):
+    """Convert every .htm under root; returns {input_path: seconds, None or exception}.
+
+    With a manifest, files whose document ID, revision, parser, output path
+    and settings are already recorded are skipped (None in the result) unless force is set.
+    With a LawGraph, the amendment/citation edges of each converted law
+    replace that law's previous edges; a law the graph does not have yet is
+    converted again even when the manifest says it is unchanged. With a
+    BlockStore, each revision is archived as block digests (likewise
+    reconverted if the store lacks it). Files downloaded by parsing.fetch
+    get their canonical rada URL as "source". With profile ({"allocations",
+    "dump": directory}) each file's stage metrics are appended to the
+    metrics list as {"file", "parser", "seconds", "stages"}.
+    """
+    get_parser(parser_name)  # невідомий парсер — помилка до запуску пулу
+    json_dumps(serializer)  # і серіалізатор, якого немає
+    parser_version = get_parser_version(parser_name)
+    options = output_options(fmt, tables, export_tables)
+    store_path = store.path if store is not None else None
+    source_urls = load_source_urls(root if os.path.isdir(root) else os.path.dirname(root) or ".")
+    tasks = []
+    results = {}
+    for path in find_html_files(root):
+        output_path = output_path_for(path, root, output_dir, fmt)
+        if (manifest is not None and not force
+                and manifest.is_fresh(path, parser_name, parser_version, output_path, options)
+                and (not index or os.path.exists(index_path_for(output_path)))
+                # Новий чи перебудований граф і сховище заповнюються і з уже перетворених законів
+                and (graph is None or graph.has_document(document_key(path)))
+                and (store is None or store.has_revision(*revision_key(path), parser_name))):
+            results[path] = None
+            report(f"⏭  {path}: без змін")
+            continue
+        tasks.append((path, output_path))
+
+    def file_profile(path):
+        if profile is None:
+            return None
+        dump = profile.get("dump")
+        if dump:
+            base = root if os.path.isdir(root) else os.path.dirname(root)
+            dump = os.path.join(dump, os.path.splitext(os.path.relpath(path, base))[0])
+        return {"allocations": profile.get("allocations", False), "dump": dump}
+
+    def done(path, output_path, outcome):
+        if isinstance(outcome, Exception):
+            results[path] = outcome
+            report(f"❌ {path}: {outcome}")
+            return
+        seconds, source_hash, graph_update, store_update, file_metrics = outcome
+        results[path] = seconds
+        if file_metrics is not None and metrics is not None:
+            metrics.append({"file": path, "parser": parser_name, **file_metrics})
+        if graph_update is not None:
+            graph.replace_document(document_key(path), *graph_update)
+        if store_update is not None:
+            store.put(*revision_key(path), parser_name, *store_update)
+        if manifest is not None:
+            manifest.record(path, parser_name, parser_version, source_hash, output_path, options)
+        report(f"✅ {path} → {output_path} ({seconds:.2f} с)")
+
+    if jobs == 1:
+        for path, output_path in tasks:
+            try:
+                outcome = convert_file(path, output_path, parser_name, fmt, index, graph is not None,
+                                       source_urls.get(os.path.abspath(path)), tables, export_tables,
+                                       store_path, file_profile(path), serializer)
+            except Exception as e:
+                outcome = e
+            done(path, output_path, outcome)
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(convert_file, path, output_path, parser_name, fmt, index,
+                               graph is not None, source_urls.get(os.path.abspath(path)),
+                               tables, export_tables, store_path, file_profile(path), serializer): (path, output_path)
+                   for path, output_path in tasks}
+        for future in as_completed(futures):
+            path, output_path = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = e
+            done(path, output_path, outcome)
+    return results
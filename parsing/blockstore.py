@@ -0,0 +1,180 @@
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+
+from .output import dumps_compact
+
+# Адресне за вмістом сховище блоків для архіву редакцій. Кожен блок content
+# серіалізується компактним JSON і зберігається один раз під своїм хешем;
+# редакція — це метадані та послідовність хешів (16 байт на блок). Сусідні
+# редакції закону й типові примітки "{Із змінами, внесеними ...}" ділять
+# блоки, тож місце на диску і запис ростуть зі зміненим текстом, а не з
+# кількістю редакцій.
+#
+# Як і граф, базу пише лише батьківський процес: воркер рахує хеші й
+# відкидає блоки, які вже є в сховищі (читання), і повертає лише нові.
+
+STORE_FILENAME = "blocks.sqlite"
+DIGEST_SIZE = 16
+# Обмеження SQLite на кількість параметрів у запиті
+QUERY_BATCH = 500
+
+
+def block_digest(data):
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+class RevisionEncoder:
+    """Hash blocks as they are produced; keeps each distinct block once."""
+
+    def __init__(self):
+        self.digests = []
+        self.blocks = {}
+
+    def add(self, block):
+        if not isinstance(block, dict):
+            block = block.to_dict()
+        data = dumps_compact(block).encode("utf-8")
+        digest = block_digest(data)
+        self.digests.append(digest)
+        self.blocks.setdefault(digest, data)
+
+    def update(self, metadata, store_path=None):
+        """(metadata, digests, {digest: data} of blocks missing from the store)."""
+        blocks = self.blocks
+        if store_path is not None:
+            blocks = dict(blocks)
+            for digest in existing_digests(store_path, list(blocks)):
+                del blocks[digest]
+        return metadata, b"".join(self.digests), blocks
+
+
+def existing_digests(store_path, digests):
+    """Digests already stored; opens the database read-only (safe from workers)."""
+    try:
+        # "?", "#" і "%" у шляху мають бути екрановані в URI
+        connection = sqlite3.connect(pathlib.Path(store_path).resolve().as_uri() + "?mode=ro", uri=True)
+    except sqlite3.OperationalError:  # сховища ще немає
+        return set()
+    found = set()
+    try:
+        for start in range(0, len(digests), QUERY_BATCH):
+            batch = digests[start:start + QUERY_BATCH]
+            rows = connection.execute(
+                f"SELECT digest FROM blocks WHERE digest IN ({','.join('?' * len(batch))})", batch)
+            found.update(row[0] for row in rows)
+    except sqlite3.OperationalError:  # база є, але таблиці ще не створено
+        pass
+    finally:
+        connection.close()
+    return found
+
+
+class BlockStore:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS blocks (
+                digest BLOB PRIMARY KEY,
+                data BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS revisions (
+                document TEXT NOT NULL,
+                revision TEXT NOT NULL,
+                parser TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                digests BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (document, revision, parser)
+            );
+        """)
+
+    def put(self, document, revision, parser, metadata, digests, new_blocks):
+        """Store one revision; returns the number of blocks actually written."""
+        before = self.connection.total_changes
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO blocks VALUES (?, ?)", new_blocks.items())
+            written = self.connection.total_changes - before
+            self.connection.execute(
+                "INSERT OR REPLACE INTO revisions VALUES (?, ?, ?, ?, ?, ?)",
+                (document, revision, parser, dumps_compact(metadata), digests, time.time()),
+            )
+        return written
+
+    def put_document(self, document, revision, parser, law_data):
+        encoder = RevisionEncoder()
+        for block in law_data["content"]:
+            encoder.add(block)
+        metadata = {key: value for key, value in law_data.items() if key != "content"}
+        return self.put(document, revision, parser, *encoder.update(metadata, self.path))
+
+    def has_revision(self, document, revision, parser):
+        return self.connection.execute(
+            "SELECT 1 FROM revisions WHERE document = ? AND revision = ? AND parser = ?",
+            (document, revision, parser),
+        ).fetchone() is not None
+
+    def _digests(self, document, revision, parser):
+        row = self.connection.execute(
+            "SELECT metadata, digests FROM revisions WHERE document = ? AND revision = ? AND parser = ?",
+            (document, revision, parser),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Редакцію {document} {revision} ({parser}) не знайдено")
+        digests = [row[1][i:i + DIGEST_SIZE] for i in range(0, len(row[1]), DIGEST_SIZE)]
+        return json.loads(row[0]), digests
+
+    def get(self, document, revision, parser):
+        """Rebuild a revision's {..., "content": [...]} dict."""
+        metadata, digests = self._digests(document, revision, parser)
+        unique = list(dict.fromkeys(digests))
+        data = {}
+        for start in range(0, len(unique), QUERY_BATCH):
+            batch = unique[start:start + QUERY_BATCH]
+            data.update(self.connection.execute(
+                f"SELECT digest, data FROM blocks WHERE digest IN ({','.join('?' * len(batch))})", batch))
+        # Однакові блоки декодуються один раз, але в документі — окремі об'єкти
+        decoded = {digest: json.loads(value) for digest, value in data.items()}
+        metadata["content"] = [dict(decoded[digest]) for digest in digests]
+        return metadata
+
+    def revisions(self, document=None):
+        sql = "SELECT document, revision, parser, length(digests) / ? FROM revisions"
+        params = [DIGEST_SIZE]
+        if document is not None:
+            sql += " WHERE document = ?"
+            params.append(document)
+        return [{"document": row[0], "revision": row[1], "parser": row[2], "blocks": row[3]}
+                for row in self.connection.execute(sql + " ORDER BY document, revision, parser", params)]
+
+    def delete(self, document, revision, parser):
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM revisions WHERE document = ? AND revision = ? AND parser = ?",
+                (document, revision, parser))
+
+    def collect_garbage(self):
+        """Drop blocks no revision refers to; returns how many were removed."""
+        referenced = set()
+        for (digests,) in self.connection.execute("SELECT digests FROM revisions"):
+            referenced.update(digests[i:i + DIGEST_SIZE] for i in range(0, len(digests), DIGEST_SIZE))
+        orphans = [(digest,) for (digest,) in self.connection.execute("SELECT digest FROM blocks")
+                   if digest not in referenced]
+        with self.connection:
+            self.connection.executemany("DELETE FROM blocks WHERE digest = ?", orphans)
+        return len(orphans)
+
+    def stats(self):
+        revisions, references = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(digests)), 0) / ? FROM revisions", (DIGEST_SIZE,)).fetchone()
+        blocks, block_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM blocks").fetchone()
+        return {"revisions": revisions, "block_references": references,
+                "unique_blocks": blocks, "block_bytes": block_bytes}
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,168 @@
+import json
+import math
+import os
+
+from .manifest import document_key
+from .output import dumps_compact, iter_ndjson
+from .parsers import iter_parse
+from .structure import enter_section, path_label, structural_key, text_units
+
+# Нарізка закону на фрагменти для пошуку/ембедингів (RAG).
+# Один прохід по потоку блоків: частини статті накопичуються, доки
+# вміщаються в бюджет токенів; фрагмент ніколи не перетинає межу розділу
+# чи глави і не розриває одиницю тексту — абзац, пункт списку, рядок
+# таблиці. Кілька коротких статей поспіль можуть потрапити в один фрагмент.
+# Одиниця, що сама більша за бюджет, іде окремим фрагментом ("oversized").
+# Кожен фрагмент несе "хлібні крихти" Розділ / Глава / Стаття.
+
+DEFAULT_BUDGET = 512
+CHUNKS_SUFFIX = ".chunks.ndjson"
+# Оцінка без токенізатора: для українського тексту BPE-токенізатори дають
+# приблизно токен на 3 символи
+CHARS_PER_TOKEN = 3
+
+
+def approx_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def token_counter(name="approx"):
+    """Token counting function: "approx" or "tiktoken:<encoding>" (needs tiktoken)."""
+    if name == "approx":
+        return approx_tokens
+    if name.startswith("tiktoken:"):
+        try:
+            import tiktoken
+        except ImportError:
+            raise RuntimeError("Для точного підрахунку токенів потрібен tiktoken: pip install tiktoken") from None
+        encoding = tiktoken.get_encoding(name.split(":", 1)[1])
+        return lambda text: len(encoding.encode_ordinary(text))
+    raise ValueError(f"Невідомий токенізатор '{name}', доступні: approx, tiktoken:<кодування>")
+
+
+class Chunker:
+    """Pack blocks into token-budgeted chunks; add() returns finished chunks."""
+
+    def __init__(self, budget=DEFAULT_BUDGET, count_tokens=approx_tokens, document=None, title=None):
+        self.budget = budget
+        self.count_tokens = count_tokens
+        self.document = document
+        self.title = title
+        self.position = 0
+        self.path = []
+        self.article = None  # (номер, заголовок) поточної статті
+        self.count = 0
+        self._reset()
+
+    def _reset(self):
+        self.lines = []
+        self.tokens = 0
+        self.articles = []
+        self.first_block = None
+        self.last_block = None
+        self.continued = None  # (номер, заголовок) статті, яку продовжує фрагмент
+
+    def add(self, block):
+        if not isinstance(block, dict):
+            block = block.to_dict()
+        ready = []
+        key = structural_key(block)
+        if key is not None:
+            kind, number = key
+            if kind == "article":
+                self.article = (number, block.get("text") or "")
+            else:
+                # Межа розділу/глави завжди закриває фрагмент
+                ready.extend(self._flush())
+                self.path = enter_section(self.path, kind, number)
+                self.article = None
+        # Неподільні одиниці: абзац, пункт списку, рядок таблиці
+        for unit in filter(str.strip, text_units(block)):
+            tokens = self.count_tokens(unit)
+            if self.lines and self.tokens + tokens > self.budget:
+                ready.extend(self._flush())
+                if key is None and self.article is not None:
+                    # Продовження статті в новому фрагменті; заголовок запам'ятовується
+                    # зараз — до скидання фрагмента може початися наступна стаття
+                    self.continued = self.article
+            if self.first_block is None:
+                self.first_block = self.position
+            if self.article is not None and self.article[0] not in self.articles:
+                self.articles.append(self.article[0])
+            self.lines.append(unit)
+            self.tokens += tokens
+            self.last_block = self.position
+        self.position += 1
+        return ready
+
+    def finish(self):
+        return self._flush()
+
+    def _flush(self):
+        if not self.lines:
+            return []
+        breadcrumb = [label for _, label in self.path]
+        if self.articles:
+            breadcrumb.append("Стаття " + self.articles[0] if len(self.articles) == 1
+                              else f"Статті {self.articles[0]}–{self.articles[-1]}")
+        text = "\n".join(self.lines)
+        if self.continued is not None:
+            # Заголовок статті як контекст для продовження (в бюджет не входить)
+            text = self.continued[1] + "\n" + text
+        chunk = {
+            "id": f"{self.document}:{self.count}" if self.document else str(self.count),
+            "document": self.document,
+            "title": self.title,
+            "breadcrumb": breadcrumb,
+            "section_path": path_label(self.path),
+            "articles": self.articles,
+            "blocks": [self.first_block, self.last_block + 1],
+            "tokens": self.tokens,
+            "text": text,
+        }
+        if self.tokens > self.budget:
+            chunk["oversized"] = True
+        self.count += 1
+        self._reset()
+        return [chunk]
+
+
+def iter_chunks(records, budget=DEFAULT_BUDGET, count_tokens=approx_tokens, document=None):
+    """Chunks from an iterator whose first item is the metadata dict, then blocks."""
+    records = iter(records)
+    metadata = next(records)
+    chunker = Chunker(budget, count_tokens, document, metadata.get("title"))
+    for block in records:
+        yield from chunker.add(block)
+    yield from chunker.finish()
+
+
+def write_chunks(chunks, output_path):
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(dumps_compact(chunk) + "\n")
+            count += 1
+    return count
+
+
+def chunk_file(input_path, output_path, parser_name="claude", budget=DEFAULT_BUDGET,
+               count_tokens=approx_tokens):
+    """Chunk one .htm (parsed as a stream) or converted .ndjson file; returns the chunk count."""
+    if input_path.endswith(".ndjson"):
+        records = iter_ndjson(input_path)
+        document = document_key(input_path[:-len(".ndjson")] + ".htm")
+    else:
+        records = iter_parse(input_path, parser_name)
+        document = document_key(input_path)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    return write_chunks(iter_chunks(records, budget, count_tokens, document), output_path)
+
+
+def chunks_path_for(output_path):
+    return os.path.splitext(output_path)[0] + CHUNKS_SUFFIX
+
+
+def read_chunks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,96 @@
+import re
+
+# Класифікатор блоків тексту закону. Шаблони скомпільовані один раз у дві
+# альтернації з іменованими групами: HEAD_RE перевіряє лише початок рядка
+# (заголовок/стаття), INLINE_RE шукає поправку або посилання по всьому рядку.
+# Тип блоку, рівень заголовка і номер/дата закону визначаються за один прохід.
+#
+# Пріоритет такий самий, як у послідовних перевірках Claude-парсера:
+# заголовок > стаття (лише на початку рядка) > поправка > посилання.
+
+AMENDMENT_PHRASES = [
+    "згідно із Законом",
+    "змінено Законом",
+    "доповнено Законом",
+    "виключено Законом",
+    "у редакції Закону",
+]
+
+AMENDMENT_PATTERN = r"(?i:" + "|".join(AMENDMENT_PHRASES) + r")"
+REFERENCE_PATTERN = r"№\s*(?P<law_number>\d+-[A-ZІХ]+)\s+від\s+(?P<law_date>\d{2}\.\d{2}\.\d{4})"
+
+AMENDMENT_RE = re.compile(AMENDMENT_PATTERN)
+REFERENCE_RE = re.compile(REFERENCE_PATTERN)
+
+HEAD_RE = re.compile(
+    r"(?P<section>Розділ\s+[IVX]+[\.\s])"
+    r"|(?P<chapter>Глава\s+\d+[\.\s])"
+    r"|(?P<roman>I{1,3}V?X?\.\s+)"
+    r"|(?P<article>Стаття\s+\d+[\.\s])"
+)
+INLINE_RE = re.compile(
+    r"(?P<amendment>" + AMENDMENT_PATTERN + r")"
+    r"|(?P<reference>" + REFERENCE_PATTERN + r")"
+)
+
+HEADING_LEVELS = {"section": 1, "chapter": 2, "roman": 2}
+
+# Маркери списків ChatGPT-парсера: 1), 1.1, а) та "- ", "• ", "● "
+LIST_MARKER_RE = re.compile(
+    r"(?P<ordered>\d+\)|\d+\.\d+|[а-я]\))"
+    r"|(?P<unordered>- |• |● )"
+)
+
+
+def classify_block(text):
+    """Classify a stripped block text in one scan.
+
+    Returns (type, level, law_number, law_date); type is "heading", "article",
+    "amendment", "reference" or None, level is set only for headings and the
+    law number/date only for references.
+    """
+    match = HEAD_RE.match(text)
+    if match:
+        kind = match.lastgroup
+        if kind == "article":
+            return "article", None, None, None
+        return "heading", HEADING_LEVELS[kind], None, None
+
+    # Кожна поправка містить "закон", кожне посилання — "№": без них
+    # регулярний вираз по довгому абзацу можна не запускати
+    if "№" not in text and "закон" not in text.lower():
+        return None, None, None, None
+
+    reference = None
+    for match in INLINE_RE.finditer(text):
+        if match.lastgroup == "amendment":
+            return "amendment", None, None, None
+        # Посилання поступається поправці, яка може стояти далі в рядку
+        if reference is None:
+            reference = match
+    if reference is not None:
+        return "reference", None, reference.group("law_number"), reference.group("law_date")
+    return None, None, None, None
+
+
+def list_marker(text):
+    """Return "ordered", "unordered" or None for a list item's leading marker."""
+    match = LIST_MARKER_RE.match(text)
+    return match.lastgroup if match else None
+
+
+# Будь-яке посилання на акт "№ 586-VI від 24.09.2008" (закони, накази, постанови)
+LAW_REFERENCE_RE = re.compile(
+    r"№\s*(?P<law_number>[0-9][0-9A-Za-zА-ЯІЇЄҐа-яіїєґ/-]*)\s+від\s+(?P<law_date>\d{2}\.\d{2}\.\d{4})"
+)
+# Примітки про зміни: "{Із змінами, внесеними згідно із Законами ...}", "{... виключено ...}"
+AMENDING_NOTE_RE = re.compile(
+    r"згідно\s+із\s+Закон|із\s+змінами|змінено|доповнено|виключено|в\s+редакції|у\s+редакції",
+    re.IGNORECASE,
+)
+
+
+def iter_law_references(text):
+    """Yield (law_number, law_date) for every act number/date pair in text."""
+    for match in LAW_REFERENCE_RE.finditer(text):
+        yield match.group("law_number"), match.group("law_date")
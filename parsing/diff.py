@@ -0,0 +1,145 @@
+import difflib
+import hashlib
+import json
+import os
+
+from .batch import HTML_EXTENSIONS
+from .output import read_law
+from .parsers import parse
+from .structure import enter_section, path_label, structural_key, text_units
+
+# Порівняння двох редакцій одного закону. Документ ділиться на одиниці:
+# преамбула, статті (за номером) і текст розділів/глав поза статтями (за
+# шляхом "Розділ I/Глава 2"). Одиниці зіставляються за ключем, незмінні
+# відсіюються порівнянням хешів, і лише для змінених рахується построкова
+# різниця тексту — тож час майже лінійний від розміру закону.
+
+PREAMBLE = "преамбула"
+
+
+def _unit_hash(blocks):
+    digest = hashlib.sha1()
+    for block in blocks:
+        digest.update(json.dumps(block, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def split_units(content):
+    """Ordered {key: {"kind", "path", "blocks", "hash"}} for one document.
+
+    Keys: ("article", "12"), ("section", "Розділ I/Глава 2"), ("preamble", "").
+    A repeated article number (e.g. quoted inside amendment text) gets a
+    "#2", "#3", ... suffix so both occurrences survive.
+    """
+    units = {}
+    path = []
+    current = units[("preamble", "")] = {"kind": "preamble", "path": "", "blocks": []}
+    for block in content:
+        if not isinstance(block, dict):
+            block = block.to_dict()
+        key = structural_key(block)
+        if key is not None:
+            kind, number = key
+            if kind != "article":
+                path = enter_section(path, kind, number)
+            path_text = path_label(path)
+            unit_key = ("article", number) if kind == "article" else ("section", path_text)
+            occurrence = 1
+            while unit_key in units:
+                occurrence += 1
+                unit_key = (unit_key[0], f"{number if kind == 'article' else path_text}#{occurrence}")
+            current = units[unit_key] = {"kind": unit_key[0], "path": path_text, "blocks": []}
+        current["blocks"].append(block)
+    for unit in units.values():
+        unit["hash"] = _unit_hash(unit["blocks"])
+    return units
+
+
+def text_delta(old_blocks, new_blocks):
+    """difflib opcodes over block lines: [{"op", "old", "new"}] without the equal runs."""
+    old_lines = [line for block in old_blocks for line in text_units(block)]
+    new_lines = [line for block in new_blocks for line in text_units(block)]
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [{"op": op, "old": old_lines[i1:i2], "new": new_lines[j1:j2]}
+            for op, i1, i2, j1, j2 in matcher.get_opcodes() if op != "equal"]
+
+
+def _label(key):
+    kind, name = key
+    if kind == "article":
+        return f"Стаття {name}"
+    return name or PREAMBLE
+
+
+def _as_dict(document):
+    return document if isinstance(document, dict) else document.to_dict()
+
+
+def load_document(path, parser="claude"):
+    """A law as a dict: .htm is parsed, convert output (.json, .ndjson, .msgpack, .cbor) is read back."""
+    if path.lower().endswith(HTML_EXTENSIONS):
+        return parse(path, parser).to_dict()
+    data = read_law(path)
+    if "content" not in data:
+        raise ValueError(f"'{os.path.basename(path)}' не містить \"content\" (формат tree не підтримується)")
+    return data
+
+
+def diff_documents(old, new):
+    """Structured changeset between two editions (LawDocument or dict).
+
+    Returns {"old", "new" (metadata), "added", "removed", "modified",
+    "moved", "unchanged" (count)}; "modified" entries carry a text delta.
+    """
+    old, new = _as_dict(old), _as_dict(new)
+    old_units, new_units = split_units(old["content"]), split_units(new["content"])
+    changes = {
+        "old": {key: value for key, value in old.items() if key != "content"},
+        "new": {key: value for key, value in new.items() if key != "content"},
+        "added": [],
+        "removed": [],
+        "modified": [],
+        "moved": [],
+        "unchanged": 0,
+    }
+    for key, unit in new_units.items():
+        entry = {"kind": key[0], "key": key[1], "label": _label(key), "path": unit["path"]}
+        previous = old_units.get(key)
+        if previous is None:
+            if unit["blocks"]:
+                entry["blocks"] = unit["blocks"]
+                changes["added"].append(entry)
+            continue
+        if previous["path"] != unit["path"]:
+            changes["moved"].append(dict(entry, old_path=previous["path"]))
+        if previous["hash"] == unit["hash"]:
+            changes["unchanged"] += 1
+            continue
+        entry["delta"] = text_delta(previous["blocks"], unit["blocks"])
+        changes["modified"].append(entry)
+    for key, unit in old_units.items():
+        if key not in new_units and unit["blocks"]:
+            changes["removed"].append({"kind": key[0], "key": key[1], "label": _label(key),
+                                       "path": unit["path"], "blocks": unit["blocks"]})
+    return changes
+
+
+def format_changes(changes):
+    """Human-readable summary lines of a changeset."""
+    lines = [f"{changes['old'].get('title')} → {changes['new'].get('title')}",
+             f"додано: {len(changes['added'])}, вилучено: {len(changes['removed'])}, "
+             f"змінено: {len(changes['modified'])}, переміщено: {len(changes['moved'])}, "
+             f"без змін: {changes['unchanged']}"]
+    for entry in changes["added"]:
+        lines.append(f"+ {entry['label']}")
+    for entry in changes["removed"]:
+        lines.append(f"- {entry['label']}")
+    for entry in changes["moved"]:
+        lines.append(f"→ {entry['label']}: {entry['old_path'] or PREAMBLE} → {entry['path'] or PREAMBLE}")
+    for entry in changes["modified"]:
+        lines.append(f"~ {entry['label']}")
+        for change in entry["delta"]:
+            lines.extend(f"    - {line}" for line in change["old"])
+            lines.extend(f"    + {line}" for line in change["new"])
+    return lines
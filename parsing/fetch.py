@@ -0,0 +1,181 @@
+import asyncio
+import os
+import random
+import re
+import sqlite3
+import time
+
+# Завантаження редакцій законів з zakon.rada.gov.ua у каталог корпусу.
+# Один пул з'єднань aiohttp на весь запуск, обмежена кількість одночасних
+# запитів, умовні запити (If-None-Match / If-Modified-Since) для вже
+# завантажених файлів і повтори з експоненційною затримкою.
+#
+# aiohttp — необов'язкова залежність, потрібна лише для цього модуля.
+
+BASE_URL = "https://zakon.rada.gov.ua"
+FETCH_STATE_FILENAME = "fetch.sqlite"
+
+# Ідентифікатор закону в адресі rada ("2344-14", "1166-2010-п"), після "@" —
+# дата редакції ("2344-14@20241115")
+LAW_ID_RE = re.compile(r"^(?P<law_id>\d[\w%/-]*?)(?:@(?P<revision>\d{8}))?$")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_law_spec(spec):
+    """"2344-14" or "2344-14@20241115" -> (law_id, revision or None)."""
+    match = LAW_ID_RE.match(spec.strip())
+    if not match:
+        raise ValueError(f"Невірний ідентифікатор закону '{spec}', очікується 2344-14 або 2344-14@20241115")
+    return match.group("law_id"), match.group("revision")
+
+
+def law_url(base_url, law_id, revision=None):
+    url = f"{base_url.rstrip('/')}/laws/show/{law_id}"
+    return f"{url}/ed{revision}" if revision else url
+
+
+def canonical_url(law_id, revision=None):
+    """Address on zakon.rada.gov.ua itself, whatever --base-url the file came from."""
+    return law_url(BASE_URL, law_id, revision)
+
+
+def corpus_filename(law_id, revision=None):
+    name = law_id.replace("/", "_")
+    return f"{name}_ed{revision}.htm" if revision else f"{name}.htm"
+
+
+class FetchState:
+    """ETag / Last-Modified and canonical source URL of every downloaded file."""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                law_id TEXT NOT NULL,
+                revision TEXT,
+                url TEXT NOT NULL,
+                source_url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def validators(self, path):
+        row = self.connection.execute(
+            "SELECT etag, last_modified FROM sources WHERE path = ?", (os.path.abspath(path),)
+        ).fetchone()
+        if row is None or not os.path.exists(path):
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def record(self, path, law_id, revision, url, etag, last_modified):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            # Для редакції — адреса саме цієї редакції, а не чинного тексту
+            (os.path.abspath(path), law_id, revision, url, canonical_url(law_id, revision),
+             etag, last_modified, time.time()),
+        )
+        self.connection.commit()
+
+    def source_urls(self):
+        return dict(self.connection.execute("SELECT path, source_url FROM sources"))
+
+    def close(self):
+        self.connection.close()
+
+
+def load_source_urls(corpus_dir):
+    """{absolute path: canonical URL} for files fetched into corpus_dir, if any."""
+    state_path = os.path.join(corpus_dir, FETCH_STATE_FILENAME)
+    if not os.path.exists(state_path):
+        return {}
+    state = FetchState(state_path)
+    try:
+        return state.source_urls()
+    finally:
+        state.close()
+
+
+async def _fetch_one(session, semaphore, state, base_url, corpus_dir, law_id, revision,
+                     retries, backoff, report):
+    url = law_url(base_url, law_id, revision)
+    path = os.path.join(corpus_dir, corpus_filename(law_id, revision))
+    headers = state.validators(path)
+    label = f"{law_id}@{revision}" if revision else law_id
+
+    for attempt in range(retries + 1):
+        try:
+            async with semaphore:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        report(f"⏭  {label}: без змін")
+                        return "not-modified"
+                    if response.status == 200:
+                        body = await response.read()
+                        tmp_path = path + ".part"
+                        with open(tmp_path, "wb") as f:
+                            f.write(body)
+                        os.replace(tmp_path, path)
+                        state.record(path, law_id, revision, url,
+                                     response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                        report(f"✅ {label} → {path} ({len(body):,} байт)")
+                        return "downloaded"
+                    if response.status not in RETRY_STATUSES:
+                        report(f"❌ {label}: HTTP {response.status}")
+                        return "failed"
+                    retry_after = response.headers.get("Retry-After")
+                    error = f"HTTP {response.status}"
+        except Exception as e:  # мережеві помилки aiohttp і тайм-аути
+            if not _is_network_error(e):
+                raise
+            retry_after = None
+            error = repr(e)
+
+        if attempt < retries:
+            delay = backoff * 2 ** attempt * (1 + random.random() / 2)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+
+    report(f"❌ {label}: {error} після {retries + 1} спроб")
+    return "failed"
+
+
+def _is_network_error(error):
+    import aiohttp
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+
+
+async def fetch_laws(specs, corpus_dir, base_url=BASE_URL, concurrency=8, retries=3,
+                     backoff=0.5, timeout=60, report=print):
+    """Download law revisions into corpus_dir; returns {spec: status}."""
+    try:
+        import aiohttp
+    except ImportError:
+        raise RuntimeError("Для завантаження потрібен aiohttp: pip install aiohttp") from None
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    laws = [parse_law_spec(spec) for spec in specs]
+    state = FetchState(os.path.join(corpus_dir, FETCH_STATE_FILENAME))
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    try:
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            statuses = await asyncio.gather(*(
+                _fetch_one(session, semaphore, state, base_url, corpus_dir, law_id, revision,
+                           retries, backoff, report)
+                for law_id, revision in laws
+            ))
+    finally:
+        state.close()
+    return dict(zip(specs, statuses))
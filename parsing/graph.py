@@ -0,0 +1,142 @@
+import re
+import sqlite3
+
+from .classifier import AMENDING_NOTE_RE, iter_law_references
+
+# Граф зв'язків між законами корпусу:
+#   amends — акт-джерело змін (source) змінив закон (target);
+#   cites  — закон (source) посилається на акт (target).
+# Ребра збираються під час конвертації з блоків amendment/reference/list.
+# Кожне ребро пам'ятає документ, з якого його витягнуто, тож повторний
+# розбір одного закону замінює лише його ребра, без перебудови всього графа.
+
+GRAPH_FILENAME = "graph.sqlite"
+RELATIONS = ("amends", "cites")
+
+LAW_NUMBER_RE = re.compile(r"^[0-9][0-9A-Za-zА-ЯІЇЄҐа-яіїєґ/-]*$")
+TITLE_NUMBER_RE = re.compile(r"№\s*([0-9][0-9A-Za-zА-ЯІЇЄҐа-яіїєґ/-]*)")
+DATE_RE = re.compile(r"\d{2}\.\d{2}\.\d{4}")
+
+
+def law_key(metadata):
+    """(law_number, law_date) of a parsed law, falling back to its title."""
+    # Парсери пишуть заглушки на кшталт "Невідомий номер", тому номер із
+    # метаданих беремо лише коли він схожий на номер акта
+    number = (metadata.get("law_number") or "").lstrip("№ ").strip()
+    date = metadata.get("law_date")
+    if not LAW_NUMBER_RE.match(number) or not DATE_RE.fullmatch(date or ""):
+        # Заголовок rada: "Назва | від 05.04.2001 № 2344-III"
+        title = metadata.get("title") or ""
+        number_match = TITLE_NUMBER_RE.search(title)
+        date_match = DATE_RE.search(title)
+        number = number_match.group(1) if number_match else None
+        date = date_match.group(0) if date_match else None
+    return number, date
+
+
+class EdgeCollector:
+    """Collect graph edges from blocks as they are produced."""
+
+    def __init__(self):
+        self.position = 0
+        self.edges = []  # (relation, law_number, law_date, block_index)
+
+    def add(self, block):
+        if not isinstance(block, dict):
+            block = block.to_dict()
+        texts = block.get("items") if block.get("type") == "list" else [block.get("text") or ""]
+        for text in texts:
+            relation = "amends" if AMENDING_NOTE_RE.search(text) else "cites"
+            for number, date in iter_law_references(text):
+                self.edges.append((relation, number, date, self.position))
+        self.position += 1
+
+
+def collect_edges(blocks):
+    collector = EdgeCollector()
+    for block in blocks:
+        collector.add(block)
+    return collector.edges
+
+
+class LawGraph:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS laws (
+                document TEXT PRIMARY KEY,
+                law_number TEXT,
+                law_date TEXT,
+                title TEXT
+            );
+            CREATE TABLE IF NOT EXISTS edges (
+                document TEXT NOT NULL,
+                relation TEXT NOT NULL,
+                source_number TEXT NOT NULL,
+                source_date TEXT,
+                target_number TEXT NOT NULL,
+                target_date TEXT,
+                block_index INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS edges_by_source ON edges (source_number, relation);
+            CREATE INDEX IF NOT EXISTS edges_by_target ON edges (target_number, relation);
+            CREATE INDEX IF NOT EXISTS edges_by_document ON edges (document);
+            CREATE INDEX IF NOT EXISTS laws_by_number ON laws (law_number);
+        """)
+
+    def replace_document(self, document, metadata, edges):
+        """Store the edges extracted from one parsed law, replacing earlier ones."""
+        number, date = law_key(metadata)
+        rows = []
+        for relation, other_number, other_date, block_index in edges:
+            if other_number == number:
+                continue  # посилання закону на самого себе
+            if relation == "amends":
+                # Примітка в законі number: його змінив акт other_number
+                rows.append((document, relation, other_number, other_date, number, date, block_index))
+            else:
+                rows.append((document, relation, number, date, other_number, other_date, block_index))
+        with self.connection:
+            self.connection.execute("DELETE FROM edges WHERE document = ?", (document,))
+            self.connection.execute("INSERT OR REPLACE INTO laws VALUES (?, ?, ?, ?)",
+                                    (document, number, date, metadata.get("title")))
+            if number is not None:
+                self.connection.executemany("INSERT INTO edges VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def has_document(self, document):
+        return self.connection.execute("SELECT 1 FROM laws WHERE document = ?", (document,)).fetchone() is not None
+
+    def _query(self, sql, params):
+        return [
+            {"law_number": row[0], "law_date": row[1], "mentions": row[2]}
+            for row in self.connection.execute(sql, params)
+        ]
+
+    def amends(self, law_number):
+        """Laws changed by the given amending act."""
+        return self._query(
+            "SELECT target_number, target_date, COUNT(*) FROM edges"
+            " WHERE source_number = ? AND relation = 'amends'"
+            " GROUP BY target_number ORDER BY target_number", (law_number,))
+
+    def amended_by(self, law_number):
+        """Acts that changed the given law."""
+        return self._query(
+            "SELECT source_number, source_date, COUNT(*) FROM edges"
+            " WHERE target_number = ? AND relation = 'amends'"
+            " GROUP BY source_number ORDER BY source_number", (law_number,))
+
+    def cites(self, law_number):
+        return self._query(
+            "SELECT target_number, target_date, COUNT(*) FROM edges"
+            " WHERE source_number = ? AND relation = 'cites'"
+            " GROUP BY target_number ORDER BY target_number", (law_number,))
+
+    def cited_by(self, law_number):
+        return self._query(
+            "SELECT source_number, source_date, COUNT(*) FROM edges"
+            " WHERE target_number = ? AND relation = 'cites'"
+            " GROUP BY source_number ORDER BY source_number", (law_number,))
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+# Файли rada мають стабільний ID документа та дату редакції в кінці імені:
+# "... - d81073-20241115.htm" (іноді з суфіксом " (1)" після завантаження)
+DOCUMENT_ID_RE = re.compile(r"(?:^|[\s_-])(d\d+)-(\d{8})(?:\s*\(\d+\))?\.html?$", re.IGNORECASE)
+# Файли, завантажені parsing.fetch: "<номер закону>_ed<дата>.htm" ("2344-14_ed20241115.htm")
+FETCHED_ID_RE = re.compile(r"^(\d[\w%-]*?)_ed(\d{8})\.html?$", re.IGNORECASE)
+
+MANIFEST_FILENAME = "manifest.sqlite"
+# Один рядок на кожен вивід: той самий закон у json і ndjson — два записи
+CONVERSIONS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS conversions (
+        document_id TEXT NOT NULL,
+        revision TEXT NOT NULL,
+        parser TEXT NOT NULL,
+        parser_version TEXT NOT NULL,
+        source_hash TEXT NOT NULL,
+        source_path TEXT NOT NULL,
+        output_path TEXT NOT NULL,
+        converted_at REAL NOT NULL,
+        options TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (document_id, revision, parser, output_path)
+    )
+"""
+CONVERSIONS_COLUMNS = ("document_id, revision, parser, parser_version, source_hash, source_path, output_path,"
+                       " converted_at, options")
+
+
+def parse_document_id(path):
+    """Return (document_id, revision) from a rada file name, or (None, None)."""
+    filename = os.path.basename(path)
+    match = DOCUMENT_ID_RE.search(filename) or FETCHED_ID_RE.match(filename)
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def document_key(path):
+    """Stable identity of a law across revisions: rada ID or, failing that, the path."""
+    document_id, _ = parse_document_id(path)
+    return document_id or os.path.abspath(path)
+
+
+def revision_key(path):
+    """(document, revision) of a file: rada ID and date, or the path and ""."""
+    # Без ID в імені файла ключем слугує шлях, а редакцію замінює хеш вмісту
+    document_id, revision = parse_document_id(path)
+    if document_id is None:
+        return os.path.abspath(path), ""
+    return document_id, revision
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Persistent record of converted laws, used to skip unchanged files."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        columns = {row[1]: row[5] for row in self.connection.execute("PRAGMA table_info(conversions)")}
+        if columns and not columns.get("output_path"):
+            self._migrate(columns)
+        self.connection.execute(CONVERSIONS_SCHEMA)
+        self.connection.commit()
+
+    def _migrate(self, columns):
+        # Маніфести старших версій: ключ без шляху виводу (перетворення в json
+        # і ndjson затирали один одного), а найстаріші — ще й без options
+        options = "options" if "options" in columns else "''"
+        with self.connection:
+            self.connection.execute("ALTER TABLE conversions RENAME TO conversions_old")
+            self.connection.execute(CONVERSIONS_SCHEMA)
+            self.connection.execute(
+                f"INSERT INTO conversions ({CONVERSIONS_COLUMNS}) SELECT document_id, revision, parser,"
+                f" parser_version, source_hash, source_path, output_path, converted_at, {options}"
+                " FROM conversions_old")
+            self.connection.execute("DROP TABLE conversions_old")
+
+    def key_for(self, source_path):
+        return revision_key(source_path)
+
+    def lookup(self, source_path, parser, output_path):
+        document_id, revision = self.key_for(source_path)
+        row = self.connection.execute(
+            "SELECT parser_version, source_hash, output_path, options FROM conversions"
+            " WHERE document_id = ? AND revision = ? AND parser = ? AND output_path = ?",
+            (document_id, revision, parser, os.path.abspath(output_path)),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"parser_version": row[0], "source_hash": row[1], "output_path": row[2], "options": row[3]}
+
+    def is_fresh(self, source_path, parser, parser_version, output_path, options=""):
+        """options: fingerprint of conversion settings that change the output but not its path."""
+        entry = self.lookup(source_path, parser, output_path)
+        if entry is None or entry["parser_version"] != parser_version or entry["options"] != options:
+            return False
+        if not os.path.exists(output_path):
+            return False
+        if parse_document_id(source_path)[0] is None:
+            return entry["source_hash"] == file_hash(source_path)
+        return True
+
+    def record(self, source_path, parser, parser_version, source_hash, output_path, options=""):
+        document_id, revision = self.key_for(source_path)
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO conversions ({CONVERSIONS_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (document_id, revision, parser, parser_version, source_hash,
+             os.path.abspath(source_path), os.path.abspath(output_path), time.time(), options),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Optional
+
+# Спільна модель документа для всіх парсерів. Блоки — dataclass зі __slots__,
+# щоб на великих корпусах не тримати __dict__ на кожен абзац. to_dict()
+# повертає ту саму форму {"type": ..., ...}, що й JSON-вивід парсерів.
+
+
+@dataclass(slots=True)
+class Heading:
+    type: ClassVar[str] = "heading"
+    level: int
+    text: str
+
+    def to_dict(self):
+        return {"type": self.type, "level": self.level, "text": self.text}
+
+
+@dataclass(slots=True)
+class Article:
+    type: ClassVar[str] = "article"
+    text: str
+
+    def to_dict(self):
+        return {"type": self.type, "text": self.text}
+
+
+@dataclass(slots=True)
+class Paragraph:
+    type: ClassVar[str] = "paragraph"
+    text: str
+
+    def to_dict(self):
+        return {"type": self.type, "text": self.text}
+
+
+@dataclass(slots=True)
+class ListBlock:
+    type: ClassVar[str] = "list"
+    list_type: str
+    items: List[str]
+
+    def to_dict(self):
+        return {"type": self.type, "list_type": self.list_type, "items": self.items}
+
+
+@dataclass(slots=True)
+class Amendment:
+    type: ClassVar[str] = "amendment"
+    text: str
+
+    def to_dict(self):
+        return {"type": self.type, "text": self.text}
+
+
+@dataclass(slots=True)
+class Reference:
+    type: ClassVar[str] = "reference"
+    text: str
+    law_number: Optional[str] = None
+    law_date: Optional[str] = None
+    url: Optional[str] = None
+
+    def to_dict(self):
+        data = {"type": self.type, "law_number": self.law_number,
+                "law_date": self.law_date, "text": self.text}
+        if self.url is not None:
+            data["url"] = self.url
+        return data
+
+
+@dataclass(slots=True)
+class Table:
+    type: ClassVar[str] = "table"
+    data: Optional[List[List[str]]] = None
+    # Стовпцева форма (parsing.tables.columnar): замість рядків "data"
+    columns: Optional[List[List[str]]] = None
+
+    def to_dict(self):
+        if self.columns is not None:
+            return {"type": self.type, "columns": self.columns}
+        return {"type": self.type, "data": self.data}
+
+
+BLOCK_TYPES = {cls.type: cls for cls in (Heading, Article, Paragraph, ListBlock,
+                                         Amendment, Reference, Table)}
+
+
+def block_from_dict(data):
+    try:
+        cls = BLOCK_TYPES[data["type"]]
+    except KeyError:
+        raise ValueError(f"Невідомий тип блоку: {data.get('type')!r}") from None
+    return cls(**{key: value for key, value in data.items() if key != "type"})
+
+
+@dataclass(slots=True)
+class LawDocument:
+    title: str
+    law_number: Optional[str] = None
+    law_date: Optional[str] = None
+    source: Optional[str] = None
+    content: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            title=data.get("title"),
+            law_number=data.get("law_number"),
+            law_date=data.get("law_date"),
+            source=data.get("source"),
+            content=[block_from_dict(block) for block in data.get("content", [])],
+        )
+
+    def metadata(self):
+        return {"title": self.title, "law_number": self.law_number,
+                "law_date": self.law_date, "source": self.source}
+
+    def to_dict(self):
+        data = self.metadata()
+        data["content"] = [block.to_dict() for block in self.content]
+        return data
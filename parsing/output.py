@@ -0,0 +1,106 @@
+import json
+
+from .serializers import BINARY_FORMATS, dumps_binary, json_dumps, json_loads, loads_binary
+from .structure import build_tree
+
+# Формати виводу:
+#   json    — як раніше, один об'єкт з відступом 2
+#   compact — той самий об'єкт без відступів і пробілів
+#   ndjson  — перший рядок — метадані ({"type": "metadata", ...}), далі по
+#             одному блоку content на рядок; пишеться в міру появи блоків
+#   tree    — метадані і вкладене дерево Розділ → Глава → Стаття ("structure")
+#   msgpack, cbor — бінарний об'єкт з таблицею рядків (parsing.serializers)
+# Текстові формати пише вибраний серіалізатор (json або orjson).
+FORMATS = ("json", "compact", "ndjson", "tree") + BINARY_FORMATS
+EXTENSIONS = {"json": ".json", "compact": ".json", "ndjson": ".ndjson", "tree": ".tree.json",
+              "msgpack": ".msgpack", "cbor": ".cbor"}
+
+METADATA_TYPE = "metadata"
+
+
+def dumps_compact(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_ndjson(metadata, blocks, file, indexer=None, dumps=dumps_compact):
+    """Write the metadata header and then each block as it is produced.
+
+    An optional StructureIndexer receives every block with its byte range.
+    """
+    header = {"type": METADATA_TYPE}
+    header.update((key, value) for key, value in metadata.items() if key != "content")
+    line = dumps(header) + "\n"
+    file.write(line)
+    offset = len(line.encode("utf-8")) if indexer is not None else 0
+    count = 0
+    for block in blocks:
+        if not isinstance(block, dict):
+            block = block.to_dict()
+        line = dumps(block) + "\n"
+        file.write(line)
+        if indexer is not None:
+            end = offset + len(line.encode("utf-8"))
+            indexer.add(block, offset, end)
+            offset = end
+        count += 1
+    return count
+
+
+def write_law(law_data, output_path, fmt="json", serializer="json"):
+    if fmt in BINARY_FORMATS:
+        data = dumps_binary(law_data, fmt)
+        with open(output_path, "wb") as f:
+            f.write(data)
+        return
+    dumps = json_dumps(serializer)
+    with open(output_path, "w", encoding="utf-8") as f:
+        if fmt == "ndjson":
+            write_ndjson(law_data, law_data["content"], f, dumps=dumps)
+        elif fmt == "compact":
+            f.write(dumps(law_data))
+        elif fmt == "json":
+            f.write(dumps(law_data, indent=2))
+        elif fmt == "tree":
+            tree = {key: value for key, value in law_data.items() if key != "content"}
+            tree["structure"] = build_tree(law_data["content"])
+            f.write(dumps(tree, indent=2))
+        else:
+            raise ValueError(f"Невідомий формат '{fmt}', доступні: {', '.join(FORMATS)}")
+
+
+def write_law_stream(blocks, output_path, indexer=None, serializer="json"):
+    """Write NDJSON from an iterator whose first item is the metadata dict."""
+    blocks = iter(blocks)
+    metadata = next(blocks)
+    with open(output_path, "w", encoding="utf-8") as f:
+        return write_ndjson(metadata, blocks, f, indexer, json_dumps(serializer))
+
+
+def iter_ndjson(path, serializer="json"):
+    """Yield the metadata dict and then every block of an NDJSON law file."""
+    loads = json_loads(serializer)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def read_ndjson(path, serializer="json"):
+    """Load an NDJSON law file back into the usual {..., "content": [...]} dict."""
+    records = iter_ndjson(path, serializer)
+    law_data = next(records)
+    law_data.pop("type", None)
+    law_data["content"] = list(records)
+    return law_data
+
+
+def read_law(path, serializer="json"):
+    """Load any convert output (.json, .ndjson, .msgpack, .cbor) as a dict."""
+    if path.endswith(EXTENSIONS["ndjson"]):
+        return read_ndjson(path, serializer)
+    with open(path, "rb") as f:
+        data = f.read()
+    for fmt in BINARY_FORMATS:
+        if path.endswith(EXTENSIONS[fmt]):
+            return loads_binary(data, fmt)
+    return json_loads(serializer)(data)
@@ -3,17 +3,28 @@ import json
 import re
 from bs4 import BeautifulSoup
 
-# Укажи точное имя файла
-input_file = "/content/Про автомобільний транспорт - Закон № 2344-III від 05.04.2001 - d81073-20241115.htm"
+from ..classifier import list_marker
+from ..profiling import stages
+from ..source import read_text
 
-# Регулярные выражения для списков
-ordered_patterns = [r"^\d+\)", r"^\d+\.\d+", r"^[а-я]\)"]  # 1), 1.1., а)
-unordered_patterns = [r"^- ", r"• ", r"● "]  # Маркеры маркированных списков
+# Меняется при любом изменении логики разбора, чтобы сбросить кэш конвертации
+PARSER_VERSION = "2"
+
+# Ссылка на закон-источник изменений (маркеры списков - в parsing.classifier)
+reference_pattern = re.compile(r"Законом № (\d+-[IVXLCDM]+) від (\d{2}\.\d{2}\.\d{4})")
 
 # Функция парсинга HTML в JSON
 def parse_law_html(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        soup = BeautifulSoup(file, "html.parser")
+    timer = stages()
+    html = read_text(file_path)
+    timer.mark("load")
+    soup = BeautifulSoup(html, "html.parser")
+    timer.mark("dom")
+    return parse_law_tree(soup, file_path)
+
+# Разбор уже построенного дерева (общего для всех парсеров в parsing.shared)
+def parse_law_tree(soup, file_path=None):
+    timer = stages()
 
     # Извлекаем название закона из <title>
     title = soup.find("title").text.strip() if soup.find("title") else "Без назви"
@@ -27,6 +38,7 @@ def parse_law_html(file_path):
 
     # Получаем основной текст закона
     article_div = soup.find("div", {"id": "article"})
+    timer.mark("article")
     if not article_div:
         print("⚠️ Основной текст закона не найден!")
         return
@@ -49,7 +61,7 @@ def parse_law_html(file_path):
             continue
 
         # Проверка ссылок на законы
-        match_reference = re.search(r"Законом № (\d+-[IVXLCDM]+) від (\d{2}\.\d{2}\.\d{4})", text)
+        match_reference = reference_pattern.search(text)
         if match_reference:
             content.append({
                 "type": "reference",
@@ -61,10 +73,9 @@ def parse_law_html(file_path):
 
         # Обнаружение нумерованных и маркированных списков
         if element.name == "p" and "rvps2" in element.get("class", []):
-            is_ordered = any(re.match(pattern, text) for pattern in ordered_patterns)
-            is_unordered = any(re.match(pattern, text) for pattern in unordered_patterns)
+            marker = list_marker(text)
 
-            if is_ordered:
+            if marker == "ordered":
                 if not current_list or list_type != "ordered":
                     if current_list:
                         content.append({"type": "list", "list_type": list_type, "items": current_list})
@@ -72,7 +83,7 @@ def parse_law_html(file_path):
                     list_type = "ordered"
                 current_list.append(text)
 
-            elif is_unordered:
+            elif marker == "unordered":
                 if not current_list or list_type != "unordered":
                     if current_list:
                         content.append({"type": "list", "list_type": list_type, "items": current_list})
@@ -103,17 +114,21 @@ def parse_law_html(file_path):
         "content": content
     }
 
-    # Определяем имя выходного файла
-    json_filename = os.path.splitext(os.path.basename(file_path))[0] + ".json"
-    output_path = os.path.join("/content/", json_filename)
+    timer.mark("classify")
+    return law_data
 
-    # Сохраняем JSON
-    with open(output_path, "w", encoding="utf-8") as json_file:
-        json.dump(law_data, json_file, ensure_ascii=False, indent=4)
+if __name__ == "__main__":
+    import sys
 
-    print(f"✅ Обработан: {file_path} → {json_filename}")
+    # Запускаем парсер для указанного файла: python -m parsing.parsers.ChatGPT_parser_htm_to_json <файл.htm>
+    input_file = sys.argv[1]
+    law_data = parse_law_html(input_file)
 
-# Запускаем парсер для указанного файла
-parse_law_html(input_file)
+    if law_data:
+        # Сохраняем JSON рядом с исходным файлом
+        output_path = os.path.splitext(input_file)[0] + ".json"
+        with open(output_path, "w", encoding="utf-8") as json_file:
+            json.dump(law_data, json_file, ensure_ascii=False, indent=4)
 
-print("🎉 Парсинг завершен! JSON-файл сохранен в /content/")
+        print(f"✅ Обработан: {input_file} → {output_path}")
+        print("🎉 Парсинг завершен!")
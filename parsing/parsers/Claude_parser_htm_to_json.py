@@ -1,14 +1,58 @@
 import os
 import json
 from bs4 import BeautifulSoup
-import re
 
-def parse_law_html(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        soup = BeautifulSoup(file, "lxml")
-    
+from ..classifier import AMENDMENT_RE, HEAD_RE, HEADING_LEVELS, REFERENCE_RE, classify_block
+from ..profiling import stages
+from ..source import MappedSource
+
+# Меняется при любом изменении логики разбора, чтобы сбросить кэш конвертации
+PARSER_VERSION = "1"
+
+BLOCK_TAGS = ['p', 'div', 'ul', 'ol']
+
+# Обход блоков внутри div#article, возвращает пары (элемент, текст).
+# "nested" - старый обход: get_text() каждого блока, поэтому текст вложенных
+# div извлекается заново на каждом уровне предков (квадратичный рост).
+# "leaf" - каждый текстовый узел посещается один раз и отдаётся только
+# ближайшему блоку-предку.
+def iter_blocks(article_div, traversal="leaf"):
+    if traversal == "nested":
+        for element in article_div.find_all(BLOCK_TAGS):
+            yield element, element.get_text().strip()
+        return
+
+    own_strings = {}
+    for string in article_div.strings:
+        block = string.parent
+        while block.name not in BLOCK_TAGS:
+            block = block.parent
+        own_strings.setdefault(id(block), []).append(string)
+
+    for element in article_div.find_all(BLOCK_TAGS):
+        yield element, "".join(own_strings.get(id(element), ())).strip()
+
+def parse_law_html(file_path, traversal="leaf"):
+    # В lxml уходят только байты div#article из отображённого в память файла:
+    # шапка и навигация не разбираются, весь файл не декодируется в str
+    timer = stages()
+    with MappedSource(file_path) as source:
+        title = source.title()
+        article_bytes = source.article_bytes()
+        timer.mark("load")
+        soup = BeautifulSoup(article_bytes, "lxml", from_encoding=source.encoding)
+        timer.mark("dom")
+    return law_from_tree(soup, title, traversal)
+
+# Разбор уже построенного дерева (общего для всех парсеров в parsing.shared)
+def parse_law_tree(soup, file_path=None, traversal="leaf"):
+    title_tag = soup.find("title")
+    return law_from_tree(soup, title_tag.get_text() if title_tag else None, traversal)
+
+def law_from_tree(soup, title, traversal="leaf"):
+    timer = stages()
     # Базовые метаданные
-    title = soup.find("title").text.strip() if soup.find("title") else "Без назви"
+    title = title.strip() if title is not None else "Без назви"
     
     # Извлекаем номер и дату закона
     law_number = "Невідомий номер"
@@ -31,17 +75,19 @@ def parse_law_html(file_path):
     
     # Получаем основной контент
     article_div = soup.find("div", {"id": "article"})
+    timer.mark("article")
     if article_div:
         current_article = None
         current_list_items = []
+        seen_list_items = set()
         
-        for element in article_div.find_all(['p', 'div', 'ul', 'ol']):
-            text = element.get_text().strip()
+        for element, text in iter_blocks(article_div, traversal):
             if not text:
                 continue
                 
-            # Проверяем, является ли это заголовком
-            if is_heading(text):
+            # Заголовок, статья, поправка или ссылка на закон - за один проход
+            block_type, level, ref_number, ref_date = classify_block(text)
+            if block_type is not None:
                 # Закрываем текущий список, если есть
                 if current_list_items:
                     law_data["content"].append({
@@ -50,63 +96,35 @@ def parse_law_html(file_path):
                         "items": current_list_items.copy()
                     })
                     current_list_items = []
+                    seen_list_items.clear()
                 
-                law_data["content"].append({
-                    "type": "heading",
-                    "level": get_heading_level(text),
-                    "text": text
-                })
-                continue
-            
-            # Проверяем, является ли это статьёй
-            if is_article(text):
-                # Закрываем текущий список, если есть
-                if current_list_items:
+                if block_type == "heading":
                     law_data["content"].append({
-                        "type": "list",
-                        "list_type": "unordered",
-                        "items": current_list_items.copy()
+                        "type": "heading",
+                        "level": level,
+                        "text": text
                     })
-                    current_list_items = []
-                
-                law_data["content"].append({
-                    "type": "article",
-                    "text": text
-                })
-                continue
-            
-            # Проверяем, является ли это поправкой
-            if is_amendment(text):
-                # Закрываем текущий список, если есть
-                if current_list_items:
+                elif block_type == "article":
                     law_data["content"].append({
-                        "type": "list",
-                        "list_type": "unordered",
-                        "items": current_list_items.copy()
+                        "type": "article",
+                        "text": text
                     })
-                    current_list_items = []
-                
-                law_data["content"].append(parse_amendment(text))
-                continue
-            
-            # Проверяем, является ли это ссылкой на закон
-            if is_reference(text):
-                # Закрываем текущий список, если есть
-                if current_list_items:
+                elif block_type == "amendment":
+                    law_data["content"].append(parse_amendment(text))
+                else:
                     law_data["content"].append({
-                        "type": "list",
-                        "list_type": "unordered",
-                        "items": current_list_items.copy()
+                        "type": "reference",
+                        "law_number": ref_number,
+                        "law_date": ref_date,
+                        "text": text
                     })
-                    current_list_items = []
-                
-                law_data["content"].append(parse_reference(text))
                 continue
             
             # Обработка списков
             if element.name in ['ul', 'ol'] or element.get('class') == ['rvps2']:
                 # Если это явный элемент списка или параграф с классом rvps2
-                if not text in current_list_items:  # Избегаем дубликатов
+                if text not in seen_list_items:  # Избегаем дубликатов
+                    seen_list_items.add(text)
                     current_list_items.append(text)
             else:
                 # Если встретили не элемент списка, но есть накопленные элементы списка
@@ -117,6 +135,7 @@ def parse_law_html(file_path):
                         "items": current_list_items.copy()
                     })
                     current_list_items = []
+                    seen_list_items.clear()
                 
                 # Добавляем как обычный параграф
                 law_data["content"].append({
@@ -124,38 +143,27 @@ def parse_law_html(file_path):
                     "text": text
                 })
     
+    timer.mark("classify")
     return law_data
 
+# Отдельные проверки оставлены для совместимости; все шаблоны скомпилированы
+# один раз в parsing.classifier.
 def is_heading(text):
-    patterns = [
-        r"^Розділ\s+[IVX]+[\.\s]",
-        r"^Глава\s+\d+[\.\s]",
-        r"^I{1,3}V?X?\.\s+",  # Для заголовков вида "I.", "II.", "III." и т.д.
-    ]
-    return any(re.match(pattern, text.strip()) for pattern in patterns)
+    match = HEAD_RE.match(text.strip())
+    return bool(match) and match.lastgroup in HEADING_LEVELS
 
 def get_heading_level(text):
-    text = text.strip()
-    if re.match(r"^Розділ\s+[IVX]+[\.\s]", text):
-        return 1
-    elif re.match(r"^Глава\s+\d+[\.\s]", text):
-        return 2
-    elif re.match(r"^I{1,3}V?X?\.\s+", text):
-        return 2
+    match = HEAD_RE.match(text.strip())
+    if match and match.lastgroup in HEADING_LEVELS:
+        return HEADING_LEVELS[match.lastgroup]
     return 3
 
 def is_article(text):
-    return bool(re.match(r"^Стаття\s+\d+[\.\s]", text.strip()))
+    match = HEAD_RE.match(text.strip())
+    return bool(match) and match.lastgroup == "article"
 
 def is_amendment(text):
-    patterns = [
-        r"згідно із Законом",
-        r"змінено Законом",
-        r"доповнено Законом",
-        r"виключено Законом",
-        r"у редакції Закону"
-    ]
-    return any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)
+    return bool(AMENDMENT_RE.search(text))
 
 def parse_amendment(text):
     return {
@@ -164,10 +172,10 @@ def parse_amendment(text):
     }
 
 def is_reference(text):
-    return bool(re.search(r"№\s*\d+-[A-ZІХ]+\s+від\s+\d{2}\.\d{2}\.\d{4}", text))
+    return bool(REFERENCE_RE.search(text))
 
 def parse_reference(text):
-    match = re.search(r"№\s*(\d+-[A-ZІХ]+)\s+від\s+(\d{2}\.\d{2}\.\d{4})", text)
+    match = REFERENCE_RE.search(text)
     if match:
         return {
             "type": "reference",
@@ -180,34 +188,36 @@ def parse_reference(text):
         "text": text
     }
 
-# Запуск парсера
-input_file = "/content/Про автомобільний транспорт - Закон № 2344-III від 05.04.2001 - d81073-20241115.htm"
+if __name__ == "__main__":
+    import sys
+
+    # Запуск парсера: python -m parsing.parsers.Claude_parser_htm_to_json <файл.htm>
+    input_file = sys.argv[1]
 
-# Парсим файл
-law_data = parse_law_html(input_file)
+    # Парсим файл
+    law_data = parse_law_html(input_file)
 
-# Создаем имя для выходного JSON файла
-json_filename = os.path.splitext(os.path.basename(input_file))[0] + ".json"
-output_path = os.path.join("/content/", json_filename)
+    # Создаем имя для выходного JSON файла рядом с исходным
+    output_path = os.path.splitext(input_file)[0] + ".json"
 
-# Сохраняем результат в JSON
-with open(output_path, "w", encoding="utf-8") as json_file:
-    json.dump(law_data, json_file, ensure_ascii=False, indent=2)
+    # Сохраняем результат в JSON
+    with open(output_path, "w", encoding="utf-8") as json_file:
+        json.dump(law_data, json_file, ensure_ascii=False, indent=2)
 
-print(f"✅ Обработан: {input_file}")
-print(f"✅ Создан файл: {output_path}")
+    print(f"✅ Обработан: {input_file}")
+    print(f"✅ Создан файл: {output_path}")
 
-# Проверка размеров
-input_size = os.path.getsize(input_file)
-output_size = os.path.getsize(output_path)
+    # Проверка размеров
+    input_size = os.path.getsize(input_file)
+    output_size = os.path.getsize(output_path)
 
-print(f"\nРазмер исходного HTML файла: {input_size:,} байт")
-print(f"Размер созданного JSON файла: {output_size:,} байт")
+    print(f"\nРазмер исходного HTML файла: {input_size:,} байт")
+    print(f"Размер созданного JSON файла: {output_size:,} байт")
 
-with open(input_file, "r", encoding="utf-8") as file:
-    html_content = file.read()
-    print(f"Количество символов в HTML: {len(html_content):,}")
+    with open(input_file, "r", encoding="utf-8") as file:
+        html_content = file.read()
+        print(f"Количество символов в HTML: {len(html_content):,}")
 
-with open(output_path, "r", encoding="utf-8") as file:
-    json_content = file.read()
-    print(f"Количество символов в JSON: {len(json_content):,}")
+    with open(output_path, "r", encoding="utf-8") as file:
+        json_content = file.read()
+        print(f"Количество символов в JSON: {len(json_content):,}")
@@ -1,8 +1,30 @@
 import json
 from bs4 import BeautifulSoup
 
+from ..profiling import stages
+from ..source import read_text
+
+# Bump on any change to the parsing logic so cached conversions are redone
+PARSER_VERSION = "1"
+
+def parse_html_file(file_path):
+    timer = stages()
+    html_content = read_text(file_path)
+    timer.mark("load")
+    return build_law_json(html_content)
+
 def parse_html_to_json(html_content):
+    return json.dumps(build_law_json(html_content), ensure_ascii=False, indent=2)
+
+def build_law_json(html_content):
+    timer = stages()
     soup = BeautifulSoup(html_content, 'html.parser')
+    timer.mark("dom")
+    return parse_html_tree(soup)
+
+# Works on an already built tree (shared by all parsers in parsing.shared)
+def parse_html_tree(soup, file_path=None):
+    timer = stages()
 
     # Extract metadata
     title = soup.title.string if soup.title else "Без названия"
@@ -71,7 +93,8 @@ def parse_html_to_json(html_content):
         "content": content
     }
 
-    return json.dumps(law_json, ensure_ascii=False, indent=2)
+    timer.mark("classify")
+    return law_json
 
 def extract_law_number(soup):
     # Implement extraction logic for law number
@@ -92,15 +115,18 @@ def extract_reference_details(reference):
     text = reference.get_text(strip=True)
     return law_number, law_date, text
 
-# Example usage
-file_path = '/content/Про автомобільний транспорт - Закон № 2344-III від 05.04.2001 - d81073-20241115.htm'
-with open(file_path, 'r', encoding='utf-8') as html_file:
-    html_content = html_file.read()
+if __name__ == "__main__":
+    import sys
+
+    # Example usage: python -m parsing.parsers.GitCopilot_parser_htm_to_json <file.htm> [output.json]
+    file_path = sys.argv[1]
+    with open(file_path, 'r', encoding='utf-8') as html_file:
+        html_content = html_file.read()
 
-json_content = parse_html_to_json(html_content)
+    json_content = parse_html_to_json(html_content)
 
-output_path = '/content/output.json'
-with open(output_path, 'w', encoding='utf-8') as json_file:
-    json_file.write(json_content)
+    output_path = sys.argv[2] if len(sys.argv) > 2 else file_path.rsplit('.', 1)[0] + '.json'
+    with open(output_path, 'w', encoding='utf-8') as json_file:
+        json_file.write(json_content)
 
-print("Парсинг завершен. JSON сохранен в", output_path)
+    print("Парсинг завершен. JSON сохранен в", output_path)
@@ -1,12 +1,58 @@
 import re
 import json
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ..profiling import stages
+from ..source import MappedSource, read_text
+from ..split import MIN_SLICE_BYTES, SEAM_TAG, article_slices
+from ..streaming import iter_article_events
+from ..tables import element_cells, expand_spans
+
+# Змінюється при будь-якій зміні логіки розбору, щоб скинути кеш конвертації
+PARSER_VERSION = "3"
+
+# Усе, що потрібно від абзацу, за один обхід його піддерева замість окремих
+# get_text(), find('em'), find('a') та find_previous_sibling('p').get_text().
+# Та сама форма, що й події потокового рушія (parsing.streaming).
+def paragraph_info(element):
+    strings = []
+    has_em = False
+    has_link = False
+    first_link = None
+    string_types = element.interesting_string_types
+    for node in element.descendants:
+        name = node.name
+        if name is None:
+            # як get_text(): без коментарів і тексту <style>/<script>
+            if type(node) in string_types:
+                stripped = node.strip()
+                if stripped:
+                    strings.append(stripped)
+        elif name == 'em':
+            has_em = True
+        elif name == 'a':
+            if first_link is None:
+                first_link = node
+            if node.get('href') is not None:
+                has_link = True
+    return {
+        "text": " ".join(strings),
+        "plain_text": "".join(strings),
+        "classes": element.get('class', []),
+        "has_em": has_em,
+        "has_link": has_link,
+        "link_href": first_link.get('href') if first_link is not None else None,
+    }
+
+def parse_npa_html(html_file_path, backend="soup"):
+    if backend == "stream":
+        return parse_npa_stream(html_file_path)
 
-def parse_npa_html(html_file_path):
+    timer = stages()
     try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        html_content = read_text(html_file_path)
     except FileNotFoundError:
         print(f"Помилка: Файл '{html_file_path}' не знайдено!")
         return None
@@ -14,7 +60,15 @@ def parse_npa_html(html_file_path):
         print(f"Помилка при читанні файлу '{html_file_path}': {e}")
         return None
 
+    timer.mark("load")
     soup = BeautifulSoup(html_content, 'html.parser')
+    timer.mark("dom")
+    return parse_npa_tree(soup, html_file_path)
+
+
+# Розбір уже побудованого дерева (спільного для всіх парсерів у parsing.shared)
+def parse_npa_tree(soup, html_file_path=None):
+    timer = stages()
 
     # --- Метаданные ---
     title_tag = soup.find('title')
@@ -35,27 +89,43 @@ def parse_npa_html(html_file_path):
     }
 
     article_div = soup.find('div', id='article')
+    timer.mark("article")
     if not article_div:
         print(f"Попередження: В файлі '{html_file_path}' не знайдено div з id='article'.")
         return json_data
 
+    _npa_blocks(article_div, json_data['content'])
+
+    timer.mark("classify")
+    return json_data
+
+
+def _npa_blocks(article_div, content, in_list=False, last_p_text=None):
+    # Обхід div#article: блоки додаються в content. Повертає (in_list,
+    # last_p_text), щоб розбір можна було продовжити з іншого шматка
+    # статті (parse_npa_parallel).
     current_heading_levels = []
-    in_list = False  # Чи знаходимося ми зараз всередині списку
     list_type = "unordered"
+    # Текст останнього <p> кожного батька: для наступного абзацу це і є
+    # find_previous_sibling('p'), бо descendants іде в порядку документа
+    if last_p_text is None:
+        last_p_text = {}
 
     for element in article_div.descendants:
-        if isinstance(element, NavigableString):
-            if element.strip() == "":
-                continue
+        if element.name is None:  # текстові вузли обробляються разом з абзацом
+            continue
 
         if element.name == 'p':
-            text = element.get_text(separator=" ", strip=True)
+            info = paragraph_info(element)
+            prev_text = last_p_text.get(id(element.parent))
+            last_p_text[id(element.parent)] = info["plain_text"]
+            text = info["text"]
             if not text:
                 continue
 
             # --- Статті (article) ---
             if text.startswith("Стаття"):
-                json_data['content'].append({
+                content.append({
                     "type": "article",
                     "text": text
                 })
@@ -64,37 +134,36 @@ def parse_npa_html(html_file_path):
 
             # --- Поправки (amendment) і Посилання (reference) ---
             # (винесено перед обробкою списків, бо поправки можуть бути *всередині* списків)
-            if element.find('em') and ("згідно із Законом" in text or "змінено Законом" in text or "виключено згідно із Законом" in text):
+            if info["has_em"] and ("згідно із Законом" in text or "змінено Законом" in text or "виключено згідно із Законом" in text):
                 amendment_text = text
                 match = re.search(r"(№\s*[\w\d/-]+)\s*(?:від\s*(\d{2}\.\d{2}\.\d{4}))?", amendment_text)
                 law_number = match.group(1) if match else None
                 law_date = match.group(2) if match else None
                 if law_number and law_date:
-                    json_data['content'].append({
+                    content.append({
                         "type": "reference",
                         "law_number": law_number,
                         "law_date": law_date,
                         "text": amendment_text
                     })
                 else: #якщо не вдалося витягнути номер
-                  json_data['content'].append({
+                  content.append({
                       "type": "amendment",
                       "text": amendment_text
                 })
                 in_list = False
                 continue
 
-            elif element.find('a', href=True):  # Посилання
-                link = element.find('a')
-                href = link.get('href')
-                link_text = element.get_text(strip=True)
+            elif info["has_link"]:  # Посилання
+                href = info["link_href"]
+                link_text = info["plain_text"]
 
                 match = re.search(r"(№\s*[\w\d/-]+)\s*(?:від\s*(\d{2}\.\d{2}\.\d{4}))?", link_text)
                 law_number = match.group(1) if match else None
                 law_date = match.group(2) if match else None
 
 
-                json_data['content'].append({
+                content.append({
                     "type": "reference",
                     "law_number": law_number,
                     "law_date": law_date,
@@ -108,11 +177,10 @@ def parse_npa_html(html_file_path):
             is_list_item = False  # Прапорець, чи є поточний елемент елементом списку
 
             # Перевірка, чи є нумерація (1., 1), а), і т.д.) або маркер (•, -, *)
-            if 'rvps2' in element.get('class', []):
+            if 'rvps2' in info["classes"]:
               is_list_item = True
             else:
-              prev_p = element.find_previous_sibling('p')
-              if prev_p and prev_p.get_text(strip=True).endswith(':'):
+              if prev_text and prev_text.endswith(':'):
                 is_list_item = True
               elif re.match(r'^\s*(\d+[\.\)]|\w\))', text): #перевірка на нумерацію
                 is_list_item = True
@@ -123,11 +191,11 @@ def parse_npa_html(html_file_path):
                     # Якщо поточний елемент - частина списку, додаємо його
                     list_item_text = text
                     if list_item_text:
-                        json_data['content'][-1]['items'].append(list_item_text)
+                        content[-1]['items'].append(list_item_text)
                 else:
                   # Починаємо новий список
                   list_type = "ordered" if re.match(r'^\s*(\d+[\.\)]|\w\))', text) else "unordered"
-                  json_data['content'].append({
+                  content.append({
                         "type": "list",
                         "list_type": list_type,
                         "items": [text]
@@ -137,7 +205,7 @@ def parse_npa_html(html_file_path):
 
             else:
                 in_list = False  # Скидаємо прапорець, якщо це не елемент списку
-                json_data['content'].append({  # Додаємо звичайний параграф
+                content.append({  # Додаємо звичайний параграф
                     "type": "paragraph",
                     "text": text
                 })
@@ -173,7 +241,7 @@ def parse_npa_html(html_file_path):
             current_heading_levels = current_heading_levels[:level - 1]
             current_heading_levels.append(heading_text)
 
-            json_data['content'].append({
+            content.append({
                 "type": "heading",
                 "level": level,
                 "text": heading_text
@@ -183,40 +251,295 @@ def parse_npa_html(html_file_path):
         # --- Таблицы (table) ---
         elif element.name == 'table':
             in_list = False  # Скидаємо стан списку
-            table_data = []
-            for row in element.find_all('tr'):
-                row_data = []
-                for cell in row.find_all(['td', 'th']):
-                    row_data.append(cell.get_text(strip=True))
-                if row_data:  # Додаємо, якщо рядок не порожній
-                    table_data.append(row_data)
+            # Прямокутна сітка з урахуванням colspan/rowspan
+            table_data = expand_spans(element_cells(element))
             if table_data:  # Якщо таблиця не порожня
-                json_data['content'].append({
+                content.append({
                     "type": "table",
                     "data": table_data
                 })
 
+    return in_list, last_p_text
+
+
+def _head_chain(article_div, parents):
+    # Шматки після першого починаються з відкриття предків абзаців-меж:
+    # div#article і перші дочірні теги з очікуваними назвами, а перший
+    # дочірній тег останнього з них — абзац-межа
+    chain = [article_div]
+    for name in parents:
+        child = chain[-1].find(True, recursive=False)
+        if child is None or child.name != name:
+            return None
+        chain.append(child)
+    seam = chain[-1].find(True, recursive=False)
+    return chain if seam is not None and seam.name == 'p' else None
+
+
+def _tail_chain(mark, article_div, parents, last):
+    # Мітка кінця шматка: в останньому — поза div#article, в інших — прямо в
+    # батьку абзаців-меж, тобто html.parser на межі мав відкритими саме ці
+    # предки. Повертає предків від div#article або None
+    ancestors = []
+    for ancestor in mark.parents:
+        if ancestor is article_div:
+            break
+        ancestors.append(ancestor)
+    else:
+        return [] if last else None
+    if last:
+        return None
+    chain = [article_div] + ancestors[::-1]
+    if [element.name for element in chain[1:]] != parents:
+        return None
+    # Заголовок серед цих предків дивиться на наступних сусідів — через межу
+    if any(element.find('span', class_='rvts15', recursive=False) for element in chain):
+        return None
+    return chain
+
+
+def _parse_npa_slice(html_bytes, encoding, parents, first, last, in_list=False, prev_texts=None, content=None):
+    """Walk one fragment; returns (blocks, in_list, texts of the last <p> in each seam ancestor).
+
+    None when the fragment's tree does not match the expected seam
+    ancestors, so it cannot stand in for its part of the whole document.
+    """
+    soup = BeautifulSoup(html_bytes.decode(encoding), 'html.parser')
+    article_div = soup.find('div', id='article')
+    mark = soup.find(SEAM_TAG)
+    if article_div is None or mark is None:
+        return None
+    head = None if first else _head_chain(article_div, parents)
+    tail = _tail_chain(mark, article_div, parents, last)
+    if (head is None and not first) or tail is None:
+        return None
+    mark.decompose()
+    content = [] if content is None else content
+    last_p_text = {}
+    if prev_texts is not None:
+        for element, text in zip(head, prev_texts):
+            if text is not None:
+                last_p_text[id(element)] = text
+    in_list, last_p_text = _npa_blocks(article_div, content, in_list, last_p_text)
+    return content, in_list, [last_p_text.get(id(element)) for element in tail]
+
+
+def parse_npa_parallel(html_file_path, jobs=None, min_slice=MIN_SLICE_BYTES):
+    # Той самий результат, що й parse_npa_html, але великий div#article
+    # ріжеться по розділах (parsing.split) і шматки розбираються в окремих
+    # процесах. Стан обходу через межу майже не переходить: заголовок
+    # "Розділ" скидає рівні заголовків і список, а від попереднього шматка
+    # залежить лише те, чи сам абзац-межа стане пунктом списку (попередній
+    # абзац того ж рівня закінчується на ':'). Такий шматок розбирається
+    # ще раз тут, з правильним станом. Якщо дерево будь-якого шматка не
+    # збігається з очікуваними предками межі, документ розбирається цілим.
+    jobs = jobs or os.cpu_count() or 1
+    timer = stages()
+    try:
+        with MappedSource(html_file_path) as source:
+            article_range = source.article_range
+            if article_range is None or article_range[1] - article_range[0] < 2 * min_slice:
+                return parse_npa_html(html_file_path)
+            title = source.title()
+            encoding = source.encoding
+            slices, parents = article_slices(source.data, article_range, encoding, jobs, min_slice)
+    except FileNotFoundError:
+        print(f"Помилка: Файл '{html_file_path}' не знайдено!")
+        return None
+    if len(slices) < 2:
+        return parse_npa_html(html_file_path)
+    timer.mark("load")
+
+    json_data = _npa_metadata(title.strip() if title is not None else "Название не найдено")
+    content = json_data["content"] = []
+    matched = True
+    with ProcessPoolExecutor(max_workers=min(jobs, len(slices))) as pool:
+        futures = [pool.submit(_parse_npa_slice, html_bytes, encoding, parents, i == 0, i == len(slices) - 1)
+                   for i, html_bytes in enumerate(slices)]
+        in_list = False
+        prev_texts = [None] * (len(parents) + 1)
+        for i, (html_bytes, future) in enumerate(zip(slices, futures)):
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            if result is not None and any(text is not None and text.endswith(':') for text in prev_texts):
+                result = _parse_npa_slice(html_bytes, encoding, parents, i == 0, i == len(slices) - 1,
+                                          in_list, prev_texts, content)
+            elif result is not None:
+                content.extend(result[0])
+            if result is None:
+                matched = False
+                for pending in futures:
+                    pending.cancel()
+                break
+            _, in_list, texts = result
+            prev_texts = [old if new is None else new for old, new in zip(prev_texts, texts)]
+    if not matched:
+        # Межі не збіглися з деревом html.parser (чи шматок упав): розбираємо цілим
+        return parse_npa_html(html_file_path)
+    timer.mark("parallel")
+    return json_data
+
+
+def _npa_metadata(title):
+    law_number_match = re.search(r"№\s*([0-9A-Za-z/-]+)\s*", title)
+    law_date_match = re.search(r"від\s*(\d{2}\.\d{2}\.\d{4})", title)
+
+    return {
+        "title": title,
+        "law_number": law_number_match.group(1) if law_number_match else "Номер не найден",
+        "law_date": law_date_match.group(1) if law_date_match else "Дата не найдена",
+        "source": None,
+    }
+
+
+def iter_npa_stream(html_file_path):
+    # Той самий розбір, що й parse_npa_html, але на подіях потокового рушія:
+    # документ читається шматками, повне дерево BeautifulSoup не будується.
+    # Першим віддаються метадані (без "content"), далі блоки в міру готовності;
+    # список віддається, коли закінчується.
+    metadata = None
+    current_list = None
+    current_heading_levels = []
+
+    for event in iter_article_events(html_file_path):
+        if event['tag'] == 'title':
+            if metadata is None:
+                metadata = _npa_metadata(event['text'].strip())
+                yield metadata
+            continue
+        if metadata is None:
+            metadata = _npa_metadata("Название не найдено")
+            yield metadata
+
+        if event['tag'] == 'p':
+            text = event['text']
+            if not text:
+                continue
+
+            is_list_item = False
+            block = None
+
+            if text.startswith("Стаття"):
+                block = {"type": "article", "text": text}
+
+            elif event['has_em'] and ("згідно із Законом" in text or "змінено Законом" in text or "виключено згідно із Законом" in text):
+                match = re.search(r"(№\s*[\w\d/-]+)\s*(?:від\s*(\d{2}\.\d{2}\.\d{4}))?", text)
+                law_number = match.group(1) if match else None
+                law_date = match.group(2) if match else None
+                if law_number and law_date:
+                    block = {
+                        "type": "reference",
+                        "law_number": law_number,
+                        "law_date": law_date,
+                        "text": text
+                    }
+                else:
+                    block = {"type": "amendment", "text": text}
+
+            elif event['has_link']:
+                link_text = event['plain_text']
+                match = re.search(r"(№\s*[\w\d/-]+)\s*(?:від\s*(\d{2}\.\d{2}\.\d{4}))?", link_text)
+                block = {
+                    "type": "reference",
+                    "law_number": match.group(1) if match else None,
+                    "law_date": match.group(2) if match else None,
+                    "text": link_text,
+                    "url": event['link_href']
+                }
+
+            elif 'rvps2' in event['classes']:
+                is_list_item = True
+            elif event['prev_text'] is not None and event['prev_text'].endswith(':'):
+                is_list_item = True
+            elif re.match(r'^\s*(\d+[\.\)]|\w\))', text):
+                is_list_item = True
+
+            if is_list_item:
+                if current_list is not None:
+                    current_list['items'].append(text)
+                else:
+                    list_type = "ordered" if re.match(r'^\s*(\d+[\.\)]|\w\))', text) else "unordered"
+                    current_list = {"type": "list", "list_type": list_type, "items": [text]}
+                continue
+
+            if block is None:
+                block = {"type": "paragraph", "text": text}
+
+        elif event['tag'] == 'heading':
+            heading_text = event['text']
+
+            if event['has_br_after'] and event['next_text'] is not None:
+                heading_text += " " + event['next_text']
+
+            if heading_text.startswith("Розділ"):
+                level = 1
+            elif heading_text.startswith("Глава"):
+                level = 2
+            elif event['parent_p_classes'] is None:
+                level = 3
+            elif 'rvps7' in event['parent_p_classes']:
+                level = 2
+            else:
+                level = len(current_heading_levels) + 1
+
+            current_heading_levels = current_heading_levels[:level - 1]
+            current_heading_levels.append(heading_text)
+            block = {"type": "heading", "level": level, "text": heading_text}
+
+        elif event['tag'] == 'table':
+            table_data = expand_spans(event['rows'])
+            block = {"type": "table", "data": table_data} if table_data else None
+
+        else:
+            continue
+
+        # Будь-який інший елемент закриває поточний список
+        if current_list is not None:
+            yield current_list
+            current_list = None
+        if block is not None:
+            yield block
+
+    if metadata is None:
+        yield _npa_metadata("Название не найдено")
+    if current_list is not None:
+        yield current_list
+
+
+def parse_npa_stream(html_file_path):
+    try:
+        blocks = iter_npa_stream(html_file_path)
+        json_data = next(blocks)
+        json_data["content"] = list(blocks)
+    except FileNotFoundError:
+        print(f"Помилка: Файл '{html_file_path}' не знайдено!")
+        return None
+    except UnicodeDecodeError as e:
+        print(f"Помилка при читанні файлу '{html_file_path}': {e}")
+        return None
     return json_data
 
-# --- Пример использования ---
-file_paths = [
-  "Про обов'язкове страхування цивільно-правової відповідальн… - Закон № 1961-IV від 01.07.2004 - d152096-20250101.htm",
-  "Про дорожній рух - Закон № 3353-XII від 30.06.1993 - d21160-20250105.htm",
-  "Про автомобільний транспорт - Закон № 2344-III від 05.04.2001 - d81073-20241115.htm"
-]
-
-for file_path in file_paths:
-    # Перевірка, чи файл існує:
-    if not os.path.exists(file_path):
-        print(f"Файл '{file_path}' не знайдено. Пропускаємо.")
-        continue  # Переходимо до наступного файлу
-
-    json_output = parse_npa_html(file_path)
-    if json_output:  # Перевіряємо, чи повернула функція результат
-        output_file_name = file_path.replace(".htm", ".json")  # Змінив розширення
-        try:
-            with open(output_file_name, 'w', encoding='utf-8') as outfile:
-                json.dump(json_output, outfile, ensure_ascii=False, indent=2)
-            print(f"Файл {file_path} успішно перетворено в {output_file_name}")
-        except Exception as e:
-            print(f"Помилка при записі JSON у файл '{output_file_name}': {e}")
+if __name__ == "__main__":
+    import sys
+
+    # --- Пример использования ---
+    # python -m parsing.parsers.Google_AI_Studio_parser_htm_to_json <файл.htm> [<файл.htm> ...]
+    file_paths = sys.argv[1:]
+
+    for file_path in file_paths:
+        # Перевірка, чи файл існує:
+        if not os.path.exists(file_path):
+            print(f"Файл '{file_path}' не знайдено. Пропускаємо.")
+            continue  # Переходимо до наступного файлу
+
+        json_output = parse_npa_html(file_path)
+        if json_output:  # Перевіряємо, чи повернула функція результат
+            output_file_name = file_path.replace(".htm", ".json")  # Змінив розширення
+            try:
+                with open(output_file_name, 'w', encoding='utf-8') as outfile:
+                    json.dump(json_output, outfile, ensure_ascii=False, indent=2)
+                print(f"Файл {file_path} успішно перетворено в {output_file_name}")
+            except Exception as e:
+                print(f"Помилка при записі JSON у файл '{output_file_name}': {e}")
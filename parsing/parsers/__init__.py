@@ -0,0 +1,107 @@
+import importlib
+
+from ..model import LawDocument, block_from_dict
+from ..profiling import stages
+
+# Назва парсера -> "модуль:функція"; функція приймає шлях до .htm і повертає dict
+# виду {"title", "law_number", "law_date", "source", "content": [...]}.
+# Модулі імпортуються лише при першому використанні.
+PARSERS = {
+    "claude": "parsing.parsers.Claude_parser_htm_to_json:parse_law_html",
+    "chatgpt": "parsing.parsers.ChatGPT_parser_htm_to_json:parse_law_html",
+    "google": "parsing.parsers.Google_AI_Studio_parser_htm_to_json:parse_npa_html",
+    # Той самий розбір; великий div#article ділиться по розділах між процесами
+    "google-parallel": "parsing.parsers.Google_AI_Studio_parser_htm_to_json:parse_npa_parallel",
+    # Той самий розбір на подіях потокового рушія (parsing.streaming), без дерева
+    "google-stream": "parsing.parsers.Google_AI_Studio_parser_htm_to_json:parse_npa_stream",
+    "gitcopilot": "parsing.parsers.GitCopilot_parser_htm_to_json:parse_html_file",
+    # Одне дерево для всіх парсерів, блоки — за більшістю голосів (parsing.shared)
+    "consensus": "parsing.shared:parse_consensus",
+}
+
+# Парсери, що вміють віддавати блоки потоком: першим — метадані, далі блоки.
+# Потоковий рушій вмикається лише явно, назвою парсера; "google" розбирає
+# деревом BeautifulSoup.
+STREAM_PARSERS = {
+    "google-stream": "parsing.parsers.Google_AI_Studio_parser_htm_to_json:iter_npa_stream",
+}
+
+# Ті самі парсери над уже побудованим деревом BeautifulSoup: функція
+# приймає (soup, шлях) і повертає такий самий dict. Дерево не змінюється,
+# тож parsing.shared розбирає документ один раз для всіх.
+TREE_PARSERS = {
+    "claude": "parsing.parsers.Claude_parser_htm_to_json:parse_law_tree",
+    "chatgpt": "parsing.parsers.ChatGPT_parser_htm_to_json:parse_law_tree",
+    "google": "parsing.parsers.Google_AI_Studio_parser_htm_to_json:parse_npa_tree",
+    "gitcopilot": "parsing.parsers.GitCopilot_parser_htm_to_json:parse_html_tree",
+}
+
+
+def register_parser(name, target, stream_target=None, tree_target=None):
+    """Register a parser backend given as "module:function" (plus optional stream/tree variants)."""
+    PARSERS[name] = target
+    if stream_target is not None:
+        STREAM_PARSERS[name] = stream_target
+    if tree_target is not None:
+        TREE_PARSERS[name] = tree_target
+
+
+def _load(target):
+    module_name, function_name = target.split(":")
+    return importlib.import_module(module_name), function_name
+
+
+def get_parser(name):
+    try:
+        target = PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Невідомий парсер '{name}', доступні: {', '.join(PARSERS)}") from None
+    module, function_name = _load(target)
+    return getattr(module, function_name)
+
+
+def get_parser_version(name):
+    module, _ = _load(PARSERS[name])
+    return getattr(module, "PARSER_VERSION", "0")
+
+
+def get_stream_parser(name):
+    if name not in STREAM_PARSERS:
+        return None
+    module, function_name = _load(STREAM_PARSERS[name])
+    return getattr(module, function_name)
+
+
+def get_tree_parser(name):
+    if name not in TREE_PARSERS:
+        raise ValueError(f"Парсер '{name}' не вміє працювати зі спільним деревом, доступні: {', '.join(TREE_PARSERS)}")
+    module, function_name = _load(TREE_PARSERS[name])
+    return getattr(module, function_name)
+
+
+def parse(path, parser="claude"):
+    """Parse one law file with the named backend and return a LawDocument."""
+    law_data = get_parser(parser)(path)
+    if law_data is None:
+        raise ValueError(f"Парсер '{parser}' не повернув результат для '{path}'")
+    timer = stages()
+    document = LawDocument.from_dict(law_data)
+    timer.mark("model")
+    return document
+
+
+def iter_parse(path, parser="claude"):
+    """Yield the metadata dict and then content blocks as model objects.
+
+    Backends without a stream variant are parsed in full first.
+    """
+    stream_parser = get_stream_parser(parser)
+    if stream_parser is None:
+        document = parse(path, parser)
+        yield document.metadata()
+        yield from document.content
+        return
+    blocks = stream_parser(path)
+    yield next(blocks)
+    for block in blocks:
+        yield block_from_dict(block)
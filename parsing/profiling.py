@@ -0,0 +1,174 @@
+import contextvars
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+
+# Інструментування етапів розбору: load (читання файла), dom (побудова
+# дерева), article (пошук div#article), classify (обхід і класифікація
+# блоків), model (перетворення в LawDocument), serialize (запис виводу).
+#
+# Парсер ставить позначки кінця етапу:
+#
+#     timer = stages()
+#     soup = BeautifulSoup(...)
+#     timer.mark("dom")
+#
+# Час (і, якщо увімкнено tracemalloc, пам'ять) з попередньої позначки
+# зараховується названому етапу. Без активного StageRecorder stages()
+# повертає порожній секундомір, тож у звичайному запуску ціна — один
+# ContextVar.get() на файл.
+
+_recorder = contextvars.ContextVar("stage_recorder", default=None)
+
+METRIC_PREFIX = "lawparse"
+
+
+class _NullStopwatch:
+    def mark(self, name):
+        pass
+
+
+NULL_STOPWATCH = _NullStopwatch()
+
+
+class Stopwatch:
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self._start()
+
+    def _start(self):
+        self.memory = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.started = time.perf_counter()
+
+    def mark(self, name):
+        seconds = time.perf_counter() - self.started
+        allocated = peak = None
+        if self.memory is not None:
+            current, peak_memory = tracemalloc.get_traced_memory()
+            allocated, peak = current - self.memory, peak_memory - self.memory
+        self.recorder.add(name, seconds, allocated, peak)
+        self._start()
+
+
+def stages():
+    """Stopwatch for the active recorder, or a no-op one."""
+    recorder = _recorder.get()
+    return NULL_STOPWATCH if recorder is None else Stopwatch(recorder)
+
+
+class StageRecorder:
+    """Per-stage totals: seconds, calls and (with tracemalloc) net/peak bytes."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, seconds, allocated=None, peak=None):
+        stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+        stage["seconds"] += seconds
+        stage["calls"] += 1
+        if allocated is not None:
+            stage["allocated_bytes"] = stage.get("allocated_bytes", 0) + allocated
+            stage["peak_bytes"] = max(stage.get("peak_bytes", 0), peak)
+
+    def __enter__(self):
+        self._token = _recorder.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _recorder.reset(self._token)
+
+
+def profile_call(function, *args, allocations=False, dump_prefix=None, **kwargs):
+    """Run function under a StageRecorder; returns (result, {"seconds", "stages"}).
+
+    allocations turns on tracemalloc for per-stage byte counts. dump_prefix
+    additionally writes <prefix>.prof (cProfile) and, with allocations,
+    <prefix>.tracemalloc.txt (top allocation sites).
+    """
+    started_tracing = allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if dump_prefix else None
+    started = time.perf_counter()
+    try:
+        with StageRecorder() as recorder:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        if dump_prefix:
+            os.makedirs(os.path.dirname(dump_prefix) or ".", exist_ok=True)
+            profiler.dump_stats(dump_prefix + ".prof")
+            if allocations:
+                top = tracemalloc.take_snapshot().statistics("lineno")[:50]
+                with open(dump_prefix + ".tracemalloc.txt", "w", encoding="utf-8") as f:
+                    f.write("\n".join(str(stat) for stat in top) + "\n")
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return result, {"seconds": time.perf_counter() - started, "stages": recorder.stages}
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def metrics_to_prometheus(records):
+    """Prometheus text exposition of [{"file", "parser", "seconds", "stages"}]."""
+    series = {
+        "stage_seconds": ("gauge", "Time spent in a parsing stage", "seconds"),
+        "stage_calls": ("gauge", "Number of times a parsing stage ran", "calls"),
+        "stage_allocated_bytes": ("gauge", "Net bytes allocated in a parsing stage", "allocated_bytes"),
+        "stage_peak_bytes": ("gauge", "Peak traced memory above the stage start", "peak_bytes"),
+    }
+    lines = []
+    for metric, (kind, help_text, key) in series.items():
+        samples = []
+        for record in records:
+            for stage, values in record["stages"].items():
+                if key in values:
+                    labels = (f'parser="{_label_value(record["parser"])}",'
+                              f'file="{_label_value(record["file"])}",stage="{_label_value(stage)}"')
+                    samples.append(f"{METRIC_PREFIX}_{metric}{{{labels}}} {values[key]}")
+        if samples:
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+            lines.extend(samples)
+    lines.append(f"# HELP {METRIC_PREFIX}_file_seconds Total conversion time of a file")
+    lines.append(f"# TYPE {METRIC_PREFIX}_file_seconds gauge")
+    for record in records:
+        labels = f'parser="{_label_value(record["parser"])}",file="{_label_value(record["file"])}"'
+        lines.append(f"{METRIC_PREFIX}_file_seconds{{{labels}}} {record['seconds']}")
+    return "\n".join(lines) + "\n"
+
+
+def summarize_stages(records):
+    """Stage totals per parser across files."""
+    totals = {}
+    for record in records:
+        parser_totals = totals.setdefault(record["parser"], {})
+        for stage, values in record["stages"].items():
+            total = parser_totals.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            total["seconds"] += values["seconds"]
+            total["calls"] += values["calls"]
+            if "allocated_bytes" in values:
+                total["allocated_bytes"] = total.get("allocated_bytes", 0) + values["allocated_bytes"]
+                total["peak_bytes"] = max(total.get("peak_bytes", 0), values["peak_bytes"])
+    return totals
+
+
+def write_metrics(records, path):
+    """JSON ({"files", "totals"}) or, for a .prom path, Prometheus text."""
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".prom"):
+            f.write(metrics_to_prometheus(records))
+        else:
+            json.dump({"files": records, "totals": summarize_stages(records)}, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,176 @@
+import collections
+import json
+import mmap
+import os
+
+from .output import METADATA_TYPE
+from .structure import StructureIndexer, load_index
+
+# Читання перетвореного закону без розбору всього файла. NDJSON-вивід
+# відображається в пам'ять; метадані — це перший рядок, а "offsets" з
+# *.index.json (convert --format ndjson --index) дають байтовий діапазон
+# будь-якого блоку, тож стаття чи діапазон блоків декодуються окремо.
+# Без індексу (або якщо він не відповідає файлу) зміщення знаходяться
+# пошуком переносів рядка, а структура — одним проходом, лише коли її
+# вперше запитали.
+
+
+class LawReader:
+    """Random access to the blocks of a converted NDJSON law."""
+
+    def __init__(self, path, index=None):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.size = size
+        header_end = self.data.find(b"\n")
+        self.header_end = size if header_end == -1 else header_end + 1
+        self._index = index
+        self._offsets = None
+        self._structure = None
+        self._metadata = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    @property
+    def metadata(self):
+        """Header fields (title, law_number, ...); only the first line is decoded."""
+        if self._metadata is None:
+            header = json.loads(self.data[:self.header_end]) if self.header_end else None
+            if not isinstance(header, dict) or header.get("type") != METADATA_TYPE:
+                raise ValueError(f"'{self.path}' не є NDJSON-виводом convert (--format ndjson)")
+            header.pop("type")
+            self._metadata = header
+        return dict(self._metadata)
+
+    def _saved_index(self):
+        if self._index is None:
+            try:
+                self._index = load_index(self.path)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    @property
+    def offsets(self):
+        """Byte offset of every block plus the end of the last one."""
+        if self._offsets is None:
+            offsets = self._saved_index().get("offsets")
+            # Індекс від іншої версії файла не годиться
+            if not offsets or offsets[0] != self.header_end or offsets[-1] != self.size:
+                offsets = self._scan_offsets()
+            self._offsets = offsets
+        return self._offsets
+
+    def _scan_offsets(self):
+        offsets = [self.header_end]
+        position = self.header_end
+        while position < self.size:
+            end = self.data.find(b"\n", position)
+            position = self.size if end == -1 else end + 1
+            offsets.append(position)
+        return offsets
+
+    @property
+    def structure(self):
+        """{"articles": ..., "sections": ...} index entries, as in *.index.json."""
+        if self._structure is None:
+            index = self._saved_index()
+            offsets = self.offsets
+            if index.get("offsets") == offsets:
+                self._structure = index
+            else:
+                indexer = StructureIndexer()
+                for position in range(len(self)):
+                    indexer.add(self._block(position), offsets[position], offsets[position + 1])
+                self._structure = indexer.finish()
+        return self._structure
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _block(self, position):
+        offsets = self.offsets
+        return json.loads(self.data[offsets[position]:offsets[position + 1]])
+
+    def iter_blocks(self, start=0, stop=None):
+        """Decode blocks [start, stop) one at a time."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for position in range(start, stop):
+            yield self._block(position)
+
+    def blocks(self, start=0, stop=None):
+        return list(self.iter_blocks(start, stop))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("Крок зрізу не підтримується")
+            return self.blocks(key.start, key.stop)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(f"Блоку {key} немає")
+        return self._block(key)
+
+    def __iter__(self):
+        return self.iter_blocks()
+
+    def articles(self):
+        return list(self.structure["articles"])
+
+    def sections(self):
+        return list(self.structure["sections"])
+
+    def article(self, number):
+        entry = self.structure["articles"].get(str(number))
+        if entry is None:
+            raise KeyError(f"Статтю {number} не знайдено")
+        return self.blocks(*entry["blocks"])
+
+    def section(self, path):
+        entry = self.structure["sections"].get(path)
+        if entry is None:
+            raise KeyError(f"Розділ '{path}' не знайдено")
+        return self.blocks(*entry["blocks"])
+
+
+class ReaderCache:
+    """Keep recently used readers open; a file changed on disk is reopened."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.readers = collections.OrderedDict()  # шлях -> ((mtime, size), LawReader)
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.readers.get(path)
+        if cached is not None and cached[0] == signature:
+            self.readers.move_to_end(path)
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        reader = LawReader(path)
+        self.readers[path] = (signature, reader)
+        self.readers.move_to_end(path)
+        while len(self.readers) > self.maxsize:
+            _, (_, oldest) = self.readers.popitem(last=False)
+            oldest.close()
+        return reader
+
+    def close(self):
+        for _, reader in self.readers.values():
+            reader.close()
+        self.readers.clear()
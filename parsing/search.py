@@ -0,0 +1,275 @@
+import functools
+import os
+import re
+import sqlite3
+import time
+
+from .chunking import CHUNKS_SUFFIX
+from .diff import load_document
+from .manifest import parse_document_id
+from .output import EXTENSIONS
+from .structure import enter_section, path_label, structural_key, text_units
+
+# Повнотекстовий пошук по перетворених законах (SQLite FTS5).
+# Індекс будується з виводу convert (.json / .ndjson / .msgpack / .cbor): кожен блок — окремий
+# запис із законом, статтею, шляхом розділу і номером блоку. FTS5 не дає
+# підключити власний токенізатор із Python, тому текст заздалегідь
+# розбивається і стемиться тут (українські закінчення), а в FTS5 потрапляє
+# рядок основ; запит обробляється тим самим стемером. Закон переіндексується
+# лише коли змінився його файл, без перебудови всього корпусу.
+
+SEARCH_FILENAME = "search.sqlite"
+OUTPUT_EXTENSIONS = tuple(sorted(set(EXTENSIONS.values())))
+
+TOKEN_RE = re.compile(r"[0-9A-Za-zА-Яа-яІіЇїЄєҐґ'’ʼ-]+")
+APOSTROPHES_RE = re.compile(r"['’ʼ]")
+QUERY_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+# Закінчення та суфікси словозміни, від довших до коротших
+SUFFIXES = sorted({
+    # віддієслівні іменники та дієприкметники
+    "ування", "ювання", "уванням", "уванні", "ання", "ення", "іння", "анням", "енням", "анні", "енні",
+    "ень", "ованого", "ованої", "ованим", "ований", "ована", "оване", "овані",
+    # дієслова
+    "ається", "яється", "ються", "ується", "увати", "ювати", "ували", "ував", "ати", "яти", "ити",
+    "іти", "ать", "ять", "уть", "ють", "ить", "ено", "ано", "ться", "лися", "ала", "ало", "али",
+    "ила", "или", "ило", "ся",
+    # прикметники
+    "ими", "ого", "ому", "ої", "ою", "ій", "ий", "им", "их", "ім", "іх", "ая", "яя", "ее",
+    # іменники
+    "ості", "ість", "остю", "істю", "ія", "ії", "ію", "ією", "іям", "іями", "іях", "ами", "ями",
+    "ові", "еві", "єві", "ах", "ях", "ам", "ям", "ею", "єю", "ом", "ем", "ів", "їв", "ей",
+    "ь", "а", "я", "о", "е", "є", "у", "ю", "і", "ї", "и", "й",
+}, key=len, reverse=True)
+# Перевірка "закінчення довжини n" — один пошук у множині замість перебору списку
+SUFFIXES_BY_LENGTH = [(n, {suffix for suffix in SUFFIXES if len(suffix) == n})
+                      for n in sorted({len(suffix) for suffix in SUFFIXES}, reverse=True)]
+MIN_STEM = 3
+# Змінюється разом зі стемером: старі основи в індексі стають непридатними
+STEMMER_VERSION = "1"
+
+
+@functools.lru_cache(maxsize=200_000)
+def stem(word):
+    """Light Ukrainian stemmer: strip the longest inflectional ending."""
+    word = APOSTROPHES_RE.sub("", word.lower())
+    if len(word) <= MIN_STEM or not word.isalpha():
+        return word
+    for n, suffixes in SUFFIXES_BY_LENGTH:
+        if len(word) - n >= MIN_STEM and word[-n:] in suffixes:
+            return word[:-n]
+    return word
+
+
+def tokenize(text):
+    return [stem(token) for token in TOKEN_RE.findall(text) if token.strip("-'’ʼ")]
+
+
+def build_match(query):
+    """FTS5 MATCH expression: every word (or "quoted phrase") must occur, stemmed."""
+    terms = []
+    for phrase, word in QUERY_RE.findall(query):
+        tokens = tokenize(phrase or word)
+        if tokens:
+            terms.append('"' + " ".join(tokens).replace('"', "") + '"')
+    return " ".join(terms)
+
+
+def output_document(path):
+    """(document, revision) of a convert output file, from its rada file name."""
+    stem_path = path
+    for extension in sorted(set(EXTENSIONS.values()), key=len, reverse=True):
+        if path.endswith(extension):
+            stem_path = path[:-len(extension)]
+            break
+    document_id, revision = parse_document_id(stem_path + ".htm")
+    if document_id is None:
+        return os.path.abspath(stem_path), ""
+    return document_id, revision
+
+
+def find_output_files(root):
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            # *.tree.json і *.index.json не містять плаского content, а *.chunks.ndjson —
+            # фрагменти вже врахованого закону
+            if filename.endswith((".tree.json", ".index.json", CHUNKS_SUFFIX)):
+                continue
+            if filename.endswith(OUTPUT_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return found
+
+
+class SearchIndex:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                document TEXT PRIMARY KEY,
+                revision TEXT NOT NULL,
+                title TEXT,
+                law_number TEXT,
+                source_path TEXT NOT NULL,
+                source_mtime REAL NOT NULL,
+                indexed_at REAL NOT NULL,
+                first_block INTEGER,
+                last_block INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS blocks (
+                id INTEGER PRIMARY KEY,
+                document TEXT NOT NULL,
+                block_index INTEGER NOT NULL,
+                type TEXT,
+                article TEXT,
+                path TEXT,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS blocks_by_document ON blocks (document);
+            CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT);
+            -- Без власної копії основ: текст уже є в blocks, а основи для
+            -- видалення з індексу перераховуються тим самим стемером
+            CREATE VIRTUAL TABLE IF NOT EXISTS blocks_fts USING fts5(stems, content = '', tokenize = 'unicode61');
+        """)
+        row = self.connection.execute("SELECT value FROM settings WHERE key = 'stemmer'").fetchone()
+        if row is not None and row[0] != STEMMER_VERSION:
+            raise RuntimeError(f"Індекс '{path}' побудовано іншою версією стемера; видаліть його і переіндексуйте")
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO settings VALUES ('stemmer', ?)", (STEMMER_VERSION,))
+
+    def is_fresh(self, document, revision, path):
+        row = self.connection.execute(
+            "SELECT revision, source_path, source_mtime FROM documents WHERE document = ?",
+            (document,)).fetchone()
+        if row is None:
+            return False
+        if row[0] > revision:
+            return True  # уже проіндексовано новішу редакцію
+        return row[0] == revision and row[1] == os.path.abspath(path) and row[2] == os.path.getmtime(path)
+
+    def index_document(self, document, revision, law_data, path=None):
+        """Replace the indexed blocks of one law; returns the number of blocks indexed."""
+        rows = []
+        section_path = []
+        article = None
+        for position, block in enumerate(law_data["content"]):
+            key = structural_key(block)
+            if key is not None:
+                kind, number = key
+                if kind == "article":
+                    article = number
+                else:
+                    section_path = enter_section(section_path, kind, number)
+                    article = None
+            text = "\n".join(text_units(block))
+            if text.strip():
+                rows.append((position, block.get("type"), article,
+                             path_label(section_path), text))
+        with self.connection:
+            self._delete(document)
+            # Блоки закону отримують суцільний діапазон id: фільтр за законом
+            # у пошуку — це діапазон rowid, який FTS5 відсікає сам
+            first_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM blocks").fetchone()[0]
+            self.connection.execute(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (document, revision, law_data.get("title"), law_data.get("law_number"),
+                 os.path.abspath(path) if path else "", os.path.getmtime(path) if path else 0, time.time(),
+                 first_id, first_id + len(rows) - 1))
+            self.connection.executemany(
+                "INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((first_id + i, document) + row for i, row in enumerate(rows)))
+            self.connection.executemany(
+                "INSERT INTO blocks_fts (rowid, stems) VALUES (?, ?)",
+                ((first_id + i, " ".join(tokenize(row[-1]))) for i, row in enumerate(rows)))
+        return len(rows)
+
+    def _delete(self, document):
+        old = self.connection.execute("SELECT id, text FROM blocks WHERE document = ?", (document,)).fetchall()
+        self.connection.executemany(
+            "INSERT INTO blocks_fts (blocks_fts, rowid, stems) VALUES ('delete', ?, ?)",
+            ((block_id, " ".join(tokenize(text))) for block_id, text in old))
+        self.connection.execute("DELETE FROM blocks WHERE document = ?", (document,))
+        self.connection.execute("DELETE FROM documents WHERE document = ?", (document,))
+
+    def remove_document(self, document):
+        with self.connection:
+            self._delete(document)
+
+    def search(self, query, limit=20, document=None, by_article=False):
+        """Best-matching blocks (bm25), or articles when by_article is set."""
+        match = build_match(query)
+        if not match:
+            return []
+        # Спершу найкращі rowid з самого FTS (rank = bm25), потім — дані блоків
+        fts = "SELECT rowid, rank FROM blocks_fts WHERE blocks_fts MATCH ?"
+        params = [match]
+        if document is not None:
+            row = self.connection.execute(
+                "SELECT first_block, last_block FROM documents WHERE document = ?", (document,)).fetchone()
+            if row is None:
+                return []
+            fts += " AND rowid BETWEEN ? AND ?"
+            params.extend(row)
+        fts += " ORDER BY rank LIMIT ?"
+        # bm25() не можна агрегувати в SQL, тож статті групуються тут, по
+        # впорядкованих збігах блоків
+        params.append(limit * 10 if by_article else limit)
+        sql = ("SELECT b.document, d.title, d.revision, b.block_index, b.type, b.article, b.path, b.text,"
+               " hits.rank FROM (" + fts + ") AS hits"
+               " JOIN blocks b ON b.id = hits.rowid"
+               " JOIN documents d ON d.document = b.document"
+               " ORDER BY hits.rank")
+        hits = []
+        articles = {}
+        for row in self.connection.execute(sql, params):
+            hit = {"document": row[0], "title": row[1], "revision": row[2], "block_index": row[3],
+                   "type": row[4], "article": row[5], "path": row[6], "text": row[7], "score": row[8]}
+            if not by_article:
+                hits.append(hit)
+                continue
+            key = (hit["document"], hit["article"], hit["path"])
+            if key in articles:
+                articles[key]["hits"] += 1
+            elif len(hits) < limit:
+                hit["hits"] = 1
+                articles[key] = hit
+                hits.append(hit)
+        return hits
+
+    def stats(self):
+        documents, = self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()
+        blocks, = self.connection.execute("SELECT COUNT(*) FROM blocks").fetchone()
+        return {"documents": documents, "blocks": blocks}
+
+    def close(self):
+        self.connection.close()
+
+
+def index_directory(root, index, force=False, report=print):
+    """Index every converted law under root, newest revision per document.
+
+    Returns {path: number of blocks, None (unchanged/older revision) or exception}.
+    """
+    newest = {}
+    for path in find_output_files(root):
+        document, revision = output_document(path)
+        if document not in newest or newest[document][0] < revision:
+            newest[document] = (revision, path)
+    results = {}
+    for document, (revision, path) in newest.items():
+        if not force and index.is_fresh(document, revision, path):
+            results[path] = None
+            continue
+        try:
+            count = index.index_document(document, revision, load_document(path), path)
+        except Exception as e:
+            results[path] = e
+            report(f"❌ {path}: {e}")
+            continue
+        results[path] = count
+        report(f"✅ {path}: {count} блоків")
+    return results
@@ -0,0 +1,116 @@
+import json
+
+# Серіалізатори виводу.
+#
+# Текстові бекенди пишуть той самий JSON байт у байт: json — стандартна
+# бібліотека, orjson — у кілька разів швидше (якщо встановлено; відступ
+# лише 2). Вибір бекенда не змінює файлів, тож кеш конвертацій від нього
+# не залежить.
+#
+# Бінарні формати msgpack і cbor пишуть закон як
+#   ["lawpack", версія, таблиця рядків, дані]
+# де ключі словників і значення повторюваних полів (INTERNED_FIELDS) замінено
+# номерами рядків у таблиці: "type", "paragraph", "unordered" чи номер
+# закону зберігаються у файлі один раз. Решта значень — як є.
+
+SERIALIZERS = ("json", "orjson")
+BINARY_FORMATS = ("msgpack", "cbor")
+LAWPACK_MAGIC = "lawpack"
+LAWPACK_VERSION = 1
+# Поля, значення яких (рядки) теж беруться з таблиці
+INTERNED_FIELDS = frozenset(("type", "list_type", "law_number", "law_date"))
+
+
+def _import(name):
+    try:
+        return __import__(name)
+    except ImportError:
+        raise RuntimeError(f"Для цього формату потрібен {name}: pip install {name}") from None
+
+
+def json_dumps(serializer="json"):
+    """dumps(value, indent=None) -> str of a text backend; no indent means compact."""
+    if serializer == "json":
+        def dumps(value, indent=None):
+            if indent is None:
+                return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+            return json.dumps(value, ensure_ascii=False, indent=indent)
+        return dumps
+    if serializer == "orjson":
+        orjson = _import("orjson")
+
+        def dumps(value, indent=None):
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+        return dumps
+    raise ValueError(f"Невідомий серіалізатор '{serializer}', доступні: {', '.join(SERIALIZERS)}")
+
+
+def json_loads(serializer="json"):
+    """loads(str or bytes) of a text backend."""
+    if serializer == "json":
+        return json.loads
+    if serializer == "orjson":
+        return _import("orjson").loads
+    raise ValueError(f"Невідомий серіалізатор '{serializer}', доступні: {', '.join(SERIALIZERS)}")
+
+
+def intern_law(law_data):
+    """The lawpack envelope of a law dict (see the module comment)."""
+    table = {}
+
+    def index(string):
+        return table.setdefault(string, len(table))
+
+    def pack(value):
+        if isinstance(value, dict):
+            return {index(key): index(item) if key in INTERNED_FIELDS and isinstance(item, str) else pack(item)
+                    for key, item in value.items()}
+        if isinstance(value, list):
+            return [pack(item) for item in value]
+        return value
+
+    data = pack(law_data)
+    return [LAWPACK_MAGIC, LAWPACK_VERSION, list(table), data]
+
+
+def restore_law(envelope):
+    """Inverse of intern_law."""
+    if not isinstance(envelope, list) or len(envelope) != 4 or envelope[0] != LAWPACK_MAGIC:
+        raise ValueError("Дані не у форматі lawpack")
+    if envelope[1] != LAWPACK_VERSION:
+        raise ValueError(f"Непідтримувана версія lawpack {envelope[1]}")
+    strings = envelope[2]
+
+    def unpack(value):
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                key = strings[key]
+                result[key] = strings[item] if key in INTERNED_FIELDS and isinstance(item, int) else unpack(item)
+            return result
+        if isinstance(value, list):
+            return [unpack(item) for item in value]
+        return value
+
+    return unpack(envelope[3])
+
+
+def dumps_binary(law_data, fmt):
+    """A law dict as msgpack or CBOR bytes with interned strings."""
+    envelope = intern_law(law_data)
+    if fmt == "msgpack":
+        return _import("msgpack").packb(envelope, use_bin_type=True)
+    if fmt == "cbor":
+        return _import("cbor2").dumps(envelope)
+    raise ValueError(f"Невідомий бінарний формат '{fmt}', доступні: {', '.join(BINARY_FORMATS)}")
+
+
+def loads_binary(data, fmt):
+    if fmt == "msgpack":
+        # Ключі словників — номери рядків, а не рядки
+        envelope = _import("msgpack").unpackb(data, raw=False, strict_map_key=False)
+    elif fmt == "cbor":
+        envelope = _import("cbor2").loads(data)
+    else:
+        raise ValueError(f"Невідомий бінарний формат '{fmt}', доступні: {', '.join(BINARY_FORMATS)}")
+    return restore_law(envelope)
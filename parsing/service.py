@@ -0,0 +1,323 @@
+import io
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .output import dumps_compact, write_ndjson
+from .parsers import PARSERS, get_parser, parse
+from .profiling import METRIC_PREFIX
+
+# Постійний сервіс перетворення: процеси-воркери запускаються один раз,
+# імпортують парсери (bs4, скомпільовані шаблони) і розбирають крихітний
+# документ, тож запит коштує лише сам розбір. Слухає HTTP на localhost або
+# Unix-сокет.
+#
+#   POST /convert?parser=claude&format=json      тіло — HTML закону
+#   POST /convert?parser=google&format=ndjson&path=<шлях відносно --root>
+#   GET  /health                                 стан пулу, JSON
+#   GET  /metrics                                лічильники, формат Prometheus
+#
+# Одночасно розбирається стільки документів, скільки воркерів; ще queue
+# запитів чекають у черзі, решта одразу отримує 503 з Retry-After.
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE = 64
+DEFAULT_TIMEOUT = 60
+MAX_BODY_BYTES = 64 * 1024 * 1024
+SERVICE_FORMATS = ("json", "ndjson")
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Тимчасові файли для тіла запиту — в пам'яті, де це можливо
+SPOOL_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+WARMUP_HTML = (b'<html><head><meta charset="utf-8"><title>Warmup - \xd0\x97\xd0\xb0\xd0\xba\xd0\xbe\xd0\xbd'
+               b' \xe2\x84\x96 1-IX \xd0\xb2\xd1\x96\xd0\xb4 01.01.2024</title></head><body>'
+               b'<div id="article"><p class=rvps7><span class=rvts15>\xd0\xa0\xd0\xbe\xd0\xb7\xd0\xb4\xd1\x96\xd0\xbb'
+               b' I</span></p><p class=rvps2>1) warmup;</p></div></body></html>')
+
+
+def _warm(parsers):
+    """Worker initializer: import the backends and run each once."""
+    with tempfile.NamedTemporaryFile(suffix=".htm", dir=SPOOL_DIR, delete=False) as f:
+        f.write(WARMUP_HTML)
+    try:
+        for name in parsers:
+            get_parser(name)
+            try:
+                parse(f.name, name)
+            except Exception:
+                pass  # прогрів — не перевірка; помилка проявиться в запиті
+    finally:
+        os.unlink(f.name)
+
+
+def _ping():
+    return os.getpid()
+
+
+def convert_document(parser_name, fmt, path=None, data=None):
+    """Worker: convert a file (or HTML bytes) and return the serialized output bytes."""
+    spooled = None
+    if data is not None:
+        with tempfile.NamedTemporaryFile(suffix=".htm", dir=SPOOL_DIR, delete=False) as f:
+            f.write(data)
+        spooled = path = f.name
+    try:
+        law_data = parse(path, parser_name).to_dict()
+    finally:
+        if spooled is not None:
+            os.unlink(spooled)
+    if fmt == "ndjson":
+        buffer = io.StringIO()
+        write_ndjson(law_data, law_data["content"], buffer)
+        return buffer.getvalue().encode("utf-8")
+    return dumps_compact(law_data).encode("utf-8")
+
+
+class ServiceBusy(Exception):
+    pass
+
+
+class ConversionService:
+    """Warm process pool with bounded admission and request metrics."""
+
+    def __init__(self, jobs=None, queue=DEFAULT_QUEUE, parsers=None, timeout=DEFAULT_TIMEOUT, root=None):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.queue = queue
+        self.parsers = list(parsers or PARSERS)
+        self.timeout = timeout
+        self.root = os.path.realpath(root) if root else None
+        self.slots = threading.BoundedSemaphore(self.jobs + queue)
+        self.lock = threading.Lock()
+        self.outstanding = 0
+        self.started = time.time()
+        self.requests = {}  # (parser, status) -> кількість
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.restarts = 0
+        self.pool = self._start_pool()
+
+    def _start_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_warm, initargs=(self.parsers,))
+        # Усі воркери стартують і прогріваються зараз, а не на першому запиті
+        for future in [pool.submit(_ping) for _ in range(self.jobs)]:
+            future.result()
+        return pool
+
+    def resolve(self, path):
+        """Absolute path of a requested file; it must lie under root."""
+        if self.root is None:
+            raise PermissionError("Сервіс запущено без --root: шляхи до файлів не приймаються")
+        resolved = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([resolved, self.root]) != self.root:
+            raise PermissionError(f"Шлях '{path}' поза {self.root}")
+        if not os.path.isfile(resolved):
+            raise FileNotFoundError(f"Файл '{path}' не знайдено")
+        return resolved
+
+    def convert(self, parser_name, fmt, path=None, data=None):
+        if not self.slots.acquire(blocking=False):
+            raise ServiceBusy(f"Черга заповнена ({self.jobs} у роботі, {self.queue} в черзі)")
+        with self.lock:
+            self.outstanding += 1
+        pool = self.pool
+        try:
+            try:
+                future = pool.submit(convert_document, parser_name, fmt, path, data)
+            except BaseException:
+                self._release()
+                raise
+            # Місце звільняється, коли воркер справді закінчив: після 504 розбір
+            # триває і далі займає воркер
+            future.add_done_callback(self._release)
+            return future.result(self.timeout)
+        except BrokenProcessPool:
+            # Воркер упав (пам'ять, сигнал): пул перезапускається для наступних запитів
+            with self.lock:
+                if self.pool is pool:
+                    self.pool = self._start_pool()
+                    self.restarts += 1
+            raise
+
+    def _release(self, future=None):
+        with self.lock:
+            self.outstanding -= 1
+        self.slots.release()
+
+    def record(self, parser_name, status, seconds):
+        with self.lock:
+            key = (parser_name or "", status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency_sum += seconds
+            self.latency_count += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.latency_buckets[i] += 1
+
+    def health(self):
+        with self.lock:
+            outstanding = self.outstanding
+        return {
+            "status": "ok",
+            "workers": self.jobs,
+            "in_flight": min(outstanding, self.jobs),
+            "queued": max(outstanding - self.jobs, 0),
+            "queue_limit": self.queue,
+            "parsers": self.parsers,
+            "uptime": time.time() - self.started,
+            "requests": sum(self.requests.values()),
+            "restarts": self.restarts,
+        }
+
+    def metrics(self):
+        """Prometheus text exposition of the service counters."""
+        health = self.health()
+        prefix = METRIC_PREFIX + "_service"
+        lines = [
+            f"# HELP {prefix}_requests_total Conversion requests by parser and HTTP status",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        with self.lock:
+            for (parser_name, status), count in sorted(self.requests.items()):
+                lines.append(f'{prefix}_requests_total{{parser="{parser_name}",status="{status}"}} {count}')
+            lines.append(f"# HELP {prefix}_request_seconds Conversion request latency")
+            lines.append(f"# TYPE {prefix}_request_seconds histogram")
+            for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets):
+                lines.append(f'{prefix}_request_seconds_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{prefix}_request_seconds_bucket{{le="+Inf"}} {self.latency_count}')
+            lines.append(f"{prefix}_request_seconds_sum {self.latency_sum}")
+            lines.append(f"{prefix}_request_seconds_count {self.latency_count}")
+        for name, help_text in (("workers", "Worker processes"), ("in_flight", "Documents being converted"),
+                                ("queued", "Requests waiting for a worker"), ("restarts", "Worker pool restarts"),
+                                ("uptime", "Seconds since start")):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {health[name]}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+    default_parser = "claude"
+    max_body = MAX_BODY_BYTES
+    # Keep-alive: клієнт ingestion тримає одне з'єднання на всі документи
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send(status, dumps_compact({"error": message}).encode("utf-8"))
+
+    def do_GET(self):
+        route = urlsplit(self.path).path
+        if route == "/health":
+            self._send(200, json.dumps(self.service.health(), ensure_ascii=False).encode("utf-8"))
+        elif route == "/metrics":
+            self._send(200, self.service.metrics().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_error(404, "Невідома адреса")
+
+    def do_POST(self):
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parser_name = query.get("parser", self.default_parser)
+        status = self._convert(url.path, query, parser_name)
+        self.service.record(parser_name if parser_name in PARSERS else "", status, time.perf_counter() - started)
+
+    def _convert(self, route, query, parser_name):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.max_body:
+            self._send_error(413, f"Тіло запиту більше за {self.max_body} байт")
+            self.close_connection = True
+            return 413
+        data = self.rfile.read(length) if length else None
+        fmt = query.get("format", "json")
+        if route != "/convert":
+            self._send_error(404, "Невідома адреса")
+            return 404
+        if parser_name not in self.service.parsers:
+            self._send_error(400, f"Невідомий парсер '{parser_name}', доступні: {', '.join(self.service.parsers)}")
+            return 400
+        if fmt not in SERVICE_FORMATS:
+            self._send_error(400, f"Невідомий формат '{fmt}', доступні: {', '.join(SERVICE_FORMATS)}")
+            return 400
+        path = None
+        try:
+            if "path" in query:
+                path = self.service.resolve(query["path"])
+                data = None
+            elif not data:
+                self._send_error(400, "Потрібне тіло запиту з HTML або параметр path")
+                return 400
+            body = self.service.convert(parser_name, fmt, path, data)
+        except PermissionError as e:
+            status, message = 403, str(e)
+        except FileNotFoundError as e:
+            status, message = 404, str(e)
+        except ServiceBusy as e:
+            status, message = 503, str(e)
+        except TimeoutError:
+            status, message = 504, f"Розбір триває довше за {self.service.timeout} с"
+        except ValueError as e:
+            status, message = 422, str(e)
+        except Exception as e:
+            status, message = 500, f"{type(e).__name__}: {e}"
+        else:
+            self._send(200, body, CONTENT_TYPES[fmt])
+            return 200
+        self._send_error(status, message)
+        return status
+
+    def address_string(self):
+        # Для Unix-сокета client_address — порожній рядок
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)  # сокет від попереднього запуску
+        super().server_bind()
+        self.server_name, self.server_port = "localhost", 0
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT, unix_socket=None, default_parser="claude",
+                max_body=MAX_BODY_BYTES):
+    """HTTP server in front of a ConversionService; a Unix socket path replaces host/port."""
+    handler = type("Handler", (ServiceHandler,), {
+        "service": service,
+        "default_parser": default_parser,
+        "max_body": max_body,
+    })
+    if unix_socket:
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
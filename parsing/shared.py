@@ -0,0 +1,205 @@
+import collections
+import difflib
+import time
+
+from bs4 import BeautifulSoup
+
+from .parsers import TREE_PARSERS, get_parser_version, get_tree_parser
+from .profiling import stages
+from .source import MappedSource
+from .tables import table_grid
+
+# Кілька парсерів над одним деревом: документ читається і розбирається один
+# раз, а кожен парсер лише обходить готовий div#article (парсери дерево не
+# змінюють). Порівняння N парсерів коштує один розбір і N обходів замість
+# N повних розборів.
+#
+# Режим consensus зводить рішення парсерів голосуванням. Вихід кожного
+# парсера розкладається на одиниці тексту (абзац, пункт списку, таблиця) з
+# типом; одиниці інших парсерів вирівнюються з опорним (першим) за текстом
+# без пробілів (difflib), і одиниця потрапляє в результат, якщо її знайшла
+# більшість парсерів. Тип, рівень заголовка, номер і дата посилання —
+# окреме голосування серед парсерів, що знайшли цей текст; парсер, який дав
+# той самий текст двічі поспіль (абзац і заголовок у ньому), голосує за
+# обидва типи. При нічиї — рішення раніше вказаного парсера.
+
+BUILDERS = ("html.parser", "lxml")
+CONSENSUS_PARSERS = ("claude", "chatgpt", "google", "gitcopilot")
+# Заглушки парсерів для ненайдених метаданих у голосуванні не беруть участі
+PLACEHOLDERS = {"", "Без назви", "Без названия", "Название не найдено", "Невідомий номер",
+                "Невідома дата", "Номер не найден", "Дата не найдена", "http://example.com"}
+
+
+def load_tree(path, builder="html.parser"):
+    """BeautifulSoup tree of the whole document, built once."""
+    if builder not in BUILDERS:
+        raise ValueError(f"Невідомий будівник дерева '{builder}', доступні: {', '.join(BUILDERS)}")
+    with MappedSource(path) as source:
+        text = source.text()
+    return BeautifulSoup(text, builder)
+
+
+def run_shared(path, parsers=None, builder="html.parser"):
+    """Parse path once and apply every tree parser.
+
+    Returns ({parser: law dict, None or exception}, {"dom": seconds, parser: seconds}).
+    """
+    parsers = list(parsers or TREE_PARSERS)
+    functions = {name: get_tree_parser(name) for name in parsers}
+    timer = stages()
+    started = time.perf_counter()
+    soup = load_tree(path, builder)
+    timer.mark("dom")
+    timings = {"dom": time.perf_counter() - started}
+    results = {}
+    for name, function in functions.items():
+        started = time.perf_counter()
+        try:
+            results[name] = function(soup, path)
+        except Exception as e:
+            results[name] = e
+        timings[name] = time.perf_counter() - started
+    return results, timings
+
+
+def text_key(text):
+    return "".join(text.split())
+
+
+def law_units(law_data):
+    """(key, label, value, details) per text unit of a parser output."""
+    units = []
+    for block in law_data.get("content") or []:
+        block_type = block.get("type")
+        if block_type == "list":
+            for item in block.get("items") or []:
+                if text_key(item):
+                    units.append((text_key(item), "list_item", item, block.get("list_type")))
+        elif block_type == "table":
+            rows = table_grid(block)
+            key = text_key("".join("".join(row) for row in rows))
+            if key:
+                units.append((key, "table", rows, None))
+        else:
+            text = block.get("text") or ""
+            if not text_key(text):
+                continue
+            if block_type == "heading":
+                details = block.get("level")
+            elif block_type == "reference":
+                details = (block.get("law_number"), block.get("law_date"))
+            else:
+                details = None
+            units.append((text_key(text), block_type, text, details))
+    return units
+
+
+def _vote(values, order):
+    """Most common value; ties go to the value of the earliest voter."""
+    counts = collections.Counter(values)
+    return max(counts, key=lambda value: (counts[value], -order[value]))
+
+
+def _first_seen(values):
+    order = {}
+    for value in values:
+        order.setdefault(value, len(order))
+    return order
+
+
+def _merge_repeats(units):
+    """Group consecutive units with the same text key.
+
+    One element can give a parser two units with the same text, e.g. a
+    paragraph and the heading inside it; they count as one unit found,
+    with both types.
+    """
+    groups = []
+    for unit in units:
+        if groups and groups[-1][0][0] == unit[0]:
+            groups[-1].append(unit)
+        else:
+            groups.append([unit])
+    return groups
+
+
+def consensus(results, quorum=None):
+    """Merge parser outputs by vote; returns (law dict, {parser: {"units", "agreed"}}).
+
+    The first successful parser is the pivot: its units and their order are
+    the candidates. quorum is how many parsers must have found a unit
+    (by default a strict majority of the successful ones).
+    """
+    outputs = {name: data for name, data in results.items() if isinstance(data, dict)}
+    if not outputs:
+        raise ValueError("Жоден парсер не повернув результат")
+    names = list(outputs)
+    quorum = quorum or len(names) // 2 + 1
+    units = {name: _merge_repeats(law_units(outputs[name])) for name in names}
+    pivot = units[names[0]]
+    pivot_keys = [group[0][0] for group in pivot]
+    votes = [[(names[0], group)] for group in pivot]
+    for name in names[1:]:
+        matcher = difflib.SequenceMatcher(None, pivot_keys, [group[0][0] for group in units[name]], autojunk=False)
+        for i, j, size in matcher.get_matching_blocks():
+            for offset in range(size):
+                votes[i + offset].append((name, units[name][j + offset]))
+
+    stats = {name: {"units": len(units[name]), "agreed": 0} for name in names}
+    content = []
+    open_list = None  # список, до якого додаються пункти підряд
+    for unit_votes in votes:
+        if len(unit_votes) < quorum:
+            continue
+        # Текст знайшли достатньо парсерів; тип — окреме голосування серед них,
+        # кожен парсер голосує за кожен свій тип цього тексту один раз
+        labels = [label for _, group in unit_votes for label in dict.fromkeys(unit[1] for unit in group)]
+        label = _vote(labels, _first_seen(labels))
+        chosen = [(name, next(unit for unit in group if unit[1] == label))
+                  for name, group in unit_votes if any(unit[1] == label for unit in group)]
+        for name, _ in chosen:
+            stats[name]["agreed"] += 1
+        details = [unit[3] for _, unit in chosen]
+        details = _vote(details, _first_seen(details))
+        value = chosen[0][1][2]
+        if label == "list_item":
+            list_type = details or "unordered"
+            if open_list is not None and open_list["list_type"] == list_type:
+                open_list["items"].append(value)
+            else:
+                open_list = {"type": "list", "list_type": list_type, "items": [value]}
+                content.append(open_list)
+            continue
+        open_list = None
+        if label == "table":
+            block = {"type": "table", "data": value}
+        elif label == "heading":
+            block = {"type": label, "level": details, "text": value}
+        elif label == "reference":
+            law_number, law_date = details or (None, None)
+            block = {"type": label, "law_number": law_number, "law_date": law_date, "text": value}
+        else:
+            block = {"type": label, "text": value}
+        content.append(block)
+
+    law_data = {}
+    for field in ("title", "law_number", "law_date", "source"):
+        values = [outputs[name].get(field) for name in names if field in outputs[name]]
+        found = [value for value in values if value is not None and value not in PLACEHOLDERS]
+        if found or values:
+            law_data[field] = _vote(found or values, _first_seen(found or values))
+    law_data["content"] = content
+    return law_data, stats
+
+
+def parse_consensus(path, parsers=CONSENSUS_PARSERS, builder="html.parser", quorum=None):
+    """Parser backend "consensus": one shared tree, every tree parser, merged by vote."""
+    results, _ = run_shared(path, parsers, builder)
+    timer = stages()
+    law_data, _ = consensus(results, quorum)
+    timer.mark("consensus")
+    return law_data
+
+
+# Зміна будь-якого з парсерів змінює і результат голосування
+PARSER_VERSION = "2+" + "+".join(get_parser_version(name) for name in CONSENSUS_PARSERS)
@@ -0,0 +1,134 @@
+import codecs
+import html
+import mmap
+import re
+
+# Читання вхідних .htm без декодування всього файла в str.
+# Файл відображається в пам'ять (mmap), кодування визначається за BOM або
+# <meta charset>, а за їх відсутності — перевіркою початку файла на UTF-8
+# (сирі вивантаження rada бувають у windows-1251). Межі div#article шукаються
+# прямо в байтах, тож парсер отримує лише статтю без шапки й навігації.
+
+SNIFF_BYTES = 8192
+CHUNK_SIZE = 64 * 1024
+
+META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w:.-]+)""", re.IGNORECASE)
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+ARTICLE_START_RE = re.compile(rb"""<div\b[^>]*\bid\s*=\s*["']?article\b["']?[^>]*>""", re.IGNORECASE)
+DIV_TAG_RE = re.compile(rb"<(/?)div\b[^>]*>", re.IGNORECASE)
+
+
+def sniff_encoding(data):
+    """Encoding of an HTML byte string: BOM, then <meta charset>, then UTF-8 or cp1251."""
+    if data.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    head = data[:SNIFF_BYTES]
+    match = META_CHARSET_RE.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    try:
+        # final=False: обрізаний посередині символ на межі зразка — не помилка
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return "cp1251"
+    return "utf-8"
+
+
+def find_article_range(data, start=0):
+    """(start, end) byte offsets of the div#article element in data, or None."""
+    match = ARTICLE_START_RE.search(data, start)
+    if not match:
+        return None
+    depth = 1
+    for tag in DIV_TAG_RE.finditer(data, match.end()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return match.start(), tag.end()
+    # Незакритий div — стаття триває до кінця файла
+    return match.start(), len(data)
+
+
+class MappedSource:
+    """A law file mapped into memory, with its encoding, title and div#article range.
+
+        with MappedSource(path) as source:
+            soup = BeautifulSoup(source.article_bytes(), "lxml", from_encoding=source.encoding)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # порожній файл не відображається
+            self.data = b""
+        self.encoding = sniff_encoding(self.data[:SNIFF_BYTES])
+        self._article_range = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    @property
+    def article_range(self):
+        if self._article_range is False:
+            self._article_range = find_article_range(self.data)
+        return self._article_range
+
+    def title(self):
+        """Text of <title> before the article, entities resolved; None if absent."""
+        end = self.article_range[0] if self.article_range else len(self.data)
+        match = TITLE_RE.search(self.data, 0, end)
+        if not match:
+            return None
+        return html.unescape(match.group(1).decode(self.encoding, "replace"))
+
+    def article_bytes(self):
+        """Raw bytes of div#article (the whole file if there is none)."""
+        start, end = self.article_range or (0, len(self.data))
+        return self.data[start:end]
+
+    def iter_chunks(self, chunk_size=CHUNK_SIZE, article_only=True):
+        start, end = (self.article_range if article_only else None) or (0, len(self.data))
+        for offset in range(start, end, chunk_size):
+            yield self.data[offset:min(offset + chunk_size, end)]
+
+    def text(self):
+        return codecs.decode(self.data[:], self.encoding)
+
+
+def read_text(path):
+    """Whole file as str in its own encoding (cp1251 exports no longer fail as UTF-8)."""
+    with MappedSource(path) as source:
+        return source.text()
+
+
+def parse_article_tree(path):
+    """(title, lxml element of div#article or None), fed to lxml straight from the mapping."""
+    from lxml import etree
+
+    with MappedSource(path) as source:
+        title = source.title()
+        if source.article_range is None:
+            return title, None
+        # BOM лежить на початку файла, а не в статті
+        parser = etree.HTMLParser(encoding="utf-8" if source.encoding == "utf-8-sig" else source.encoding)
+        for chunk in source.iter_chunks():
+            parser.feed(chunk)
+        root = parser.close()
+    article = root.find(".//div[@id='article']") if root is not None else None
+    return title, article
@@ -0,0 +1,127 @@
+import re
+
+# Нарізка div#article на незалежні шматки по межах розділів, без розбору
+# документа. Теги проходяться регулярним виразом зі стеком відкритих
+# елементів за правилами BeautifulSoup (порожні елементи не відкриваються,
+# закриваючий тег знімає стек до свого елемента, зайвий — ігнорується).
+# Межа — <p>, що починається із заголовка <span class=rvts15>Розділ ...,
+# і всі межі мають лежати на одному рівні дерева (зазвичай усередині
+# обгортки <div style=...> статті). Кожен шматок доповнюється відкриваючими
+# тегами предків і закриваючими тегами, тож розбирається окремо в те саме
+# піддерево, що й у цілому документі.
+#
+# Регулярний вираз — лише наближення до html.parser, тож кожен шматок несе
+# мітку SEAM_TAG там, де мав би закінчитися: розбір шматка перевіряє, що
+# мітка лежить саме в очікуваних предках (або поза div#article в
+# останньому шматку), і інакше документ розбирається цілим.
+
+TAG_RE = re.compile(rb"<!--.*?-->|<[!?][^>]*>|<(/?)([A-Za-z][^\s/>]*)([^>]*)>", re.DOTALL)
+RAW_TEXT_TAGS = (b"script", b"style")
+# Як HTMLTreeBuilder.empty_element_tags у bs4
+VOID_TAGS = {b"area", b"base", b"br", b"col", b"embed", b"hr", b"img", b"input", b"keygen", b"link",
+             b"menuitem", b"meta", b"param", b"source", b"track", b"wbr", b"basefont", b"bgsound",
+             b"command", b"frame", b"image", b"isindex", b"nextid", b"spacer"}
+CLASS_RE = re.compile(rb"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+# Порожні якорі <a name=...></a> перед заголовком — як у rada
+HEADING_PREFIX = rb"\s*(?:<a\b[^>]*>\s*</a>\s*)*<span\b[^>]*\bclass\s*=\s*[\"']?rvts15\b[^>]*>\s*"
+SECTION_WORD = "Розділ"
+# Елементи, які парсер розбирає цілими (і заголовок <span class=rvts15>):
+# межа всередині них розірвала б блок
+CONTENT_TAGS = {b"p", b"table", b"tr", b"td", b"th"}
+SEAM_TAG = "x-seam"
+SEAM_MARK = b"<" + SEAM_TAG.encode() + b"></" + SEAM_TAG.encode() + b">"
+MIN_SLICE_BYTES = 256 * 1024
+
+
+def _classes(attributes):
+    match = CLASS_RE.search(attributes)
+    if not match:
+        return []
+    # class="" — порожня група, а не None
+    return next(group for group in match.groups() if group is not None).split()
+
+
+def _is_content(name, start_tag):
+    return name in CONTENT_TAGS or (name == b"span" and b"rvts15" in _classes(start_tag))
+
+
+def section_seams(data, article_range, encoding):
+    """Byte offsets of top-level Розділ paragraphs and the open-tag stack they sit in.
+
+    Returns (seams, stack) with stack = [(tag name, start tag bytes)] from
+    div#article down to the seams' parent, or ([], None) when the article
+    has no usable seams. Paragraphs with class rvps2 (list items) and
+    paragraphs inside CONTENT_TAGS are not seams.
+    """
+    start, end = article_range
+    codec = "utf-8" if encoding == "utf-8-sig" else encoding
+    heading_re = re.compile(HEADING_PREFIX + SECTION_WORD.encode(codec), re.IGNORECASE)
+    stack = []
+    seams = []
+    seam_stack = None
+    position = start
+    while True:
+        tag = TAG_RE.search(data, position, end)
+        if tag is None:
+            break
+        position = tag.end()
+        if tag.group(2) is None:  # коментар, doctype
+            continue
+        name = tag.group(2).lower()
+        if tag.group(1):
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == name:
+                    del stack[depth:]
+                    break
+            if not stack:
+                break  # закрито сам div#article
+            continue
+        if name in VOID_TAGS or tag.group(3).rstrip().endswith(b"/"):
+            continue
+        if name in RAW_TEXT_TAGS:
+            close = re.compile(rb"</" + name + rb"\s*>", re.IGNORECASE).search(data, position, end)
+            position = close.end() if close else end
+            continue
+        if (name == b"p" and stack and heading_re.match(data, position, end)
+                and b"rvps2" not in _classes(tag.group(3))
+                and not any(_is_content(open_name, start_tag) for open_name, start_tag in stack)):
+            current = list(stack)
+            if seam_stack is None:
+                seam_stack = current
+            if current == seam_stack:
+                seams.append(tag.start())
+        stack.append((name, data[tag.start():tag.end()]))
+    if not seams:
+        return [], None
+    return seams, seam_stack
+
+
+def article_slices(data, article_range, encoding, parts, min_size=MIN_SLICE_BYTES):
+    """(fragments, parents): self-contained HTML pieces of div#article cut at section seams.
+
+    About parts fragments of at least min_size bytes; a single fragment
+    (the whole article, without a mark) when there is nothing to cut.
+    parents are the tag names from below div#article down to the seams'
+    parent. Every fragment ends with SEAM_MARK: before the closing tags of
+    the parents, or after div#article in the last one.
+    """
+    start, end = article_range
+    seams, stack = section_seams(data, article_range, encoding)
+    target = max(min_size, (end - start) // max(parts, 1))
+    cuts = []
+    previous = start
+    for seam in seams:
+        if seam - previous >= target and end - seam >= min_size:
+            cuts.append(seam)
+            previous = seam
+    if not cuts:
+        return [data[start:end]], []
+    prefix = b"".join(tag for _, tag in stack)
+    suffix = b"".join(b"</" + name + b">" for name, _ in reversed(stack))
+    bounds = [start] + cuts + [end]
+    slices = []
+    for i in range(len(bounds) - 1):
+        head = b"" if i == 0 else prefix
+        tail = b"" if i == len(bounds) - 2 else suffix
+        slices.append(head + data[bounds[i]:bounds[i + 1]] + SEAM_MARK + tail)
+    return slices, [name.decode("latin-1") for name, _ in stack[1:]]
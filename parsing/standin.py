@@ -0,0 +1,96 @@
+import email.utils
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from .batch import find_html_files
+from .manifest import parse_document_id
+
+# Локальна заміна zakon.rada.gov.ua для перевірки завантажувача без мережі.
+# Роздає .htm з каталогу (напр. law-examples/) за адресами /laws/show/<id>
+# і /laws/show/<id>/ed<дата>; ідентифікатор закону береться з постійної
+# адреси "zakon.rada.gov.ua/go/<id>" у самому файлі, редакція — з імені файла.
+# Підтримує ETag / Last-Modified (відповідь 304) і, для перевірки повторів,
+# може відповідати 503 на перші N запитів до кожної адреси.
+
+PERMANENT_URL_RE = re.compile(rb"zakon\.rada\.gov\.ua/go/([^\"'<>\s]+)")
+PATH_RE = re.compile(r"^/laws/show/(?P<law_id>.+?)(?:/ed(?P<revision>\d{8}))?/?$")
+
+
+def law_id_of(path):
+    with open(path, "rb") as f:
+        match = PERMANENT_URL_RE.search(f.read())
+    return unquote(match.group(1).decode("ascii", "replace")) if match else None
+
+
+def build_routes(root):
+    """{(law_id, revision or None): path}; без редакції — найновіша з наявних."""
+    routes = {}
+    for path in find_html_files(root):
+        law_id = law_id_of(path)
+        if law_id is None:
+            continue
+        _, revision = parse_document_id(path)
+        routes[law_id, revision] = path
+        latest = routes.get((law_id, None))
+        if latest is None or (parse_document_id(latest)[1] or "") < (revision or ""):
+            routes[law_id, None] = path
+    return routes
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    routes = {}
+    fail_first = 0
+    failures = None
+    lock = threading.Lock()
+
+    def do_GET(self):
+        match = PATH_RE.match(unquote(self.path.split("?", 1)[0]))
+        path = match and self.routes.get((match.group("law_id"), match.group("revision")))
+        if path is None:
+            self.send_error(404)
+            return
+        with self.lock:
+            seen = self.failures.get(self.path, 0)
+            self.failures[self.path] = seen + 1
+        if seen < self.fail_first:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        last_modified = email.utils.formatdate(os.path.getmtime(path), usegmt=True)
+        if self.headers.get("If-None-Match") == etag or (
+                "If-None-Match" not in self.headers
+                and self.headers.get("If-Modified-Since") == last_modified):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(root, host="127.0.0.1", port=0, fail_first=0):
+    """HTTP server for root; port=0 picks a free port (see server.server_address)."""
+    handler = type("Handler", (StandInHandler,), {
+        "routes": build_routes(root),
+        "fail_first": fail_first,
+        "failures": {},
+    })
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,261 @@
+import codecs
+from collections import deque
+from html.parser import HTMLParser
+
+from .source import MappedSource
+from .tables import span_value
+
+# Потоковий рушій для сторінок zakon.rada.gov.ua: замість повного дерева
+# BeautifulSoup читає файл шматками і віддає події з div#article у порядку
+# документа (як article_div.descendants / find_all).
+
+CHUNK_SIZE = 64 * 1024
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "param", "source", "track", "wbr"}
+# Рядки всередині цих тегів BeautifulSoup не включає в get_text()
+SKIP_TEXT_TAGS = {"style", "script"}
+
+
+class ArticleStreamParser(HTMLParser):
+    def __init__(self, tags=("p",), headings=True, tables=True):
+        super().__init__(convert_charrefs=True)
+        self.tags = set(tags)
+        self.headings = headings
+        self.tables = tables
+        self.events = deque()
+        self.finished = False
+        self._pending = deque()  # записи в порядку відкриття, чекають завершення
+        self._stack = []         # відкриті елементи всередині div#article
+        self._collectors = []    # записи, що збирають текстові рядки
+        self._open_p = []
+        self._open_tables = []
+        self._open_rows = []
+        self._data = []
+        self._skip_text = 0
+        self._title = None
+
+    # --- HTMLParser ---
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_data()
+        if self.finished:
+            return
+        if not self._stack:
+            if tag == "title" and self._title is None:
+                self._title = []
+            elif tag == "div" and dict(attrs).get("id") == "article":
+                self._stack.append(self._frame(tag, None))
+            return
+        self._open_element(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if self._stack and tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_data()
+        if self.finished:
+            return
+        if not self._stack:
+            if tag == "title" and self._title is not None and not isinstance(self._title, str):
+                self._title = "".join(self._title)
+                self.events.append({"tag": "title", "text": self._title})
+            return
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i]["tag"] == tag:
+                break
+        else:
+            return  # закриваючий тег без відкритого — ігноруємо, як і bs4
+        while len(self._stack) > i:
+            self._close_frame(self._stack.pop())
+        if not self._stack:
+            self.finished = True
+        self._emit_ready()
+
+    def handle_data(self, data):
+        if self._stack:
+            if not self._skip_text and self._collectors:
+                self._data.append(data)
+        elif isinstance(self._title, list):
+            self._title.append(data)
+
+    def handle_comment(self, data):
+        self._flush_data()
+
+    def close(self):
+        super().close()
+        self._flush_data()
+        while self._stack:
+            self._close_frame(self._stack.pop())
+        self.finished = True
+        self._emit_ready()
+
+    # --- внутрішня логіка ---
+
+    def _frame(self, tag, record):
+        return {"tag": tag, "record": record, "last_p": None, "headings": []}
+
+    def _flush_data(self):
+        # bs4 склеює сусідні шматки тексту в один NavigableString
+        if self._data:
+            text = "".join(self._data)
+            self._data = []
+            for record in self._collectors:
+                record["strings"].append(text)
+
+    def _open_element(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        parent = self._stack[-1]
+
+        if tag == "em":
+            for record in self._open_p:
+                record["has_em"] = True
+        elif tag == "a":
+            href = attrs.get("href", False)
+            for record in self._open_p:
+                if record["link_href"] is False:
+                    record["link_href"] = None if href is False else (href or "")
+                if href is not False:
+                    record["has_link"] = True
+        elif tag == "br":
+            for record in parent["headings"]:
+                record["br_after"] = True
+
+        record = None
+        if tag in self.tags:
+            record = {"tag": tag, "classes": classes, "strings": [], "done": False,
+                      "has_em": False, "link_href": False, "has_link": False,
+                      "prev_text": None}
+            if tag == "p":
+                if parent["last_p"] is not None:
+                    record["prev_text"] = _strip_join(parent["last_p"]["strings"])
+                parent["last_p"] = record
+                self._open_p.append(record)
+            self._collectors.append(record)
+            self._pending.append(record)
+        elif self.headings and tag == "span" and "rvts15" in classes:
+            parent_p = next((f for f in reversed(self._stack) if f["tag"] == "p"), None)
+            record = {"tag": "heading", "strings": [], "done": False,
+                      "br_after": False, "next": None,
+                      "parent_p_classes": None if parent_p is None else parent_p["classes"]}
+            for previous in parent["headings"]:
+                if previous["next"] is None:
+                    previous["next"] = record
+            parent["headings"].append(record)
+            self._collectors.append(record)
+            self._pending.append(record)
+        elif self.tables and tag == "table":
+            record = {"tag": "table", "rows": [], "done": False}
+            self._open_tables.append(record)
+            self._pending.append(record)
+        elif self.tables and tag == "tr" and self._open_tables:
+            record = {"tag": "tr", "cells": []}
+            for table in self._open_tables:
+                table["rows"].append(record)
+            self._open_rows.append(record)
+        elif self.tables and tag in ("td", "th") and self._open_rows:
+            record = {"tag": tag, "strings": [],
+                      "colspan": span_value(attrs.get("colspan")),
+                      "rowspan": span_value(attrs.get("rowspan"))}
+            for row in self._open_rows:
+                row["cells"].append(record)
+            self._collectors.append(record)
+
+        if tag in VOID_TAGS:
+            return
+        frame = self._frame(tag, record)
+        frame["classes"] = classes
+        self._stack.append(frame)
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_text += 1
+
+    def _close_frame(self, frame):
+        if frame["tag"] in SKIP_TEXT_TAGS:
+            self._skip_text -= 1
+        # сусіди заголовка відомі лише після закриття батьківського елемента
+        for record in frame["headings"]:
+            record["done"] = True
+        record = frame["record"]
+        if record is None:
+            return
+        if "strings" in record:
+            _remove(self._collectors, record)
+        if record["tag"] == "p":
+            _remove(self._open_p, record)
+        elif record["tag"] == "table":
+            _remove(self._open_tables, record)
+        elif record["tag"] == "tr":
+            _remove(self._open_rows, record)
+        if record["tag"] != "heading":
+            record["done"] = True
+
+    def _emit_ready(self):
+        while self._pending and self._pending[0]["done"]:
+            self.events.append(_to_event(self._pending.popleft()))
+
+
+def _remove(records, record):
+    # Саме цей запис: list.remove порівнює словники за вмістом, а вкладений
+    # запис з тим самим текстом ще відкритий
+    for i in range(len(records) - 1, -1, -1):
+        if records[i] is record:
+            del records[i]
+            return
+
+
+def _strip_join(strings, separator=""):
+    return separator.join(s.strip() for s in strings if s.strip())
+
+
+def _to_event(record):
+    tag = record["tag"]
+    if tag == "heading":
+        next_record = record["next"]
+        return {
+            "tag": "heading",
+            "text": _strip_join(record["strings"]),
+            "has_br_after": record["br_after"],
+            "next_text": None if next_record is None else _strip_join(next_record["strings"]),
+            "parent_p_classes": record["parent_p_classes"],
+        }
+    if tag == "table":
+        return {
+            "tag": "table",
+            # (текст, colspan, rowspan); сітку будує parsing.tables.expand_spans
+            "rows": [[(_strip_join(cell["strings"]), cell["colspan"], cell["rowspan"])
+                      for cell in row["cells"]]
+                     for row in record["rows"]],
+        }
+    return {
+        "tag": tag,
+        "text": _strip_join(record["strings"], " "),
+        "plain_text": _strip_join(record["strings"]),
+        "raw_text": "".join(record["strings"]),
+        "classes": record["classes"],
+        "has_em": record["has_em"],
+        "has_link": record["has_link"],
+        "link_href": None if record["link_href"] is False else record["link_href"],
+        "prev_text": record["prev_text"],
+    }
+
+
+def iter_article_events(file_path, tags=("p",), headings=True, tables=True,
+                        chunk_size=CHUNK_SIZE):
+    """Yield title/block events from div#article without building a DOM."""
+    parser = ArticleStreamParser(tags=tags, headings=headings, tables=tables)
+    with MappedSource(file_path) as source:
+        # Байти декодуються шматками в кодуванні файла (utf-8 або cp1251)
+        decoder = codecs.getincrementaldecoder(source.encoding)()
+        chunks = source.iter_chunks(chunk_size, article_only=False)
+        while not parser.finished:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                parser.feed(decoder.decode(chunk))
+            else:
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+            while parser.events:
+                yield parser.events.popleft()
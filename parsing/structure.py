@@ -0,0 +1,172 @@
+import json
+import re
+
+from .tables import table_grid
+
+# Ієрархія закону: Розділ → Глава → Стаття → частини/списки.
+# Будується з пласкої послідовності блоків за один прохід. Індекс зіставляє
+# номер статті та шлях розділу ("Розділ I/Глава 2") з діапазоном блоків і,
+# для NDJSON, з діапазоном байтів у файлі, тож одну статтю можна прочитати
+# без завантаження всього документа.
+
+SECTION_RE = re.compile(r"^Розділ\s+([IVXLC]+)\b")
+CHAPTER_RE = re.compile(r"^Глава\s+(\d+(?:-\d+)?)\b")
+ARTICLE_RE = re.compile(r"^Стаття\s+(\d+(?:[-.]\d+)*)")
+
+# 2: для NDJSON — "offsets", байтовий початок кожного блоку і кінець файла
+INDEX_VERSION = 2
+RANKS = {"section": 1, "chapter": 2, "article": 3}
+LABELS = {"section": "Розділ", "chapter": "Глава"}
+
+
+def structural_key(block):
+    """Return ("section"|"chapter"|"article", number) for a structural block, else None."""
+    block_type = block.get("type")
+    text = block.get("text") or ""
+    if block_type == "article":
+        match = ARTICLE_RE.match(text)
+        return ("article", match.group(1)) if match else None
+    if block_type == "heading":
+        match = SECTION_RE.match(text)
+        if match:
+            return "section", match.group(1)
+        match = CHAPTER_RE.match(text)
+        if match:
+            return "chapter", match.group(1)
+    return None
+
+
+def enter_section(path, kind, number):
+    """Section path [(kind, label)] after a Розділ/Глава heading; same and lower levels are closed."""
+    return [p for p in path if RANKS[p[0]] < RANKS[kind]] + [(kind, LABELS[kind] + " " + number)]
+
+
+def path_label(path):
+    return "/".join(label for _, label in path)
+
+
+def text_units(block):
+    """Text of a block as units: each list item and table row ("a | b") separately."""
+    if "items" in block:
+        return list(block["items"])
+    if "data" in block or "columns" in block:
+        return [" | ".join(row) for row in table_grid(block)]
+    return [block.get("text") or ""]
+
+
+class StructureIndexer:
+    """Consume blocks one by one and produce the article/section index."""
+
+    def __init__(self):
+        self.position = 0
+        self.byte_end = None
+        self.open_nodes = []  # [(kind, key, start_block, start_byte)] від розділу до статті
+        self.offsets = []
+        self.path = []
+        self.articles = {}
+        self.sections = {}
+
+    def add(self, block, byte_start=None, byte_end=None):
+        key = structural_key(block)
+        if key is not None:
+            kind, number = key
+            self._close(RANKS[kind], byte_start)
+            if kind == "article":
+                node_key = number
+            else:
+                self.path = enter_section(self.path, kind, number)
+                node_key = path_label(self.path)
+            self.open_nodes.append((kind, node_key, self.position, byte_start))
+        if byte_start is not None:
+            self.offsets.append(byte_start)
+        self.position += 1
+        self.byte_end = byte_end
+
+    def _close(self, rank, byte_end):
+        while self.open_nodes and RANKS[self.open_nodes[-1][0]] >= rank:
+            kind, key, start, byte_start = self.open_nodes.pop()
+            entry = {"blocks": [start, self.position]}
+            if byte_start is not None:
+                entry["bytes"] = [byte_start, byte_end]
+            if kind == "article":
+                entry["path"] = path_label(self.path)
+                # Номери статей у межах закону унікальні; дублікати (напр. у
+                # текстах змін) не перезаписують першу статтю
+                self.articles.setdefault(key, entry)
+            else:
+                self.sections.setdefault(key, entry)
+
+    def finish(self):
+        self._close(0, self.byte_end)
+        index = {
+            "version": INDEX_VERSION,
+            "blocks": self.position,
+            "articles": self.articles,
+            "sections": self.sections,
+        }
+        if self.offsets:
+            index["offsets"] = self.offsets + [self.byte_end]
+        return index
+
+
+def build_index(content):
+    indexer = StructureIndexer()
+    for block in content:
+        indexer.add(block if isinstance(block, dict) else block.to_dict())
+    return indexer.finish()
+
+
+def build_tree(content):
+    """Nest a flat block list into preamble + Розділ/Глава/Стаття nodes."""
+    root = {"type": "document", "content": [], "children": []}
+    stack = [(0, root)]
+    for block in content:
+        if not isinstance(block, dict):
+            block = block.to_dict()
+        key = structural_key(block)
+        if key is None:
+            # Частини статті, списки, примітки; до першого розділу — преамбула
+            stack[-1][1]["content"].append(block)
+            continue
+        kind, number = key
+        rank = RANKS[kind]
+        while stack[-1][0] >= rank:
+            stack.pop()
+        node = {"type": kind, "number": number, "title": block["text"], "content": []}
+        if kind != "article":
+            node["children"] = []
+        stack[-1][1]["children"].append(node)
+        stack.append((rank, node))
+    return root
+
+
+def index_path_for(output_path):
+    # Від повної назви: law.json і law.ndjson поруч мають кожен свій індекс
+    return output_path + ".index.json"
+
+
+def write_index(index, output_path):
+    with open(index_path_for(output_path), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+
+
+def load_index(output_path):
+    with open(index_path_for(output_path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_range(ndjson_path, entry):
+    """Read the blocks of one index entry straight from an NDJSON file by byte range."""
+    start, end = entry["bytes"]
+    with open(ndjson_path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    return [json.loads(line) for line in chunk.decode("utf-8").splitlines() if line.strip()]
+
+
+def read_article(ndjson_path, number, index=None):
+    index = index if index is not None else load_index(ndjson_path)
+    entry = index["articles"].get(str(number))
+    if entry is None:
+        raise KeyError(f"Статтю {number} не знайдено")
+    return read_range(ndjson_path, entry)
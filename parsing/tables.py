@@ -0,0 +1,158 @@
+import csv
+import os
+
+from .model import Table
+
+# Таблиці додатків (тарифи, ставки) бувають на тисячі клітинок і з об'єднаними
+# клітинками. Рядки HTML розгортаються в прямокутну сітку з урахуванням
+# colspan/rowspan: об'єднана клітинка повторюється в кожній позиції, яку
+# займає. У режимі "columnar" таблиця зберігається стовпцями ("columns"),
+# щоб аналітика могла брати стовпець без обходу рядків; за наявності pyarrow
+# або numpy таблицю можна отримати як Arrow-таблицю / масив і записати в
+# Parquet. CSV пишеться стандартним модулем csv.
+
+TABLE_MODES = ("rows", "columnar")
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Захист від сміттєвих значень на кшталт colspan="9999"
+MAX_SPAN = 1000
+
+
+def span_value(value):
+    try:
+        span = int(str(value).strip())
+    except (TypeError, ValueError):
+        return 1
+    # rowspan="0" (до кінця групи) трактується як звичайна клітинка
+    return min(max(span, 1), MAX_SPAN)
+
+
+def element_cells(table):
+    """Rows of (text, colspan, rowspan) from a BeautifulSoup <table> element."""
+    rows = []
+    for row in table.find_all("tr"):
+        rows.append([(cell.get_text(strip=True), span_value(cell.get("colspan", 1)),
+                      span_value(cell.get("rowspan", 1)))
+                     for cell in row.find_all(["td", "th"])])
+    return rows
+
+
+def expand_spans(rows):
+    """Turn rows of (text, colspan, rowspan) into a rectangular grid of strings."""
+    grid = []
+    carried = {}  # стовпець -> [текст, скільки ще рядків займає]
+    for cells in rows:
+        grid_row = []
+        cells = iter(cells)
+        cell = next(cells, None)
+        column = 0
+        while cell is not None or any(c >= column for c in carried):
+            if column in carried:
+                text, remaining = carried[column]
+                grid_row.append(text)
+                if remaining == 1:
+                    del carried[column]
+                else:
+                    carried[column][1] = remaining - 1
+                column += 1
+                continue
+            if cell is None:
+                # Порожні позиції до наступної клітинки, що тягнеться згори
+                grid_row.append("")
+                column += 1
+                continue
+            text, colspan, rowspan = cell
+            for offset in range(colspan):
+                grid_row.append(text)
+                if rowspan > 1:
+                    carried[column + offset] = [text, rowspan - 1]
+            column += colspan
+            cell = next(cells, None)
+        if grid_row:
+            grid.append(grid_row)
+    width = max((len(row) for row in grid), default=0)
+    for row in grid:
+        row.extend([""] * (width - len(row)))
+    return grid
+
+
+def to_columns(grid):
+    return [list(column) for column in zip(*grid)]
+
+
+def to_rows(columns):
+    return [list(row) for row in zip(*columns)]
+
+
+def columnar(block):
+    """Table block in columnar form; other blocks are returned unchanged."""
+    if isinstance(block, Table) and block.columns is None:
+        return Table(data=None, columns=to_columns(block.data))
+    if isinstance(block, dict) and block.get("type") == Table.type and "columns" not in block:
+        return {"type": Table.type, "columns": to_columns(block["data"])}
+    return block
+
+
+def table_grid(block):
+    """Rectangular list of rows of a table block, whichever form it is in."""
+    if not isinstance(block, dict):
+        block = block.to_dict()
+    if "columns" in block:
+        return to_rows(block["columns"])
+    return block["data"]
+
+
+def column_names(width):
+    return [f"c{i + 1}" for i in range(width)]
+
+
+def to_arrow(block):
+    """pyarrow.Table with string columns c1..cN (needs pyarrow)."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Для Arrow/Parquet потрібен pyarrow: pip install pyarrow") from None
+    columns = to_columns(table_grid(block))
+    return pyarrow.table(dict(zip(column_names(len(columns)), columns)))
+
+
+def to_numpy(block):
+    """2-D numpy array of str cells (needs numpy)."""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Для масивів NumPy потрібен numpy: pip install numpy") from None
+    return numpy.array(table_grid(block), dtype=str)
+
+
+def write_table(block, path, fmt="csv"):
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(table_grid(block))
+    elif fmt == "parquet":
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(to_arrow(block), path)
+    else:
+        raise ValueError(f"Невідомий формат таблиць '{fmt}', доступні: {', '.join(EXPORT_FORMATS)}")
+
+
+def tables_dir_for(output_path):
+    return output_path + ".tables"
+
+
+class TableExporter:
+    """Write every table block of a document to <output>.tables/table_NNN.<fmt>."""
+
+    def __init__(self, output_path, fmt="csv"):
+        self.directory = tables_dir_for(output_path)
+        self.fmt = fmt
+        self.count = 0
+
+    def add(self, block):
+        block_type = block.get("type") if isinstance(block, dict) else block.type
+        if block_type != Table.type:
+            return
+        if self.count == 0:
+            os.makedirs(self.directory, exist_ok=True)
+        self.count += 1
+        write_table(block, os.path.join(self.directory, f"table_{self.count:03d}.{self.fmt}"), self.fmt)
@@ -0,0 +1,37 @@
+import glob
+import json
+import os
+
+import pytest
+
+from parsing.parsers.Claude_parser_htm_to_json import parse_law_html
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "law-examples", "*.htm")))
+# Коротші рядки ("частина перша;") законно повторюються в різних абзацах
+MIN_TEXT = 40
+
+
+def block_texts(law_data):
+    texts = []
+    for block in law_data["content"]:
+        texts.extend(block.get("items") or [block.get("text") or ""])
+    return texts
+
+
+@pytest.fixture(scope="module", params=SAMPLES, ids=os.path.basename)
+def sample(request):
+    return request.param, parse_law_html(request.param, traversal="leaf")
+
+
+def test_output_smaller_than_html(sample):
+    path, law_data = sample
+    size = len(json.dumps(law_data, ensure_ascii=False, indent=2).encode("utf-8"))
+    assert size / os.path.getsize(path) < 1
+
+
+def test_nested_text_not_repeated(sample):
+    _, law_data = sample
+    texts = block_texts(law_data)
+    nested = {text for text in texts if len(text) >= MIN_TEXT}
+    repeated = [(text[:60], inner[:60]) for text in texts for inner in nested if text.count(inner) >= 2]
+    assert not repeated
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from parsing.fetch import corpus_filename, fetch_laws, load_source_urls
+from parsing.standin import build_routes, make_server
+
+pytest.importorskip("aiohttp")
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "law-examples")
+
+
+@pytest.fixture
+def standin():
+    # Перший запит до кожної адреси отримує 503: завантажувач має повторити
+    server = make_server(EXAMPLES, fail_first=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(server, specs, corpus_dir):
+    host, port = server.server_address
+    return asyncio.run(fetch_laws(specs, corpus_dir, base_url=f"http://{host}:{port}",
+                                  retries=2, backoff=0, timeout=10, report=lambda message: None))
+
+
+def test_fetch_retry_revalidate_and_source(standin, tmp_path):
+    (law_id, revision), source_path = next((key, path) for key, path in build_routes(EXAMPLES).items() if key[1])
+    spec = f"{law_id}@{revision}"
+    corpus_dir = str(tmp_path)
+    path = os.path.join(corpus_dir, corpus_filename(law_id, revision))
+
+    assert fetch(standin, [spec], corpus_dir) == {spec: "downloaded"}
+    assert standin.RequestHandlerClass.failures[f"/laws/show/{law_id}/ed{revision}"] == 2
+    with open(path, "rb") as f, open(source_path, "rb") as expected:
+        assert f.read() == expected.read()
+
+    mtime = os.path.getmtime(path)
+    assert fetch(standin, [spec], corpus_dir) == {spec: "not-modified"}
+    assert os.path.getmtime(path) == mtime
+
+    assert load_source_urls(corpus_dir) == {
+        os.path.abspath(path): f"https://zakon.rada.gov.ua/laws/show/{law_id}/ed{revision}"}
@@ -0,0 +1,56 @@
+import glob
+import os
+
+import pytest
+
+from parsing.shared import consensus, run_shared, text_key
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "law-examples", "*.htm")))
+
+
+def law(*blocks):
+    return {"title": "Закон", "content": list(blocks)}
+
+
+def heading(text, level=1):
+    return {"type": "heading", "level": level, "text": text}
+
+
+def paragraph(text):
+    return {"type": "paragraph", "text": text}
+
+
+def headings(law_data):
+    return [text_key(block["text"]) for block in law_data["content"] if block["type"] == "heading"]
+
+
+def test_heading_kept_when_every_parser_agrees():
+    # Як google: той самий текст і абзацом, і заголовком у ньому
+    results = {
+        "a": law(heading("Розділ I"), paragraph("текст")),
+        "b": law(paragraph("Розділ I"), heading("Розділ I"), paragraph("текст")),
+        "c": law(paragraph("Розділ I"), heading("Розділ I"), paragraph("текст")),
+        "d": law(paragraph("текст")),
+    }
+    law_data, stats = consensus(results)
+    assert law_data["content"] == [heading("Розділ I"), paragraph("текст")]
+    assert stats["b"] == {"units": 2, "agreed": 2}
+
+
+def test_type_is_voted_among_parsers_that_found_the_text():
+    results = {
+        "a": law(paragraph("Розділ I")),
+        "b": law(heading("Розділ I", 1)),
+        "c": law(heading("Розділ I", 2)),
+        "d": law(heading("Розділ I", 2), paragraph("лише тут")),
+    }
+    law_data, _ = consensus(results)
+    assert law_data["content"] == [heading("Розділ I", 2)]
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_sample_keeps_agreed_headings(path):
+    results, _ = run_shared(path, ("claude", "chatgpt", "google", "gitcopilot"))
+    agreed = set(headings(results["claude"])) & set(headings(results["google"]))
+    assert agreed
+    assert agreed <= set(headings(consensus(results)[0]))
@@ -0,0 +1,55 @@
+import glob
+import os
+
+import pytest
+
+from parsing.parsers.Google_AI_Studio_parser_htm_to_json import parse_npa_html, parse_npa_parallel
+from parsing.source import MappedSource
+from parsing.split import article_slices
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "law-examples", "*.htm")))
+
+
+def section(number, body, paragraph='<p class=rvps7>'):
+    return f'{paragraph}<span class=rvts15>Розділ {number}</span></p>{body}'
+
+
+# Шматки статті між межами-розділами; межі всередині обгортки, як у rada
+ARTICLES = [
+    section("I", '<p class="">пункт:</p>') + section("II", '<p>1) x</p><p class="">y</p>')
+    + section("III", '<p>z</p>', '<p class="">'),
+    section("I", '<p>незакритий абзац') + section("II", '<p>x</p>') + section("III", '<div><p>y</p>'),
+    section("I", '<p>текст</p><span class="rvts15">Заголовок</span>') + '<br>'
+    + section("II", '<span class="rvts15">через межу</span>') + section("III", '<p>x</p>'),
+    section("I", '<p>пункт:</p><span class="rvts15">згідно із Законом') + section("II", '<p>x</p>')
+    + '</span>' + section("III", '<p>y</p>'),
+    section("I", '<p>x</p><!-- <p class=rvps7><span class=rvts15>Розділ IX</span></p> -->')
+    + section("II", '<p class="a>b">y</p>') + section("III", '<p>z</p>'),
+    section("I", '<table><tr><td>a') + section("II", '<p>x</p></td></tr></table>') + section("III", '<p>y</p>'),
+    section("I", '<p>x</p></div>') + section("II", '<p>y</p>') + section("III", '<p>z</p>'),
+]
+WRAPPERS = [('<div style="width:660px"><span class=rvts0>', '</span></div>'), ('', ''), ('<p>', '</p>')]
+
+
+def write_law(directory, article):
+    path = os.path.join(directory, "law.htm")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<html><head><meta charset="utf-8"><title>Закон № 1-IX від 01.01.2024</title></head>'
+                f'<body><div id="article">{article}</div><p>після</p></body></html>')
+    return path
+
+
+@pytest.mark.parametrize("wrapper", WRAPPERS, ids=("rada", "none", "paragraph"))
+@pytest.mark.parametrize("article", ARTICLES, ids=("empty-class", "unclosed", "heading-sibling", "heading-across",
+                                                   "comment", "table", "stray-close"))
+def test_parallel_matches_serial(tmp_path, article, wrapper):
+    path = write_law(str(tmp_path), wrapper[0] + article + wrapper[1])
+    assert parse_npa_parallel(path, jobs=3, min_slice=1) == parse_npa_html(path)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_parallel_matches_serial_on_sample(path):
+    with MappedSource(path) as source:
+        slices, _ = article_slices(source.data, source.article_range, source.encoding, 4, 16 * 1024)
+    assert len(slices) > 1
+    assert parse_npa_parallel(path, jobs=4, min_slice=16 * 1024) == parse_npa_html(path)
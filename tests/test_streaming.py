@@ -0,0 +1,48 @@
+import glob
+import os
+
+import pytest
+
+from parsing.parsers import get_stream_parser, parse
+from parsing.parsers.Google_AI_Studio_parser_htm_to_json import parse_npa_html
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "law-examples", "*.htm")))
+
+# Вкладені елементи з тим самим текстом: запис закривається саме свій
+ARTICLES = [
+    '<span class="rvts15"><span class="rvts15">a</span></span>',
+    '<p><p>x</p></p>',
+    '<table><tr><td><table><tr><td>x</td></tr></table></td></tr></table>',
+    '<table><tr><td>x</td><td><table><tr><td>x</td></tr></table></td></tr></table>',
+    '<p class="rvps7"><span class="rvts15">Розділ I</span><br><span class="rvts15">Розділ I</span></p>',
+    '<p>пункт:</p><p>x<p>x</p></p><p>1) x</p>',
+    '<p><em>згідно із Законом № 1-IX від 01.01.2020<p><em>згідно із Законом № 1-IX від 01.01.2020</em></p></em></p>',
+    '<p><a href="/laws/1">x</a><p><a href="/laws/1">x</a></p></p>',
+    '<p>незакритий<p>абзац<span class="rvts15">Глава 1',
+    '</td></p><p class="">Стаття 1.</p><style>p</style>',
+]
+
+
+def write_law(directory, article):
+    path = os.path.join(directory, "law.htm")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<html><head><meta charset="utf-8"><title>Закон № 1-IX від 01.01.2024</title></head>'
+                f'<body><div id="article">{article}</div><p>після</p></body></html>')
+    return path
+
+
+@pytest.mark.parametrize("article", ARTICLES)
+def test_stream_matches_soup(tmp_path, article):
+    path = write_law(str(tmp_path), article)
+    assert parse_npa_html(path, backend="stream") == parse_npa_html(path)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_stream_matches_soup_on_sample(path):
+    assert parse_npa_html(path, backend="stream") == parse_npa_html(path)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_stream_backend_selected_by_name(path):
+    assert get_stream_parser("google") is None
+    assert parse(path, "google-stream").to_dict() == parse(path, "google").to_dict()